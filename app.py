@@ -1,8 +1,13 @@
-import os, time, json, threading, shutil, subprocess, math
+import os, sys, time, json, threading, shutil, subprocess, math, asyncio, socket, struct, mmap, atexit
+import base64, hashlib, re, zlib
+import http.client
+from urllib.parse import quote, urlencode
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from collections import deque
-from flask import Flask, jsonify, render_template, request
+from array import array
+from flask import Flask, Response, jsonify, render_template, request
 
 APP_START = time.time()
 app = Flask(__name__, template_folder="templates", static_folder="static")
@@ -29,8 +34,40 @@ SYSTEMD_UNIT_DIR = "/etc/systemd/system"
 SYSTEMCTL_BIN = shutil.which("systemctl") or ("/usr/bin/systemctl" if os.path.exists("/usr/bin/systemctl") else None)
 SAMPLE_SEC = int(os.getenv("BDAG_SAMPLE_SEC", "5"))
 WINDOW = int(os.getenv("BDAG_WINDOW", "240"))  # points kept in memory
+DOCKER_API = os.getenv("DASH_DOCKER_API", "1") == "1"
+DOCKER_SOCKET = (os.getenv("BDAG_DOCKER_SOCKET", "").strip()
+                 or (os.getenv("DOCKER_HOST", "")[len("unix://"):] if os.getenv("DOCKER_HOST", "").startswith("unix://") else "")
+                 or "/var/run/docker.sock")
+DOCKER_INSPECT_CACHE_SEC = float(os.getenv("BDAG_DOCKER_INSPECT_CACHE_SEC", "10"))
+HISTORY_STORE = os.getenv("BDAG_HISTORY_STORE", "1") == "1"
+HISTORY_DIR = Path(os.getenv("BDAG_HISTORY_DIR", "~/.local/share/blockdag-dashboard/history")).expanduser()
+HISTORY_RETENTION_DAYS = float(os.getenv("BDAG_HISTORY_RETENTION_DAYS", "30"))
+HISTORY_SEGMENT_HOURS = float(os.getenv("BDAG_HISTORY_SEGMENT_HOURS", "24"))
+HISTORY_FSYNC_SEC = float(os.getenv("BDAG_HISTORY_FSYNC_SEC", "30"))
+ROLLUP_1M_POINTS = int(os.getenv("BDAG_ROLLUP_1M_POINTS", "10080"))
+ROLLUP_1H_POINTS = int(os.getenv("BDAG_ROLLUP_1H_POINTS", "2160"))
+CHART_POINTS = int(os.getenv("DASH_CHART_POINTS", "360"))
 ENABLE_CONTROL = os.getenv("DASH_ENABLE_CONTROL", "1") == "1"
-ALLOW_DOCKER = os.getenv("DASH_ALLOW_DOCKER", "1") == "1" and shutil.which("docker")
+STATUS_SNAPSHOT = os.getenv("DASH_STATUS_SNAPSHOT", "1") == "1"
+STATUS_SNAPSHOT_WAIT_SEC = float(os.getenv("DASH_STATUS_SNAPSHOT_WAIT_SEC", "5"))
+STREAM_ENABLED = os.getenv("DASH_STREAM", "1") == "1"
+STREAM_MAX_CLIENTS = int(os.getenv("DASH_STREAM_MAX_CLIENTS", "2"))
+STREAM_MAX_SEC = float(os.getenv("DASH_STREAM_MAX_SEC", "300"))
+STREAM_KEEPALIVE_SEC = float(os.getenv("DASH_STREAM_KEEPALIVE_SEC", "15"))
+STREAM_LOG_SEC = float(os.getenv("DASH_STREAM_LOG_SEC", "1"))
+LOG_BUFFER_LINES = int(os.getenv("DASH_LOG_BUFFER_LINES", "2000"))
+SIDECAR_PATH_ENV = ("BDAG_SIDECAR_PATH", "BDAG_SIDE_STATUS_PATH", "BDAG_HEAD_JSON", "BDAG_HEAD_PATH")
+# an explicitly configured head.json path wins over the default shared segment
+HEAD_SHM_PATH = os.getenv("BDAG_HEAD_SHM", "" if any(os.getenv(key, "").strip() for key in SIDECAR_PATH_ENV)
+                          else "/dev/shm/bdag-head").strip()
+HEAD_SHM_STALE_SEC = float(os.getenv("BDAG_HEAD_SHM_STALE_SEC", str(max(30, 3 * SAMPLE_SEC))))
+SIDECAR_INOTIFY = os.getenv("BDAG_SIDECAR_INOTIFY", "0") == "1"
+COMPRESS = os.getenv("DASH_COMPRESS", "1") == "1"
+COMPRESS_LEVEL = int(os.getenv("DASH_COMPRESS_LEVEL", "6"))
+COMPRESS_MIN_BYTES = int(os.getenv("DASH_COMPRESS_MIN_BYTES", "1024"))
+COMPRESS_CACHE = int(os.getenv("DASH_COMPRESS_CACHE", "32"))
+ALLOW_DOCKER = os.getenv("DASH_ALLOW_DOCKER", "1") == "1" and bool(
+    shutil.which("docker") or (DOCKER_API and os.path.exists(DOCKER_SOCKET)))
 STALL_THRESHOLD_MS = int(os.getenv("DASH_STALL_THRESHOLD_MS", "180000"))
 SYNC_RATE_THRESHOLD = float(os.getenv("DASH_SYNC_RATE_THRESHOLD", "0.3"))
 DOWNLOAD_RATE_THRESHOLD = float(os.getenv("DASH_DOWNLOAD_RATE_THRESHOLD", "1.0"))
@@ -42,6 +79,15 @@ CHAIN_BACKUP_DIR = Path(os.getenv("BDAG_CHAIN_BACKUP_DIR", os.path.expanduser("~
 CHAIN_BACKUP_PREFIX = (os.getenv("BDAG_CHAIN_BACKUP_PREFIX", "blockdag-chaindata") or "blockdag-chaindata").strip() or "blockdag-chaindata"
 CHAIN_BACKUP_SUFFIX = (os.getenv("BDAG_CHAIN_BACKUP_SUFFIX", ".tar.gz") or ".tar.gz").strip()
 CHAIN_BACKUP_MAX = max(0, int(os.getenv("BDAG_CHAIN_BACKUP_MAX", "0")))
+# auto picks pigz, then zstd, then plain gzip; zstd archives are written as .tar.zst
+CHAIN_BACKUP_COMPRESSOR = (os.getenv("BDAG_CHAIN_BACKUP_COMPRESSOR", "auto") or "auto").strip().lower()
+CHAIN_BACKUP_LEVEL = os.getenv("BDAG_CHAIN_BACKUP_LEVEL", "").strip()
+CHAIN_BACKUP_THREADS = max(1, int(os.getenv("BDAG_CHAIN_BACKUP_THREADS", "0") or 0) or (os.cpu_count() or 1))
+# "archive" writes a full tarball per backup, "chunks" an incremental snapshot into the chunk store
+CHAIN_BACKUP_MODE = (os.getenv("BDAG_CHAIN_BACKUP_MODE", "archive") or "archive").strip().lower()
+CHAIN_BACKUP_CHUNK_MB = max(1, int(os.getenv("BDAG_CHAIN_BACKUP_CHUNK_MB", "4")))
+# copy the data directory while the node runs and only stop it to catch up the changed files
+CHAIN_BACKUP_HOT = os.getenv("BDAG_CHAIN_BACKUP_HOT", "0") == "1"
 
 _chain_job_lock = threading.Lock()
 _chain_job_state = {
@@ -181,6 +227,40 @@ def _get_auto_restart_status(container):
     }
 
 
+_AUTO_RESTART_CACHE = {}
+
+
+def _auto_restart_signature(info):
+    sig = []
+    wants_link = os.path.join(SYSTEMD_UNIT_DIR, "timers.target.wants", info["timer"])
+    for path in (info["timer_path"], info["service_path"], wants_link):
+        try:
+            st = os.lstat(path)
+            sig.append((st.st_ino, st.st_mtime_ns, st.st_size))
+        except OSError:
+            sig.append(None)
+    return tuple(sig)
+
+
+def _cached_auto_restart_status(container):
+    """Auto-restart status; systemctl is only queried again when the unit files change."""
+    info = _restart_unit_info(container)
+    sig = _auto_restart_signature(info)
+    entry = _AUTO_RESTART_CACHE.get(container)
+    if entry and entry["sig"] == sig:
+        return dict(entry["status"])
+    status = _get_auto_restart_status(container)
+    _AUTO_RESTART_CACHE[container] = {"sig": sig, "status": status}
+    return dict(status)
+
+
+def _auto_restart_entry(container):
+    try:
+        return _cached_auto_restart_status(container)
+    except Exception:
+        return {"installed": False, "enabled": False, "active": False, "interval": None, "interval_hours": None}
+
+
 def _format_hours_interval(hours):
     value = max(float(hours), 1.0)
     if abs(value - round(value)) < 1e-6:
@@ -198,6 +278,7 @@ def _enable_auto_restart(container, hours):
         raise RuntimeError("install_container_restart.sh is not executable")
     interval = _format_hours_interval(hours)
     cmd = [RESTART_INSTALLER, container, interval]
+    _AUTO_RESTART_CACHE.pop(container, None)
     result = subprocess.run(cmd, capture_output=True, text=True)
     if result.returncode != 0:
         message = result.stderr.strip() or result.stdout.strip() or "failed to configure auto restart"
@@ -207,6 +288,7 @@ def _enable_auto_restart(container, hours):
 
 def _disable_auto_restart(container):
     info = _restart_unit_info(container)
+    _AUTO_RESTART_CACHE.pop(container, None)
     if SYSTEMCTL_BIN:
         _systemctl_cmd(["disable", "--now", info["timer"]])
         _systemctl_cmd(["disable", info["service"]])
@@ -219,16 +301,733 @@ def _disable_auto_restart(container):
     if SYSTEMCTL_BIN:
         _systemctl_cmd(["daemon-reload"])
 
-# ----- Series -----
-height_series = deque(maxlen=WINDOW)
-remote_height_series = deque(maxlen=WINDOW)
-peers_series  = deque(maxlen=WINDOW)
-lat_series    = deque(maxlen=WINDOW)
+# ----- Docker Engine API -----
+class DockerAPIError(RuntimeError):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path, timeout):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+def _demux_docker_stream(data):
+    """Strip the 8-byte stdout/stderr frame headers of a non-TTY container log stream."""
+    chunks = []
+    idx = 0
+    while idx + 8 <= len(data):
+        if data[idx] not in (0, 1, 2) or data[idx + 1:idx + 4] != b"\0\0\0":
+            # TTY containers stream raw bytes without frames
+            return data if not chunks else b"".join(chunks) + data[idx:]
+        size = int.from_bytes(data[idx + 4:idx + 8], "big")
+        chunks.append(data[idx + 8:idx + 8 + size])
+        idx += 8 + size
+    return b"".join(chunks) if chunks or not data else data
+
+
+class DockerEngineClient:
+    """Minimal Docker Engine API client over the unix socket with keep-alive connections."""
+
+    def __init__(self, socket_path, timeout=5.0, pool_size=4):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.pool_size = max(1, int(pool_size))
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def _acquire(self, timeout):
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            return _UnixHTTPConnection(self.socket_path, timeout), False
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn, True
+
+    def _release(self, conn):
+        with self._lock:
+            if len(self._idle) < self.pool_size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def request(self, method, path, query=None, timeout=None):
+        url = path + ("?" + urlencode(query) if query else "")
+        for attempt in (0, 1):
+            conn, reused = self._acquire(timeout or self.timeout)
+            try:
+                conn.request(method, url, headers={"Host": "docker"})
+                resp = conn.getresponse()
+                body = resp.read()
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                conn.close()
+                if reused and attempt == 0:
+                    # stale keep-alive connection; retry once on a fresh one
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+            if resp.will_close:
+                conn.close()
+            else:
+                self._release(conn)
+            if resp.status >= 400:
+                message = body.decode("utf-8", "replace").strip()
+                try:
+                    message = json.loads(message).get("message") or message
+                except Exception:
+                    pass
+                raise DockerAPIError(resp.status, message or f"docker API error {resp.status}")
+            if body and (resp.getheader("Content-Type") or "").startswith("application/json"):
+                return json.loads(body)
+            return body
+        raise DockerAPIError(0, "docker API request failed")
+
+    def containers(self, all=True):
+        return self.request("GET", "/containers/json", {"all": 1 if all else 0}) or []
+
+    def inspect(self, name):
+        return self.request("GET", f"/containers/{quote(name, safe='')}/json") or {}
+
+    def action(self, name, action, stop_timeout=10):
+        query = {"t": stop_timeout} if action in ("stop", "restart") else None
+        return self.request("POST", f"/containers/{quote(name, safe='')}/{action}", query,
+                            timeout=self.timeout + stop_timeout + 5)
+
+    def logs(self, name, tail=None, timestamps=False, since=None, timeout=None):
+        query = {"stdout": 1, "stderr": 1}
+        if tail is not None:
+            query["tail"] = tail
+        if timestamps:
+            query["timestamps"] = 1
+        if since is not None:
+            query["since"] = since
+        raw = self.request("GET", f"/containers/{quote(name, safe='')}/logs", query, timeout=timeout)
+        return _demux_docker_stream(raw or b"").decode("utf-8", "replace")
+
+
+_DOCKER_CLIENT = {"client": None}
+_DOCKER_INSPECT_CACHE = {}
+_CONTAINER_RUNNING_CACHE = {}
+_docker_inspect_lock = threading.Lock()
+
+
+def _docker_client():
+    if not DOCKER_API or not os.path.exists(DOCKER_SOCKET):
+        return None
+    client = _DOCKER_CLIENT.get("client")
+    if client is None or client.socket_path != DOCKER_SOCKET:
+        client = DockerEngineClient(DOCKER_SOCKET)
+        _DOCKER_CLIENT["client"] = client
+    return client
+
+
+def _docker_inspect(name, max_age=None):
+    """Inspect a container through the API; one call refreshes every cache derived from it."""
+    client = _docker_client()
+    if client is None or not name:
+        return None
+    max_age = DOCKER_INSPECT_CACHE_SEC if max_age is None else max_age
+    started = time.time()
+    # concurrent probes asking for the same container share one API call
+    with _docker_inspect_lock:
+        now = time.time()
+        entry = _DOCKER_INSPECT_CACHE.get(name)
+        if entry and ((now - entry["ts"]) < max_age or entry["ts"] >= started):
+            return entry["data"]
+        data = client.inspect(name)
+        _DOCKER_INSPECT_CACHE[name] = {"ts": now, "data": data}
+        _apply_inspect_caches(name, data, now)
+    return data
+
+
+def _mining_state_sync_from_env(env_list):
+    for env_entry in env_list or []:
+        if isinstance(env_entry, str) and env_entry.startswith("NODE_ARGS="):
+            return "--miningstatesync" in env_entry
+    return None
+
+
+def _apply_inspect_caches(name, data, now):
+    state = data.get("State") or {}
+    _CONTAINER_RUNNING_CACHE[name] = {"ts": now, "running": bool(state.get("Running"))}
+    node_container = (os.getenv("BDAG_NODE_CONTAINER", "") or "").strip() or MINING_STATE_SYNC_CONTAINER
+    if name == node_container:
+        _NODE_UPTIME_CACHE["start_ts"] = _parse_iso_timestamp(state.get("StartedAt"))
+        _NODE_UPTIME_CACHE["checked"] = now
+    if name == MINING_STATE_SYNC_CONTAINER:
+        _MINING_STATE_SYNC_CACHE["value"] = _mining_state_sync_from_env((data.get("Config") or {}).get("Env"))
+        _MINING_STATE_SYNC_CACHE["ts"] = now
+        _MINING_STATE_SYNC_CACHE["error"] = None
+
+DOCKER_EVENTS = os.getenv("DASH_DOCKER_EVENTS", "1") == "1"
+DOCKER_EVENTS_RESYNC_SEC = float(os.getenv("DASH_DOCKER_EVENTS_RESYNC_SEC", "300"))
+_CONTAINER_EVENT_ACTIONS = ("create", "start", "stop", "die", "restart", "destroy", "rename", "pause", "unpause")
+
+
+def _human_duration(seconds):
+    """Docker-style relative duration ("5 minutes", "About an hour")."""
+    seconds = max(float(seconds), 0.0)
+    if seconds < 1:
+        return "Less than a second"
+    if seconds < 60:
+        return "1 second" if int(seconds) == 1 else f"{int(seconds)} seconds"
+    minutes = int(seconds / 60)
+    if minutes == 1:
+        return "About a minute"
+    if minutes < 60:
+        return f"{minutes} minutes"
+    hours = int(seconds / 3600 + 0.5)
+    if hours == 1:
+        return "About an hour"
+    if hours < 48:
+        return f"{hours} hours"
+    if hours < 24 * 7 * 2:
+        return f"{hours // 24} days"
+    if hours < 24 * 30 * 2:
+        return f"{hours // (24 * 7)} weeks"
+    if hours < 24 * 365 * 2:
+        return f"{hours // (24 * 30)} months"
+    return f"{hours // (24 * 365)} years"
+
+
+def _container_status_text(entry, now):
+    state = entry.get("state") or ""
+    started = entry.get("started_at")
+    finished = entry.get("finished_at")
+    if state in ("running", "paused"):
+        text = f"Up {_human_duration(now - started)}" if started else "Up"
+        return f"{text} (Paused)" if state == "paused" else text
+    if state == "restarting":
+        ago = f" {_human_duration(now - finished)} ago" if finished else ""
+        return f"Restarting ({entry.get('exit_code', 0)}){ago}"
+    if state in ("exited", "dead"):
+        ago = f" {_human_duration(now - finished)} ago" if finished else ""
+        return f"Exited ({entry.get('exit_code', 0)}){ago}"
+    return state.capitalize()
+
+
+class _ContainerWatcher:
+    """In-memory container table kept current by the Docker events stream.
+
+    The table is rebuilt from a full list on start, after the stream drops and
+    every DOCKER_EVENTS_RESYNC_SEC without events; otherwise only the container
+    named in a start/stop/die/restart/... event is re-inspected.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self.table = {}
+        self.lock = threading.Lock()
+        self.ready = threading.Event()
+        self.thread = None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="bdag-docker-events", daemon=True)
+            self.thread.start()
+        return self
+
+    def _entry(self, name):
+        data = _docker_inspect(name, max_age=0) or {}
+        state = data.get("State") or {}
+        finished = _parse_iso_timestamp(state.get("FinishedAt"))
+        return {
+            "name": name,
+            "state": state.get("Status") or ("running" if state.get("Running") else "exited"),
+            "started_at": _parse_iso_timestamp(state.get("StartedAt")),
+            "finished_at": finished if finished and finished > 0 else None,
+            "exit_code": state.get("ExitCode", 0),
+        }
+
+    def refresh(self, name):
+        try:
+            entry = self._entry(name)
+        except DockerAPIError as exc:
+            if exc.status == 404:
+                with self.lock:
+                    self.table.pop(name, None)
+            return
+        except Exception:
+            return
+        with self.lock:
+            self.table[name] = entry
+
+    def resync(self):
+        table = {}
+        for info in self.client.containers(all=True):
+            names = info.get("Names") or []
+            name = (names[0] if names else info.get("Id", "")[:12]).lstrip("/")
+            try:
+                table[name] = self._entry(name)
+            except Exception:
+                table[name] = {"name": name, "state": info.get("State") or "", "started_at": None,
+                               "finished_at": None, "exit_code": 0, "status": info.get("Status") or ""}
+        with self.lock:
+            self.table = table
+        self.ready.set()
+
+    def items(self):
+        now = time.time()
+        with self.lock:
+            entries = sorted(self.table.values(), key=lambda e: e["name"])
+        return [{"name": e["name"], "status": e.get("status") or _container_status_text(e, now)} for e in entries]
+
+    def _apply_event(self, event):
+        if event.get("Type", "container") != "container":
+            return
+        action = (event.get("Action") or event.get("status") or "").split(":", 1)[0]
+        attrs = (event.get("Actor") or {}).get("Attributes") or {}
+        name = attrs.get("name") or ""
+        if not name or action not in _CONTAINER_EVENT_ACTIONS:
+            return
+        if action == "destroy":
+            with self.lock:
+                self.table.pop(name, None)
+            return
+        if action == "rename":
+            old = (attrs.get("oldName") or "").lstrip("/")
+            with self.lock:
+                self.table.pop(old, None)
+        self.refresh(name)
+
+    def _follow(self):
+        conn = _UnixHTTPConnection(self.client.socket_path, DOCKER_EVENTS_RESYNC_SEC)
+        try:
+            filters = json.dumps({"type": ["container"], "event": list(_CONTAINER_EVENT_ACTIONS)})
+            conn.request("GET", "/events?" + urlencode({"filters": filters}), headers={"Host": "docker"})
+            resp = conn.getresponse()
+            if resp.status != 200:
+                raise DockerAPIError(resp.status, resp.read().decode("utf-8", "replace"))
+            while True:
+                line = resp.readline()
+                if not line:
+                    return
+                line = line.strip()
+                if line:
+                    try:
+                        self._apply_event(json.loads(line))
+                    except ValueError:
+                        continue
+        finally:
+            conn.close()
+
+    def _run(self):
+        backoff = 1.0
+        while True:
+            try:
+                self.resync()
+                backoff = 1.0
+                self._follow()
+            except socket.timeout:
+                # quiet period: resync to catch anything the stream may have missed
+                continue
+            except Exception:
+                app.logger.debug("docker events watcher error", exc_info=True)
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+
+_CONTAINER_WATCHER = {"watcher": None}
+
+
+def _container_watcher(client):
+    watcher = _CONTAINER_WATCHER.get("watcher")
+    if watcher is None or watcher.client is not client:
+        watcher = _ContainerWatcher(client).start()
+        _CONTAINER_WATCHER["watcher"] = watcher
+    return watcher
+
+# ----- Container log follower -----
+_ANSI_RE = re.compile(rb"\x1B\[[0-?]*[ -/]*[@-~]")
+LOG_FOLLOW_IDLE_SEC = 120.0
+LOG_READY_WAIT_SEC = 2.0
+
 
-activity_labels    = deque(maxlen=WINDOW)
-activity_mined     = deque(maxlen=WINDOW)
-activity_processed = deque(maxlen=WINDOW)
-activity_sealed    = deque(maxlen=WINDOW)
+def _docker_log_since(ts):
+    """Docker's ``since`` form (``seconds.nanoseconds``) of a ``--timestamps`` line prefix."""
+    try:
+        secs = int(datetime.strptime(ts[:19], "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc).timestamp())
+    except ValueError:
+        return None
+    frac = ts[20:].rstrip("Z").split("+")[0] if ts[19:20] == "." else ""
+    return f"{secs}.{frac.ljust(9, '0')[:9]}"
+
+
+class _LogFollower:
+    """Bounded in-memory tail of one container's log, fed by a single follow stream.
+
+    Lines are ANSI-stripped once on the way in and numbered, so ``read`` serves
+    any ``limit`` or ``since`` cursor from memory. When the stream ends (the
+    container stopped, restarted or was recreated) the follower reconnects from
+    the timestamp of the last stored line and skips anything it already holds.
+    Uses the Engine API when the socket is available, else one ``docker logs
+    --follow`` process.
+    """
+
+    def __init__(self, client, container, capacity):
+        self.client = client
+        self.container = container
+        self.lines = deque(maxlen=max(1, int(capacity)))
+        self.seq = 0
+        self.last_ts = ""
+        self.cond = threading.Condition()
+        self.ready = threading.Event()
+        self.stopped = False
+        self.thread = None
+        self._skip_until = ""
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="bdag-log-follower", daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped = True
+
+    def cursor(self):
+        with self.cond:
+            return self.seq
+
+    def read(self, limit=None, since=None):
+        """``(lines, cursor, reset)``: lines after cursor ``since``, else the last ``limit``.
+
+        ``reset`` is True when the result replaces rather than extends what the
+        caller holds (no or unknown cursor, or more new lines than ``limit``).
+        """
+        with self.cond:
+            held = len(self.lines)
+            if since is not None and self.seq - held <= since <= self.seq:
+                count, reset = self.seq - since, False
+            else:
+                count, reset = held, True
+            if limit is not None and count > max(int(limit), 0):
+                count, reset = max(int(limit), 0), True
+            lines = list(self.lines)[held - count:] if count else []
+            return lines, self.seq, reset
+
+    def wait(self, since, timeout):
+        with self.cond:
+            self.cond.wait_for(lambda: self.seq > since or self.stopped, timeout)
+            return self.seq
+
+    def _store(self, raw_lines):
+        kept = []
+        for raw in raw_lines:
+            line = _ANSI_RE.sub(b"", raw).decode("utf-8", "replace").rstrip()
+            if not line.strip():
+                continue
+            ts = line.split(" ", 1)[0]
+            if self._skip_until:
+                # replayed after a reconnect: already stored
+                if ts <= self._skip_until:
+                    continue
+                self._skip_until = ""
+            kept.append(line)
+            self.last_ts = ts
+        if kept:
+            with self.cond:
+                self.lines.extend(kept)
+                self.seq += len(kept)
+                self.cond.notify_all()
+
+    def _feed(self, pending, chunk):
+        parts = (pending + chunk).split(b"\n")
+        self._store(parts[:-1])
+        return parts[-1]
+
+    def _backfill(self):
+        tail = self.lines.maxlen
+        if self.client is not None:
+            out = self.client.logs(self.container, tail=tail, timestamps=True, timeout=10)
+        else:
+            out = subprocess.check_output([DOCKER_BIN or "docker", "logs", "--tail", str(tail), "--timestamps",
+                                           self.container], stderr=subprocess.STDOUT, text=True, timeout=10)
+        self._store(out.encode("utf-8").splitlines())
+
+    def _follow_api(self):
+        info = _docker_inspect(self.container, max_age=0) or {}
+        tty = bool((info.get("Config") or {}).get("Tty"))
+        query = {"follow": 1, "stdout": 1, "stderr": 1, "timestamps": 1}
+        since = _docker_log_since(self.last_ts) if self.last_ts else None
+        if since:
+            query["since"] = since
+        else:
+            query["tail"] = 0
+        conn = _UnixHTTPConnection(self.client.socket_path, LOG_FOLLOW_IDLE_SEC)
+        try:
+            conn.request("GET", f"/containers/{quote(self.container, safe='')}/logs?" + urlencode(query),
+                         headers={"Host": "docker"})
+            resp = conn.getresponse()
+            if resp.status != 200:
+                raise DockerAPIError(resp.status, resp.read().decode("utf-8", "replace"))
+            pending = b""
+            while not self.stopped:
+                if tty:
+                    chunk = resp.read1(65536)
+                else:
+                    # non-TTY streams are framed: 8-byte header (stream, 0, 0, 0, big-endian size)
+                    header = resp.read(8)
+                    chunk = resp.read(int.from_bytes(header[4:8], "big")) if len(header) == 8 else b""
+                if not chunk:
+                    return
+                pending = self._feed(pending, chunk)
+        finally:
+            conn.close()
+
+    def _follow_cli(self):
+        cmd = [DOCKER_BIN or "docker", "logs", "--follow", "--timestamps"]
+        cmd += ["--since", self.last_ts] if self.last_ts else ["--tail", "0"]
+        proc = subprocess.Popen(cmd + [self.container], stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        try:
+            for raw in proc.stdout:
+                if self.stopped:
+                    return
+                self._store([raw])
+        finally:
+            proc.kill()
+            proc.wait()
+
+    def _run(self):
+        backoff = 1.0
+        while not self.stopped:
+            before = self.seq
+            try:
+                if not self.seq:
+                    self._backfill()
+                self.ready.set()
+                self._skip_until = self.last_ts
+                if self.client is not None:
+                    self._follow_api()
+                else:
+                    self._follow_cli()
+            except socket.timeout:
+                # quiet log: reconnect from the last stored timestamp
+                continue
+            except Exception:
+                app.logger.debug("log follower error", exc_info=True)
+            self.ready.set()
+            # a stopped container ends the stream at once; back off until it logs again
+            backoff = 1.0 if self.seq > before else min(backoff * 2, 10.0)
+            time.sleep(backoff)
+
+
+_LOG_FOLLOWER = {"follower": None}
+_log_follower_lock = threading.Lock()
+
+
+def _log_follower():
+    """The running follower for the node container, started on first use."""
+    client = _docker_client()
+    if client is None and not DOCKER_BIN:
+        return None
+    with _log_follower_lock:
+        follower = _LOG_FOLLOWER.get("follower")
+        if follower is None or follower.client is not client or follower.container != MINING_STATE_SYNC_CONTAINER:
+            if follower is not None:
+                follower.stop()
+            follower = _LogFollower(client, MINING_STATE_SYNC_CONTAINER, LOG_BUFFER_LINES).start()
+            _LOG_FOLLOWER["follower"] = follower
+    return follower
+
+# ----- Series -----
+class SeriesRing:
+    """Fixed-capacity ring of samples stored column-wise.
+
+    Timestamps live in one int64 array and every value column in its own
+    float64 array (None is stored as NaN), so a point costs 8 bytes per column
+    instead of a tuple of boxed numbers. Appends are O(1); ``views`` exposes the
+    live window as zero-copy memoryview segments, oldest first.
+
+    ``rates`` maps extra column names to a source column; each append stores the
+    clamped per-second rate of change of that column against the previous
+    sample (0 for the first one, missing values count as 0), so readers slice a
+    ready-made derivative instead of recomputing it over the whole window.
+
+    Columns named in ``ints`` hold whole numbers (heights, peer counts) and are
+    read back as ints, so they serialize as ``123`` rather than ``123.0``.
+    """
+
+    def __init__(self, capacity, columns=("value",), rates=None, ints=()):
+        self.rates = dict(rates or {})
+        self.columns = tuple(columns) + tuple(self.rates)
+        self.ints = frozenset(ints)
+        # ``appended`` counts every sample ever added and ``epoch`` changes whenever the
+        # contents are replaced, so ``cursor()`` pins an exact position for delta reads.
+        self.appended = 0
+        self.epoch = 0
+        self._alloc(max(1, int(capacity)))
+
+    def _alloc(self, capacity):
+        self.capacity = capacity
+        self._ts = array("q", bytes(8 * capacity))
+        self._cols = {name: array("d", bytes(8 * capacity)) for name in self.columns}
+        self._head = 0
+        self._size = 0
+        # Columns that have held a missing value and need NaN -> None on the way out.
+        self._nullable = set()
+
+    @property
+    def maxlen(self):
+        return self.capacity
+
+    def __len__(self):
+        return self._size
+
+    def append(self, ts_ms, *values):
+        idx = self._head
+        self._ts[idx] = int(ts_ms)
+        for (name, col), val in zip(self._cols.items(), values):
+            if val is None or val != val:
+                self._nullable.add(name)
+                val = math.nan
+            col[idx] = val
+        if self.rates:
+            prev = (idx - 1) % self.capacity if self._size else None
+            dt = (int(ts_ms) - self._ts[prev]) / 1000.0 if prev is not None else 0.0
+            for name, source in self.rates.items():
+                rate = 0.0
+                if dt > 0:
+                    src = self._cols[source]
+                    cur, old = src[idx], src[prev]
+                    delta = (cur if cur == cur else 0.0) - (old if old == old else 0.0)
+                    if delta > 0:
+                        rate = delta / dt
+                self._cols[name][idx] = rate
+        self._head = (idx + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+        self.appended += 1
+
+    def clear(self):
+        self._head = 0
+        self._size = 0
+        self.epoch += 1
+
+    def cursor(self):
+        return f"{self.epoch}-{self.appended}"
+
+    def start_for(self, cursor=None, since_ms=None, epoch=None):
+        """Logical start of a delta read, and whether the reader must replace what it holds.
+
+        A cursor from another epoch (cleared or reloaded) or one whose points have
+        already rolled out of the ring forces a full read; so does a ``since_ms``
+        read against an empty ring, from before the oldest retained point or
+        with an ``epoch`` that no longer matches.
+        """
+        if cursor:
+            try:
+                epoch, count = (int(part) for part in str(cursor).split("-", 1))
+            except ValueError:
+                return 0, True
+            missed = self.appended - count
+            if epoch != self.epoch or missed < 0 or missed > self._size:
+                return 0, True
+            return self._size - missed, False
+        if since_ms is not None:
+            if not self._size or since_ms < self.at(0) or (epoch is not None and epoch != self.epoch):
+                return 0, True
+            return self.index_since(since_ms + 1), False
+        return 0, True
+
+    def _spans(self, start=0):
+        """Physical ``(lo, hi)`` slices covering logical positions ``start..len``."""
+        count = self._size - max(start, 0)
+        if count <= 0:
+            return []
+        first = (self._head - count) % self.capacity
+        end = first + count
+        if end <= self.capacity:
+            return [(first, end)]
+        return [(first, self.capacity), (0, end - self.capacity)]
+
+    def views(self, column=None, start=0):
+        """Memoryview segments of the timestamp column (or ``column``) from logical ``start``."""
+        buf = memoryview(self._ts if column is None else self._cols[column])
+        return [buf[lo:hi] for lo, hi in self._spans(start)]
+
+    def labels(self, start=0):
+        out = []
+        for view in self.views(None, start):
+            out.extend(view.tolist())
+        return out
+
+    def column(self, name, start=0):
+        out = []
+        for view in self.views(name, start):
+            out.extend(view.tolist())
+        if name in self.ints:
+            if name in self._nullable:
+                return [None if v != v else int(v) for v in out]
+            return [int(v) for v in out]
+        if name in self._nullable:
+            return [None if v != v else v for v in out]
+        return out
+
+    def at(self, pos, name=None):
+        """Value at logical position ``pos`` (negative counts from the newest)."""
+        if pos < 0:
+            pos += self._size
+        if not 0 <= pos < self._size:
+            raise IndexError(pos)
+        idx = (self._head - self._size + pos) % self.capacity
+        if name is None:
+            return self._ts[idx]
+        val = self._cols[name][idx]
+        if val != val:
+            return None
+        return int(val) if name in self.ints else val
+
+    def index_since(self, ts_ms):
+        """Logical position of the first sample at or after ``ts_ms``."""
+        lo, hi = 0, self._size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.at(mid) < ts_ms:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def resize(self, capacity):
+        """Change capacity keeping the newest samples; columns are copied slice-wise."""
+        capacity = max(1, int(capacity))
+        keep = min(self._size, capacity)
+        spans = self._spans(self._size - keep)
+        old_ts, old_cols, nullable = self._ts, self._cols, self._nullable
+        self._alloc(capacity)
+        self._nullable = nullable
+        pos = 0
+        for lo, hi in spans:
+            self._ts[pos:pos + hi - lo] = old_ts[lo:hi]
+            for name, col in self._cols.items():
+                col[pos:pos + hi - lo] = old_cols[name][lo:hi]
+            pos += hi - lo
+        self._size = keep
+        self._head = keep % capacity
+
+    def load(self, rows):
+        """Replace the contents with ``(ts_ms, *values)`` rows, oldest first."""
+        self.clear()
+        for row in rows[-self.capacity:]:
+            self.append(*row)
+
+
+live_series = SeriesRing(WINDOW, ("height", "remote", "peers", "latency"), rates={"height_rate": "height"},
+                         ints=("height", "remote", "peers", "latency"))
+activity_series = SeriesRing(WINDOW, ("mined", "processed", "sealed", "total"), rates={"rate": "total"})
 
 def _activity_totals_state():
     return globals().setdefault("_ACTIVITY_TOTALS", {
@@ -245,67 +1044,13 @@ def _activity_totals_snapshot():
         "sealed": float(totals.get("sealed", 0.0) or 0.0),
     }
 
-def _activity_total_series_locked():
-    mined_list = list(activity_mined)
-    processed_list = list(activity_processed)
-    sealed_list = list(activity_sealed)
-    length = len(activity_labels)
-    totals = []
-    for idx in range(length):
-        mined_val = _finite(mined_list[idx] if idx < len(mined_list) else 0.0, 0.0)
-        processed_val = _finite(processed_list[idx] if idx < len(processed_list) else 0.0, 0.0)
-        sealed_val = _finite(sealed_list[idx] if idx < len(sealed_list) else 0.0, 0.0)
-        total_val = max(mined_val + processed_val + sealed_val, 0.0)
-        totals.append(float(total_val))
-    return totals
-
-def _rate_series_from(labels, values):
-    rates = []
-    prev_total = None
-    prev_ts = None
-    count = min(len(labels), len(values))
-    for idx in range(count):
-        ts_raw = labels[idx]
-        total_raw = values[idx]
-        try:
-            ts_val = int(ts_raw)
-        except Exception:
-            ts_val = None
-        total_val = _finite(total_raw, 0.0)
-        if ts_val is None or not math.isfinite(total_val):
-            rates.append(0.0)
-            continue
-        total_val = max(float(total_val), 0.0)
-        if prev_total is None or prev_ts is None or ts_val <= prev_ts:
-            rates.append(0.0)
-        else:
-            dt = max((ts_val - prev_ts) / 1000.0, 0.0)
-            delta = max(total_val - prev_total, 0.0)
-            rate_val = delta / dt if dt > 0 else 0.0
-            rates.append(max(_finite(rate_val, 0.0), 0.0))
-        prev_total = total_val
-        if ts_val is not None:
-            prev_ts = ts_val
-    if len(labels) > count:
-        rates.extend([0.0] * (len(labels) - count))
-    return [float(r) if isinstance(r, (int, float)) else 0.0 for r in rates]
-
 lock = threading.Lock()
 
 HISTORY_POINTS = int(os.getenv("BDAG_HISTORY_POINTS", "720"))
 history_lock = threading.Lock()
-# height history intentionally omitted to keep height chart live-only
-_history_series = {
-    "height_local": deque(maxlen=HISTORY_POINTS),
-    "height_remote": deque(maxlen=HISTORY_POINTS),
-    "peers": deque(maxlen=HISTORY_POINTS),
-    "latency": deque(maxlen=HISTORY_POINTS),
-    "mined": deque(maxlen=HISTORY_POINTS),
-    "processed": deque(maxlen=HISTORY_POINTS),
-    "sealed": deque(maxlen=HISTORY_POINTS),
-    "activity": deque(maxlen=HISTORY_POINTS),
-    "height_dx": deque(maxlen=HISTORY_POINTS),
-}
+HISTORY_FIELDS = ("height_local", "height_remote", "peers", "latency",
+                  "mined", "processed", "sealed", "activity", "height_dx")
+_history_series = SeriesRing(HISTORY_POINTS, HISTORY_FIELDS, rates={"activity_rate": "activity"})
 _history_state = {"last_ts": None, "last_height": None}
 
 
@@ -324,12 +1069,13 @@ def _history_push(ts_ms, height, peers, latency, mined, processed, sealed, activ
         h_val = float(height or 0)
     except Exception:
         h_val = 0.0
+    # peers / latency stay missing (NaN) when their probe was late
     try:
-        p_val = float(peers or 0)
+        p_val = None if peers is None else float(peers)
     except Exception:
         p_val = 0.0
     try:
-        l_val = float(latency or 0)
+        l_val = None if latency is None else float(latency)
     except Exception:
         l_val = 0.0
     try:
@@ -362,16 +1108,18 @@ def _history_push(ts_ms, height, peers, latency, mined, processed, sealed, activ
                 dx = max((h_val - last_height) / dt, 0.0)
         _history_state["last_ts"] = ts_ms
         _history_state["last_height"] = h_val
-        _history_series["height_local"].append((ts_ms, h_val))
-        _history_series["height_remote"].append((ts_ms, remote_val))
-        _history_series["peers"].append((ts_ms, p_val))
-        _history_series["latency"].append((ts_ms, l_val))
-        _history_series["mined"].append((ts_ms, mined_val))
-        _history_series["processed"].append((ts_ms, processed_val))
-        _history_series["sealed"].append((ts_ms, sealed_val))
-        _history_series["activity"].append((ts_ms, activity_val))
-        _history_series["height_dx"].append((ts_ms, dx))
+        values = (h_val, remote_val, p_val, l_val, mined_val, processed_val, sealed_val, activity_val, dx)
+        _history_series.append(ts_ms, *values)
+        activity_rate = _history_series.at(-1, "activity_rate")
     globals()["__history_last_ts"] = ts_ms
+    for tier in ROLLUP_TIERS:
+        tier.add(ts_ms, values + (activity_rate,))
+    store = _history_store()
+    if store is not None:
+        try:
+            store.append(ts_ms, values)
+        except Exception:
+            app.logger.debug("history store append failed", exc_info=True)
 
 
 def _node_state_cache():
@@ -410,64 +1158,688 @@ def _node_state_store():
     })
 
 
-def _history_pack(key):
-    series = _history_series.get(key) or []
-    labels = [ts for ts, _ in series]
-    values = [val for _, val in series]
-    return {"labels": labels, "series": values}
+def _delta_args():
+    """``(cursor, since_ms, epoch)`` from the query string of a chart/history request."""
+    cursor = request.args.get("cursor") or None
+    since = request.args.get("since", "")
+    try:
+        since_ms = int(since) if since else None
+    except ValueError:
+        since_ms = None
+    try:
+        epoch = int(request.args["epoch"]) if request.args.get("epoch") else None
+    except ValueError:
+        epoch = -1
+    return cursor, since_ms, epoch
+
+
+def _ring_delta(ring, cursor=None, since_ms=None, epoch=None):
+    """Start position plus the cursor/epoch/reset/window fields every delta-capable payload carries."""
+    start, reset = ring.start_for(cursor, since_ms, epoch)
+    return start, {"cursor": ring.cursor(), "epoch": ring.epoch, "reset": reset, "window": ring.maxlen}
+
+
+def _history_pack(ring, labels, key, start=0):
+    return {"labels": labels, "series": ring.column(key, start)}
+
+
+def _ring_history_payload(ring, cursor=None, since_ms=None, epoch=None):
+    start, meta = _ring_delta(ring, cursor, since_ms, epoch)
+    labels = ring.labels(start)
+    payload = {key: _history_pack(ring, labels, key, start) for key in HISTORY_FIELDS}
+    payload.update(meta)
+    return payload
 
 
-def _history_payload():
+def _history_payload(cursor=None, since_ms=None, epoch=None):
     with history_lock:
-        return {
-            "height_local": _history_pack("height_local"),
-            "height_remote": _history_pack("height_remote"),
-            "peers": _history_pack("peers"),
-            "latency": _history_pack("latency"),
-            "activity": _history_pack("activity"),
-            "mined": _history_pack("mined"),
-            "processed": _history_pack("processed"),
-            "sealed": _history_pack("sealed"),
-            "height_dx": _history_pack("height_dx"),
-        }
+        return _ring_history_payload(_history_series, cursor, since_ms, epoch)
 
 
 def _set_history_points(points: int):
     pts = max(12, int(points))
+    rows = _history_rows(pts) if pts > len(_history_series) else []
     with history_lock:
-        for key, dq in list(_history_series.items()):
-            data = list(dq)[-pts:]
-            _history_series[key] = deque(data, maxlen=pts)
+        _history_series.resize(pts)
+        if len(rows) > len(_history_series):
+            _history_fill_locked(rows)
     CHART_CONFIG["history_len"] = pts
     return pts
 
+# ----- Persistent history store -----
+class HistoryStore:
+    """Append-only segment files of fixed-width records (int64 ts_ms + one float64 per field).
+
+    A new segment is started every ``segment_sec``; whole segments older than
+    ``retention_sec`` are removed on rollover. Every append reaches the OS
+    page cache, but fsync only happens once per ``fsync_sec``. Missing values
+    are stored as NaN.
+    """
+
+    MAGIC = b"BDAGTS01"
+    HEADER = struct.Struct("<8sHH4x")
+
+    def __init__(self, directory, fields=HISTORY_FIELDS, segment_sec=86400, retention_sec=30 * 86400, fsync_sec=30.0):
+        self.directory = Path(directory)
+        self.fields = tuple(fields)
+        self.record = struct.Struct("<q" + "d" * len(self.fields))
+        self.segment_sec = max(60, int(segment_sec))
+        self.retention_sec = max(self.segment_sec, int(retention_sec))
+        self.fsync_sec = max(0.0, float(fsync_sec))
+        self._lock = threading.Lock()
+        self._fh = None
+        self._segment = None
+        self._dirty = False
+        self._last_sync = time.monotonic()
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _header(self):
+        return self.HEADER.pack(self.MAGIC, len(self.fields), self.record.size)
+
+    def _path(self, start):
+        return self.directory / f"history-{start:012d}.tsdb"
+
+    def segments(self):
+        out = []
+        for entry in self.directory.glob("history-*.tsdb"):
+            try:
+                out.append((int(entry.stem.split("-", 1)[1]), entry))
+            except ValueError:
+                continue
+        out.sort()
+        return out
+
+    def _open(self, start):
+        path = self._path(start)
+        fh = open(path, "a+b")
+        size = fh.seek(0, os.SEEK_END)
+        if size:
+            fh.seek(0)
+            if fh.read(self.HEADER.size) != self._header():
+                # Written with a different field layout; keep it aside rather than mixing records.
+                fh.close()
+                path.replace(path.with_name(path.name + ".bad"))
+                return self._open(start)
+            torn = (size - self.HEADER.size) % self.record.size
+            if torn:
+                fh.truncate(size - torn)
+        else:
+            fh.write(self._header())
+            fh.flush()
+        return fh
+
+    def _close_locked(self):
+        if self._fh is None:
+            return
+        try:
+            self._fh.flush()
+            if self._dirty:
+                os.fsync(self._fh.fileno())
+        finally:
+            self._fh.close()
+            self._fh = None
+            self._segment = None
+            self._dirty = False
+
+    def _prune(self):
+        cutoff = time.time() - self.retention_sec
+        segments = self.segments()
+        for (start, path), (next_start, _) in zip(segments, segments[1:]):
+            if next_start <= cutoff and start != self._segment:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    def append(self, ts_ms, values):
+        row = self.record.pack(int(ts_ms), *[float("nan") if v is None else float(v) for v in values])
+        start = int(ts_ms // 1000) // self.segment_sec * self.segment_sec
+        with self._lock:
+            if self._segment != start:
+                self._close_locked()
+                self._fh = self._open(start)
+                self._segment = start
+                self._prune()
+            self._fh.write(row)
+            self._fh.flush()
+            self._dirty = True
+            now = time.monotonic()
+            if now - self._last_sync >= self.fsync_sec:
+                os.fsync(self._fh.fileno())
+                self._dirty = False
+                self._last_sync = now
+
+    def sync(self):
+        with self._lock:
+            if self._fh is not None and self._dirty:
+                os.fsync(self._fh.fileno())
+                self._dirty = False
+                self._last_sync = time.monotonic()
+
+    def close(self):
+        with self._lock:
+            self._close_locked()
+
+    def _read(self, path, limit):
+        with open(path, "rb") as fh:
+            count = (os.fstat(fh.fileno()).st_size - self.HEADER.size) // self.record.size
+            if count <= 0:
+                return []
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm[:self.HEADER.size] != self._header():
+                    return []
+                first = max(count - limit, 0) if limit is not None else 0
+                lo = self.HEADER.size + first * self.record.size
+                hi = self.HEADER.size + count * self.record.size
+                return list(self.record.iter_unpack(mm[lo:hi]))
+
+    def since(self, since_ms):
+        """Return every record newer than ``since_ms``, oldest first."""
+        rows = []
+        for start, path in self.segments():
+            if (start + self.segment_sec) * 1000 <= since_ms:
+                continue
+            try:
+                chunk = self._read(path, None)
+            except (OSError, ValueError):
+                continue
+            rows.extend(row for row in chunk if row[0] > since_ms)
+        return rows
+
+    def tail(self, limit):
+        """Return the newest ``limit`` records, oldest first, reading only the segments needed."""
+        chunks = []
+        need = int(limit)
+        for _, path in reversed(self.segments()):
+            if need <= 0:
+                break
+            try:
+                chunk = self._read(path, need)
+            except (OSError, ValueError):
+                continue
+            chunks.append(chunk)
+            need -= len(chunk)
+        return [row for chunk in reversed(chunks) for row in chunk]
+
+
+_HISTORY_STORE = {"store": None, "failed": False}
+
+
+def _history_store():
+    if not HISTORY_STORE or _HISTORY_STORE["failed"]:
+        return None
+    store = _HISTORY_STORE["store"]
+    if store is None:
+        try:
+            store = HistoryStore(HISTORY_DIR,
+                                 segment_sec=HISTORY_SEGMENT_HOURS * 3600,
+                                 retention_sec=HISTORY_RETENTION_DAYS * 86400,
+                                 fsync_sec=HISTORY_FSYNC_SEC)
+        except Exception:
+            app.logger.warning("history store disabled: cannot use %s", HISTORY_DIR, exc_info=True)
+            _HISTORY_STORE["failed"] = True
+            return None
+        atexit.register(store.close)
+        _HISTORY_STORE["store"] = store
+    return store
+
+
+def _history_rows(limit=None, since_ms=None):
+    store = _history_store()
+    if store is None:
+        return []
+    try:
+        rows = store.tail(limit) if since_ms is None else store.since(since_ms)
+    except Exception:
+        app.logger.debug("history store read failed", exc_info=True)
+        return []
+    return [tuple(None if v != v else v for v in row) for row in rows]
+
+
+def _history_fill_locked(rows):
+    _history_series.load(rows)
+    if rows:
+        _history_state["last_ts"] = rows[-1][0]
+        _history_state["last_height"] = rows[-1][1]
+
+
+def _live_series_fill_locked(rows):
+    live_series.load([(r[0], r[1] or 0, r[2], r[3] or 0, r[4] or 0) for r in rows])
+    # Activity points are only recorded when the totals move, same as sample_once().
+    activity_series.load([(r[0], r[5] or 0.0, r[6] or 0.0, r[7] or 0.0, (r[5] or 0.0) + (r[6] or 0.0) + (r[7] or 0.0))
+                          for i, r in enumerate(rows) if i == 0 or r[5:8] != rows[i - 1][5:8]])
+
+
+# ----- Rollup tiers -----
+# History fields plus the per-sample activity rate the history ring maintains on
+# append, so a bucket's mean rate is read back instead of re-derived from totals.
+ROLLUP_FIELDS = HISTORY_FIELDS + ("activity_rate",)
+
+
+def _with_activity_rate(rows):
+    """``rows`` with the clamped per-second activity rate appended, as SeriesRing computes it."""
+    idx = 1 + HISTORY_FIELDS.index("activity")
+    prev_ts = prev = None
+    for row in rows:
+        cur = row[idx] if row[idx] is not None and row[idx] == row[idx] else 0.0
+        rate = 0.0
+        if prev_ts is not None and row[0] > prev_ts and cur > prev:
+            rate = (cur - prev) * 1000.0 / (row[0] - prev_ts)
+        prev_ts, prev = row[0], cur
+        yield (*row, rate)
+
+
+class RollupTier:
+    """Fixed-width time buckets keeping count/min/max/sum/last of every rollup field.
+
+    Each bucket is ``[start_ms, stats]`` where ``stats`` is one flat float array
+    laid out as counts, mins, maxs, sums and lasts, ``len(fields)`` entries each.
+    """
+
+    def __init__(self, name, bucket_sec, capacity, fields=ROLLUP_FIELDS):
+        self.name = name
+        self.bucket_ms = int(bucket_sec * 1000)
+        self.fields = tuple(fields)
+        self._index = {key: idx for idx, key in enumerate(self.fields)}
+        self.buckets = deque(maxlen=max(1, int(capacity)))
+        self.lock = threading.Lock()
+
+    def _new(self, start):
+        n = len(self.fields)
+        return [start, array("d", [0.0] * n + [math.inf] * n + [-math.inf] * n + [0.0] * n + [math.nan] * n)]
+
+    def _fold(self, stats, values):
+        n = len(self.fields)
+        for idx, val in enumerate(values):
+            if val is None or val != val:
+                continue
+            stats[idx] += 1
+            if val < stats[n + idx]:
+                stats[n + idx] = val
+            if val > stats[2 * n + idx]:
+                stats[2 * n + idx] = val
+            stats[3 * n + idx] += val
+            stats[4 * n + idx] = val
+
+    def add(self, ts_ms, values):
+        start = ts_ms - ts_ms % self.bucket_ms
+        with self.lock:
+            if self.buckets and self.buckets[-1][0] == start:
+                bucket = self.buckets[-1]
+            elif not self.buckets or self.buckets[-1][0] < start:
+                bucket = self._new(start)
+                self.buckets.append(bucket)
+            else:
+                return
+            self._fold(bucket[1], values)
+
+    def _combine(self, cur, old):
+        """Fold the older bucket stats ``old`` into ``cur``."""
+        n = len(self.fields)
+        for idx in range(n):
+            cur[idx] += old[idx]
+            cur[n + idx] = min(cur[n + idx], old[n + idx])
+            cur[2 * n + idx] = max(cur[2 * n + idx], old[2 * n + idx])
+            cur[3 * n + idx] += old[3 * n + idx]
+            if cur[4 * n + idx] != cur[4 * n + idx]:
+                cur[4 * n + idx] = old[4 * n + idx]
+
+    def build(self, rows):
+        """Buckets for ``(ts_ms, *values)`` rows in time order, outside the live ring."""
+        built = []
+        for row in rows:
+            start = row[0] - row[0] % self.bucket_ms
+            if not built or built[-1][0] != start:
+                built.append(self._new(start))
+            self._fold(built[-1][1], row[1:])
+        return built
+
+    def coarsen(self, buckets):
+        """Re-bucket finer-grained buckets (from another tier's ``build``) to this tier's width."""
+        built = []
+        for start, stats in buckets:
+            start -= start % self.bucket_ms
+            if not built or built[-1][0] != start:
+                built.append([start, array("d", stats)])
+            else:
+                merged = array("d", stats)
+                self._combine(merged, built[-1][1])
+                built[-1][1] = merged
+        return built
+
+    def backfill(self, built):
+        """Put buckets older than the live ones in front of them."""
+        with self.lock:
+            live = list(self.buckets)
+            if live:
+                built = [b for b in built if b[0] <= live[0][0]]
+                if built and built[-1][0] == live[0][0]:
+                    self._combine(live[0][1], built.pop()[1])
+            self.buckets = deque(built + live, maxlen=self.buckets.maxlen)
+
+    def entries(self, key, since_ms):
+        """``(start_ms, count, min, max, sum, last)`` for ``key`` in buckets ending after ``since_ms``."""
+        n = len(self.fields)
+        idx = self._index[key]
+        out = []
+        with self.lock:
+            for start, stats in reversed(self.buckets):
+                if start + self.bucket_ms <= since_ms:
+                    break
+                if stats[idx]:
+                    out.append((start, stats[idx], stats[n + idx], stats[2 * n + idx],
+                                stats[3 * n + idx], stats[4 * n + idx]))
+        out.reverse()
+        return out
+
+
+ROLLUP_TIERS = (
+    RollupTier("1m", 60, ROLLUP_1M_POINTS),
+    RollupTier("1h", 3600, ROLLUP_1H_POINTS),
+)
+
+
+def _rollup_backfill(cutoff_ms):
+    """Rebuild the rollup tiers from the persisted history up to ``cutoff_ms``."""
+    if _history_store() is None:
+        return
+    try:
+        horizon_ms = max(t.bucket_ms * (t.buckets.maxlen or 0) for t in ROLLUP_TIERS)
+        rows = _history_rows(since_ms=cutoff_ms - horizon_ms)
+        # Fold raw rows once into the finest tier; coarser tiers are merged from its buckets.
+        buckets = ROLLUP_TIERS[0].build(_with_activity_rate(row for row in rows if row[0] <= cutoff_ms))
+        del rows
+        for idx, tier in enumerate(ROLLUP_TIERS):
+            if idx:
+                buckets = tier.coarsen(buckets)
+            tier.backfill(buckets[-(tier.buckets.maxlen or 1):])
+    except Exception:
+        app.logger.warning("rollup backfill failed", exc_info=True)
+
+
+def _history_warm_start():
+    """Reload chart series and activity totals persisted by a previous process."""
+    rows = _history_rows(max(_history_series.maxlen, WINDOW))
+    if not rows:
+        return 0
+    with history_lock:
+        _history_fill_locked(rows)
+    with lock:
+        _live_series_fill_locked(rows)
+        totals = _activity_totals_state()
+        totals["mined"] = float(rows[-1][5] or 0.0)
+        totals["processed"] = float(rows[-1][6] or 0.0)
+        totals["sealed"] = float(rows[-1][7] or 0.0)
+    threading.Thread(target=_rollup_backfill, args=(rows[-1][0],), daemon=True).start()
+    return len(rows)
+
 # ----- RPC helpers -----
 import requests
+from requests.adapters import HTTPAdapter
+
+RPC_POOL_SIZE = max(1, int(os.getenv("BDAG_RPC_POOL_SIZE", "4")))
+RPC_BATCH = os.getenv("BDAG_RPC_BATCH", "1") == "1"
+HEIGHT_METHODS = ("dag_blockNumber", "bdag_blockNumber", "eth_blockNumber", "getblockcount")
+PEER_COUNT_METHODS = ("net_peerCount", "peer_count")
+PEER_INFO_METHOD = "bdag_getPeerInfo"
+
+_rpc_session_lock = threading.Lock()
+_RPC_SESSIONS = {}
+# Which method name the node answered for each probe, and whether it accepts batch arrays.
+_RPC_METHOD_STATE = {"height": None, "peers": None, "batch": None}
+_rpc_method_lock = threading.Lock()
+
+
+def _pooled_session(key, verify=False, auth=None):
+    session = _RPC_SESSIONS.get(key)
+    if session is not None:
+        return session
+    with _rpc_session_lock:
+        session = _RPC_SESSIONS.get(key)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=RPC_POOL_SIZE, max_retries=0)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.verify = verify
+            session.auth = auth
+            _RPC_SESSIONS[key] = session
+    return session
+
+
+def _rpc_session():
+    auth = (RPC_USER, RPC_PASS) if (RPC_USER or RPC_PASS) else None
+    return _pooled_session("node", verify=False, auth=auth)
+
+
 def rpc_call(method, params=None, timeout=2.5):
     params = params or []
     payload = {"jsonrpc":"2.0","id":1,"method":method,"params":params}
-    auth = (RPC_USER, RPC_PASS) if (RPC_USER or RPC_PASS) else None
-    r = requests.post(RPC_BASE, json=payload, auth=auth, timeout=timeout, verify=False)
+    r = _rpc_session().post(RPC_BASE, json=payload, timeout=timeout)
     r.raise_for_status()
     data = r.json()
-    if "error" in data:
+    if "error" in data and data["error"] is not None:
         raise RuntimeError(data["error"])
     return data.get("result")
 
+
+def _rpc_batch(methods, timeout=2.5):
+    """Send one JSON-RPC 2.0 batch array; returns {method: result or exception}.
+
+    Returns None when the node does not accept batch requests: a well-formed
+    JSON reply that is not an array (usually a single "invalid request" or
+    "batch not supported" error object). That is remembered, so later calls go
+    straight to single requests. Transport, HTTP and decoding failures only
+    fail this round trip.
+    """
+    if not RPC_BATCH or _RPC_METHOD_STATE.get("batch") is False:
+        return None
+    payload = [{"jsonrpc": "2.0", "id": idx, "method": m, "params": []} for idx, m in enumerate(methods)]
+    try:
+        r = _rpc_session().post(RPC_BASE, json=payload, timeout=timeout)
+    except requests.RequestException as exc:
+        # node unreachable: every probe failed in this round trip
+        return {m: exc for m in methods}
+    try:
+        data = r.json()
+    except ValueError:
+        data = None
+    if isinstance(data, dict) and ("error" in data or "result" in data):
+        # the node parsed the array and answered with one object: no batch support
+        with _rpc_method_lock:
+            _RPC_METHOD_STATE["batch"] = False
+        return None
+    if not r.ok or not isinstance(data, list):
+        exc = RuntimeError(f"batch request failed (HTTP {r.status_code}, {type(data).__name__} body)")
+        return {m: exc for m in methods}
+    with _rpc_method_lock:
+        if _RPC_METHOD_STATE.get("batch") is None:
+            _RPC_METHOD_STATE["batch"] = True
+    results = {m: RuntimeError("no response for batch entry") for m in methods}
+    for item in data:
+        if not isinstance(item, dict):
+            continue
+        try:
+            method = methods[int(item.get("id"))]
+        except Exception:
+            continue
+        if item.get("error") is not None:
+            results[method] = RuntimeError(item["error"])
+        else:
+            results[method] = item.get("result")
+    return results
+
+
+def _rpc_int(res):
+    if isinstance(res, Exception):
+        raise res
+    if isinstance(res, str) and res.startswith("0x"):
+        return int(res, 16)
+    return int(res)
+
+
 def try_methods(names):
     for m in names:
         try:
-            res = rpc_call(m, [])
-            if isinstance(res, str) and res.startswith("0x"):
-                return int(res, 16)
-            return int(res)
+            return _rpc_int(rpc_call(m, []))
         except Exception:
             continue
     return None
 
-def get_block_height():
-    return try_methods(["dag_blockNumber","bdag_blockNumber","eth_blockNumber","getblockcount"])
 
+def _peer_count_from_info(peer_info):
+    """Derive a peer count from a bdag_getPeerInfo result; None if it carries no usable count."""
+    peer_list = []
+    count_candidates = []
+    if isinstance(peer_info, list):
+        peer_list = peer_info
+    elif isinstance(peer_info, dict):
+        for key in ("active", "activeCount", "connected", "connections",
+                    "count", "numPeers", "total", "peersCount"):
+            if key in peer_info:
+                count_candidates.append(peer_info.get(key))
+        peers_field = peer_info.get("peers")
+        if isinstance(peers_field, list):
+            peer_list = peers_field
+        else:
+            peer_list = [peer_info]
+    else:
+        peer_list = []
+
+    if count_candidates:
+        for candidate in count_candidates:
+            try:
+                if isinstance(candidate, str) and candidate.strip().lower().startswith("0x"):
+                    cand_val = int(candidate, 16)
+                else:
+                    cand_val = int(candidate)
+                if cand_val >= 0:
+                    return cand_val
+            except Exception:
+                continue
+
+    if peer_list:
+        active = 0
+        for peer in peer_list:
+            if isinstance(peer, dict):
+                flags = (
+                    peer.get("active"),
+                    peer.get("state"),
+                    peer.get("connected"),
+                    peer.get("isActive"),
+                    peer.get("is_connected"),
+                    peer.get("status"),
+                )
+                counted = False
+                for flag in flags:
+                    if isinstance(flag, bool):
+                        if flag:
+                            active += 1
+                            counted = True
+                            break
+                    elif isinstance(flag, (int, float)):
+                        if flag > 0:
+                            active += 1
+                            counted = True
+                            break
+                    elif isinstance(flag, str):
+                        val = flag.strip().lower()
+                        if val in ("true","1","connected","active","running","online","up","ok"):
+                            active += 1
+                            counted = True
+                            break
+                if not counted:
+                    # treat any dict entry as connected if no explicit flag exists
+                    active += 1
+            else:
+                active += 1
+        if active <= 0:
+            active = len(peer_list)
+        if active >= 0:
+            return int(active)
+    return None
+
+
+def _rpc_collect(want_height=True, want_peers=True):
+    """Fetch height and/or peers, batched into one round trip when the node allows it.
+
+    Only the method names the node answered last time are sent; a full probe of
+    all candidates happens on first use or after the remembered method fails.
+    """
+    state = _RPC_METHOD_STATE
+    height_methods = ([state["height"]] if state.get("height") else list(HEIGHT_METHODS)) if want_height else []
+    peer_methods = ([state["peers"]] if state.get("peers") else [*PEER_COUNT_METHODS, PEER_INFO_METHOD]) if want_peers else []
+    batch = _rpc_batch(height_methods + peer_methods)
+    memo = {}
+
+    def fetch(method):
+        if batch is not None:
+            return batch.get(method)
+        if method not in memo:
+            try:
+                memo[method] = rpc_call(method, [])
+            except Exception as exc:
+                memo[method] = exc
+        return memo[method]
+
+    height = None
+    for m in height_methods:
+        try:
+            height = _rpc_int(fetch(m))
+        except Exception:
+            continue
+        state["height"] = m
+        break
+    if want_height and height is None:
+        state["height"] = None
+
+    peers = None
+    base = None
+    for m in peer_methods:
+        res = fetch(m)
+        if isinstance(res, Exception):
+            continue
+        if m == PEER_INFO_METHOD:
+            count = _peer_count_from_info(res)
+            if count is None:
+                continue
+        else:
+            try:
+                count = _rpc_int(res)
+            except Exception:
+                continue
+            if count <= 0:
+                base = count if base is None else base
+                continue
+        peers = count
+        state["peers"] = m
+        break
+    if want_peers and peers is None:
+        if state.get("peers") in PEER_COUNT_METHODS and base is not None:
+            # remembered count method answered 0; check peer info like the probe would
+            try:
+                peers = _peer_count_from_info(rpc_call(PEER_INFO_METHOD, []))
+            except Exception:
+                peers = None
+        elif base is None:
+            state["peers"] = None
+        if peers is None and base is not None and base >= 0:
+            peers = base
+    return height, peers
+
+
+def get_height_and_peers():
+    try:
+        return _rpc_collect(True, True)
+    except Exception:
+        return None, None
+
+
+def get_block_height():
+    try:
+        return _rpc_collect(True, False)[0]
+    except Exception:
+        return None
 
 _REMOTE_HEIGHT_CACHE = {"ts": 0.0, "height": None, "error": None}
 _MINING_STATE_SYNC_CACHE = {"ts": 0.0, "value": None, "error": None}
@@ -501,6 +1873,12 @@ def _parse_iso_timestamp(value):
 
 def _resolve_node_start_ts():
     container = (os.getenv("BDAG_NODE_CONTAINER", "") or "").strip() or MINING_STATE_SYNC_CONTAINER
+    if container and _docker_client() is not None:
+        try:
+            data = _docker_inspect(container)
+            return _parse_iso_timestamp((data.get("State") or {}).get("StartedAt"))
+        except Exception:
+            return None
     docker_cmd = DOCKER_BIN
     if not container or not docker_cmd:
         return None
@@ -539,11 +1917,10 @@ def get_remote_height(force: bool = False):
         return cache.get("height")
     payload = {"jsonrpc": "2.0", "id": 1, "method": REMOTE_RPC_METHOD or "eth_blockNumber", "params": []}
     try:
-        resp = requests.post(
+        resp = _pooled_session("remote", verify=REMOTE_RPC_VERIFY).post(
             base,
             json=payload,
             timeout=REMOTE_RPC_TIMEOUT,
-            verify=REMOTE_RPC_VERIFY,
         )
         resp.raise_for_status()
         data = resp.json()
@@ -576,24 +1953,24 @@ def _mining_state_sync_from_compose():
 def is_mining_state_sync_enabled(force: bool = False):
     container = MINING_STATE_SYNC_CONTAINER
     docker_cmd = DOCKER_BIN
-    if not container or not docker_cmd:
+    api = _docker_client()
+    if not container or not (docker_cmd or api):
         return _mining_state_sync_from_compose()
     now = time.time()
     cache = _MINING_STATE_SYNC_CACHE
     if not force and (now - cache.get("ts", 0.0)) < max(1.0, MINING_STATE_SYNC_CACHE_SEC):
         return cache.get("value")
     try:
+        if api is not None:
+            # fills this cache (and the uptime/running caches) via _apply_inspect_caches
+            _docker_inspect(container, max_age=0 if force else None)
+            return cache.get("value")
         out = subprocess.check_output(
             [docker_cmd, "inspect", "-f", "{{json .Config.Env}}", container],
             text=True,
             timeout=2,
         )
-        env_list = json.loads(out)
-        mining_enabled = None
-        for env_entry in env_list or []:
-            if isinstance(env_entry, str) and env_entry.startswith("NODE_ARGS="):
-                mining_enabled = "--miningstatesync" in env_entry
-                break
+        mining_enabled = _mining_state_sync_from_env(json.loads(out))
         cache["value"] = mining_enabled
         cache["ts"] = now
         cache["error"] = None
@@ -607,83 +1984,13 @@ def is_mining_state_sync_enabled(force: bool = False):
 
 
 def get_peer_count():
-    # Prefer ETH-style 2.0 peers, then fallback to Bitcoin 1.0 getconnectioncount
-    v = try_methods(["net_peerCount","peer_count"])
-    base = v if isinstance(v, int) else int(v) if isinstance(v, float) else None
-    if isinstance(base, int) and base > 0:
-        return base
+    # Prefer ETH-style 2.0 peers, then bdag_getPeerInfo, then Bitcoin 1.0 getconnectioncount
     try:
-        peer_info = rpc_call("bdag_getPeerInfo", [])
-        peer_list = []
-        count_candidates = []
-        if isinstance(peer_info, list):
-            peer_list = peer_info
-        elif isinstance(peer_info, dict):
-            for key in ("active", "activeCount", "connected", "connections",
-                        "count", "numPeers", "total", "peersCount"):
-                if key in peer_info:
-                    count_candidates.append(peer_info.get(key))
-            peers_field = peer_info.get("peers")
-            if isinstance(peers_field, list):
-                peer_list = peers_field
-            else:
-                peer_list = [peer_info]
-        else:
-            peer_list = []
-
-        if count_candidates:
-            for candidate in count_candidates:
-                try:
-                    if isinstance(candidate, str) and candidate.strip().lower().startswith("0x"):
-                        cand_val = int(candidate, 16)
-                    else:
-                        cand_val = int(candidate)
-                    if cand_val >= 0:
-                        return cand_val
-                except Exception:
-                    continue
-
-        if peer_list:
-            active = 0
-            for peer in peer_list:
-                if isinstance(peer, dict):
-                    flags = (
-                        peer.get("active"),
-                        peer.get("state"),
-                        peer.get("connected"),
-                        peer.get("isActive"),
-                        peer.get("is_connected"),
-                        peer.get("status"),
-                    )
-                    counted = False
-                    for flag in flags:
-                        if isinstance(flag, bool):
-                            if flag:
-                                active += 1
-                                counted = True
-                                break
-                        elif isinstance(flag, (int, float)):
-                            if flag > 0:
-                                active += 1
-                                counted = True
-                                break
-                        elif isinstance(flag, str):
-                            val = flag.strip().lower()
-                            if val in ("true","1","connected","active","running","online","up","ok"):
-                                active += 1
-                                counted = True
-                                break
-                    if not counted:
-                        # treat any dict entry as connected if no explicit flag exists
-                        active += 1
-                else:
-                    active += 1
-            if active <= 0:
-                active = len(peer_list)
-            if active >= 0:
-                return int(active)
+        peers = _rpc_collect(False, True)[1]
     except Exception:
-        pass
+        peers = None
+    if isinstance(peers, int) and peers > 0:
+        return peers
     try:
         res = btc_rpc_call("getconnectioncount", [])
         count = int(res)
@@ -691,7 +1998,7 @@ def get_peer_count():
             return count
     except Exception:
         pass
-    return base if isinstance(base, int) and base >= 0 else 0
+    return peers if isinstance(peers, int) and peers >= 0 else 0
 
 # ----- Sampling -----
 def _update_node_state(sample: dict):
@@ -823,36 +2130,59 @@ def _current_node_state():
     return payload
 
 
-def sample_once():
+def _probe_node_rpc():
     t0 = time.time()
-    ok = True
-    health_text = "ok"
-    h = None
+    error = None
+    h = p = None
     try:
-        h = get_block_height()
+        # height and peers share one batched round trip
+        h, p = get_height_and_peers()
     except Exception as e:
+        error = e
+    return {"height": h, "peers": p, "latency_ms": int((time.time() - t0) * 1000), "error": error}
+
+
+def _probed_value(probed, key, fn):
+    """Use the value a probe already collected, or run the probe inline."""
+    if probed is not None and key in probed:
+        return probed[key]
+    return fn()
+
+
+def sample_once(side=None, probed=None):
+    """Take one sample.
+
+    ``side`` is the head.json sidecar dict if the caller already read it and
+    ``probed`` holds results gathered concurrently by the probe engine
+    (keys ``rpc``, ``remote``, ``uptime``); anything missing is fetched inline.
+    """
+    if side is None:
+        try:
+            side = _sidecar_json()
+        except NameError:
+            side = {}
+    ok = True
+    health_text = "ok"
+    rpc = _probed_value(probed, "rpc", _probe_node_rpc) or {}
+    h = rpc.get("height")
+    p = rpc.get("peers")
+    if rpc.get("error") is not None:
         ok = False
-        health_text = f"rpc error: {e}"
-    rpc_latency_ms = int((time.time() - t0) * 1000)
-    p = 0
-    try:
-        p = get_peer_count()
-    except Exception:
-        pass
+        health_text = f"rpc error: {rpc['error']}"
+    rpc_latency_ms = int(rpc.get("latency_ms") or 0)
 
     now_ms = int(time.time()*1000)
     try:
-        resolved_height = height_or_fb(h)
+        resolved_height = height_or_fb(h, side)
     except NameError:
         resolved_height = h if h else 0
     base_peers = p if p is not None else 0
     try:
-        resolved_peers = peers_or_fb(base_peers)
+        resolved_peers = peers_or_fb(base_peers, side)
     except NameError:
         resolved_peers = base_peers
     mined_val = processed_val = sealed_val = 0.0
     try:
-        side = _sidecar_json()
         act = side.get("activity") or {}
         def _rate_for(key):
             v = act.get(key, 0)
@@ -878,17 +2208,20 @@ def sample_once():
     sealed_val = max(_finite(sealed_val, 0.0), 0.0)
     remote_height_val = None
     try:
-        remote_height_raw = get_remote_height()
+        remote_height_raw = _probed_value(probed, "remote", get_remote_height)
         if remote_height_raw is not None:
             remote_height_val = int(max(_finite(remote_height_raw, 0.0), 0.0))
     except Exception:
         remote_height_val = None
+    # metrics whose probe missed its deadline are not charted as if they were fresh
+    late = set((probed or {}).get("late") or ())
+    chart_height = safe_height if safe_height > 0 or "rpc" not in late else None
+    chart_peers = safe_peers if safe_peers > 0 or "rpc" not in late else None
+    chart_latency = None if "rpc" in late else safe_latency
     totals_snapshot = None
     with lock:
-        height_series.append((now_ms, safe_height))
-        remote_height_series.append((now_ms, remote_height_val if remote_height_val is not None else None))
-        peers_series.append((now_ms, safe_peers))
-        lat_series.append((now_ms, safe_latency))
+        if chart_height is not None:
+            live_series.append(now_ms, chart_height, remote_height_val, chart_peers, chart_latency)
         totals = _activity_totals_state()
         last_totals_ts = globals().get("_ACTIVITY_TOTALS_LAST_TS")
         if last_totals_ts is None:
@@ -907,11 +2240,9 @@ def sample_once():
             "sealed": float(totals.get("sealed", 0.0) or 0.0),
         }
         globals()["_ACTIVITY_TOTALS_LAST_TS"] = now_ms
-        if inc_mined or inc_processed or inc_sealed or not activity_labels:
-            activity_labels.append(now_ms)
-            activity_mined.append(totals_snapshot["mined"])
-            activity_processed.append(totals_snapshot["processed"])
-            activity_sealed.append(totals_snapshot["sealed"])
+        if inc_mined or inc_processed or inc_sealed or not activity_series:
+            activity_series.append(now_ms, totals_snapshot["mined"], totals_snapshot["processed"],
+                                   totals_snapshot["sealed"], sum(totals_snapshot.values()))
     if totals_snapshot is None:
         totals_snapshot = _activity_totals_snapshot()
     activity_totals_sum = max(_finite(
@@ -921,15 +2252,16 @@ def sample_once():
     activity_total = max(_finite(mined_val + processed_val + sealed_val, 0.0), 0.0)
     node_uptime_sec = 0
     try:
-        node_uptime_val = get_node_uptime_sec()
+        node_uptime_val = _probed_value(probed, "uptime", get_node_uptime_sec)
         if node_uptime_val is not None:
             node_uptime_sec = int(max(_finite(node_uptime_val, 0.0), 0.0))
     except Exception:
         node_uptime_sec = 0
     try:
-        _history_push(now_ms, safe_height, safe_peers, safe_latency,
-                      totals_snapshot["mined"], totals_snapshot["processed"], totals_snapshot["sealed"],
-                      activity_totals_sum, remote_height_val)
+        if chart_height is not None:
+            _history_push(now_ms, chart_height, chart_peers, chart_latency,
+                          totals_snapshot["mined"], totals_snapshot["processed"], totals_snapshot["sealed"],
+                          activity_totals_sum, remote_height_val)
     except Exception:
         pass
     sample_meta = {
@@ -964,29 +2296,601 @@ def sample_once():
 def ensure_activity_defaults():
     now_ms = int(time.time()*1000)
     with lock:
-        if not activity_labels:
-            activity_labels.append(now_ms)
-            activity_mined.append(0)
-            activity_processed.append(0)
-            activity_sealed.append(0)
+        if not activity_series:
+            activity_series.append(now_ms, 0, 0, 0, 0)
+
+# ----- Probe engine -----
+SAMPLER_ASYNC = os.getenv("DASH_SAMPLER_ASYNC", "1") == "1"
+SAMPLE_DEADLINE_SEC = float(os.getenv("DASH_SAMPLE_DEADLINE_SEC", str(max(1.0, SAMPLE_SEC * 0.6))))
+PROBE_DEADLINES = {
+    "rpc": float(os.getenv("DASH_PROBE_DEADLINE_RPC", "2.5")),
+    "sidecar": float(os.getenv("DASH_PROBE_DEADLINE_SIDECAR", "0.5")),
+    "remote": float(os.getenv("DASH_PROBE_DEADLINE_REMOTE", "1.0")),
+    "uptime": float(os.getenv("DASH_PROBE_DEADLINE_DOCKER", "1.0")),
+    "mining_state_sync": float(os.getenv("DASH_PROBE_DEADLINE_DOCKER", "1.0")),
+}
+
+
+class _ProbeEngine:
+    """Runs the sampler's blocking probes concurrently from an asyncio loop.
+
+    Every probe gets its own deadline (capped by the sample deadline) and the
+    sample is published with whatever finished in time. A probe that is still
+    running is not restarted; a result it delivers before a later tick is used
+    by that tick. Late or failed probes fall back to their defaults and are
+    listed under ``late``; a late or failed ``rpc`` probe also carries an error.
+    """
+
+    def __init__(self, probes, defaults, deadlines, sample_deadline):
+        self.probes = probes
+        self.defaults = defaults
+        self.deadlines = deadlines
+        self.sample_deadline = max(float(sample_deadline), 0.1)
+        self.loop = asyncio.new_event_loop()
+        self.executor = ThreadPoolExecutor(max_workers=len(probes), thread_name_prefix="bdag-probe")
+        self.pending = {}
+        self.late_since = {}
+
+    async def _await_probe(self, name, fut, carried):
+        # a probe already late from an earlier tick is not waited on again
+        timeout = 0 if carried else min(self.deadlines.get(name, self.sample_deadline), self.sample_deadline)
+        try:
+            await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(fut)), timeout)
+        except asyncio.TimeoutError:
+            return name, False
+        except Exception:
+            pass
+        return name, True
+
+    async def _tick(self):
+        carried = set()
+        for name, fn in self.probes.items():
+            fut = self.pending.get(name)
+            if fut is None or fut.done():
+                fut = self.executor.submit(fn)
+                self.pending[name] = fut
+            else:
+                carried.add(name)
+        results = await asyncio.gather(*(
+            self._await_probe(name, self.pending[name], name in carried) for name in self.probes
+        ))
+        return [name for name, finished in results if not finished]
+
+    def _fallback(self, name, error):
+        value = self.defaults.get(name)
+        if isinstance(value, dict):
+            value = dict(value)
+            if "error" in value:
+                value["error"] = error
+        return value
+
+    def collect(self):
+        self.loop.run_until_complete(self._tick())
+        now = time.monotonic()
+        probed = {}
+        late = []
+        for name in self.probes:
+            fut = self.pending[name]
+            if fut.done() and fut.exception() is None:
+                probed[name] = fut.result()
+                self.late_since.pop(name, None)
+                continue
+            late.append(name)
+            since = self.late_since.setdefault(name, now)
+            if fut.done():
+                error = f"probe failed: {fut.exception()}"
+            else:
+                deadline = min(self.deadlines.get(name, self.sample_deadline), self.sample_deadline)
+                error = f"probe timed out ({max(now - since, 0) + deadline:.1f}s)"
+            probed[name] = self._fallback(name, error)
+        probed["late"] = late
+        return probed
+
+
+def _probe_engine():
+    def _sidecar():
+        try:
+            return _sidecar_json()
+        except NameError:
+            return {}
+    probes = {
+        "rpc": _probe_node_rpc,
+        "sidecar": _sidecar,
+        "remote": get_remote_height,
+        "uptime": get_node_uptime_sec,
+        "mining_state_sync": is_mining_state_sync_enabled,
+    }
+    defaults = {
+        "rpc": {"height": None, "peers": None, "latency_ms": 0, "error": None},
+        "sidecar": {},
+        "remote": None,
+        "uptime": None,
+        "mining_state_sync": None,
+    }
+    return _ProbeEngine(probes, defaults, PROBE_DEADLINES, SAMPLE_DEADLINE_SEC)
+
+
+# In snapshot mode the sampler thread is the only caller of sample_once();
+# /api/status serves the last published snapshot instead of sampling per request.
+_status_snapshot = {"current": None}
+_status_snapshot_cond = threading.Condition()
+_sampler_wake = threading.Event()
 
 def sampler():
     ensure_activity_defaults()
+    engine = _probe_engine() if SAMPLER_ASYNC else None
     while True:
+        # cleared before the tick, so a wake-up that arrives during it starts the next one at once
+        _sampler_wake.clear()
+        started = time.time()
         try:
-            sample_once()
+            if engine is not None:
+                probed = engine.collect()
+                side = probed.get("sidecar") or {}
+                result = sample_once(side, probed)
+            else:
+                probed = None
+                result, side = _sample_with_sidecar()
+            # assembled once per sample: snapshot, history and stream share the payload
+            snap = _publish_status_snapshot(result, side, probed) if STATUS_SNAPSHOT else None
+            if snap is not None:
+                ts_ms, payload = snap["ts_ms"], snap["payload"]
+            else:
+                ts_ms = int(time.time() * 1000)
+                payload = _assemble_status(result, side, seen_ms=ts_ms, probed=probed)
+            _record_status_history(ts_ms, payload)
+            if STREAM_ENABLED:
+                _stream_publish_sample(payload)
         except Exception:
             pass
-        time.sleep(max(1, SAMPLE_SEC))
+        # fixed cadence: a slow tick shortens the wait instead of shifting every later sample
+        _sampler_wake.wait(max(max(1, SAMPLE_SEC) - (time.time() - started), 0.05))
+
+# ----- Push stream -----
+class StreamHub:
+    """Fan-out of Server-Sent Events to every /api/stream subscriber.
+
+    Each event is serialized to its SSE frame once at publish time and kept in
+    a short backlog; subscribers only copy frame references, so one sample
+    costs one ``json.dumps`` however many tabs are listening. Clients resume
+    with ``Last-Event-ID``; when that id has left the backlog they get a
+    ``reset`` event and reload everything.
+    """
+
+    def __init__(self, backlog=256, max_clients=2):
+        self.max_clients = max_clients
+        self.clients = 0
+        self._cond = threading.Condition()
+        self._events = deque(maxlen=backlog)
+        self._seq = 0
+        self._on_first = []
+
+    def publish(self, event, data):
+        frame_body = json.dumps(data, separators=(",", ":"))
+        with self._cond:
+            self._seq += 1
+            frame = f"id: {self._seq}\nevent: {event}\ndata: {frame_body}\n\n".encode("utf-8")
+            self._events.append((self._seq, frame))
+            self._cond.notify_all()
+            return self._seq
+
+    def subscribe(self):
+        with self._cond:
+            if self.clients >= self.max_clients:
+                return None
+            self.clients += 1
+            first = self.clients == 1
+            seq = self._seq
+        if first:
+            for hook in self._on_first:
+                hook()
+        return seq
+
+    def unsubscribe(self):
+        with self._cond:
+            self.clients = max(self.clients - 1, 0)
+
+    def on_first_subscriber(self, hook):
+        self._on_first.append(hook)
+
+    def wait(self, seq, timeout):
+        """Frames published after ``seq``; ``gap`` is True when some were already dropped."""
+        with self._cond:
+            if seq > self._seq:
+                return self._seq, [], True
+            self._cond.wait_for(lambda: self._seq > seq, timeout)
+            frames = [frame for fid, frame in self._events if fid > seq]
+            gap = bool(self._events) and self._events[0][0] > seq + 1 and self._seq > seq
+            return self._seq, frames, gap
+
+    def frames(self, seq):
+        # Bounded lifetime: EventSource reconnects with Last-Event-ID, which hands the
+        # waitress thread back periodically and drops subscribers that vanished silently.
+        yield b"retry: 3000\n\n"
+        deadline = time.monotonic() + STREAM_MAX_SEC
+        while time.monotonic() < deadline:
+            seq, frames, gap = self.wait(seq, STREAM_KEEPALIVE_SEC)
+            if gap:
+                yield f"id: {seq}\nevent: reset\ndata: {{}}\n\n".encode("ascii")
+            elif frames:
+                yield b"".join(frames)
+            else:
+                yield b": keepalive\n\n"
+
+
+_STREAM_HUB = StreamHub(max_clients=STREAM_MAX_CLIENTS)
+_STREAM_STATE = {"status": None, "log_follower": False}
+_stream_log_lock = threading.Lock()
+LOG_STREAM_LINES = 60
+
+
+def _stream_publish_sample(payload):
+    """Publish the status fields that changed and the new chart point of this sample."""
+    hub = _STREAM_HUB
+    if not hub.clients:
+        _STREAM_STATE["status"] = payload
+        return
+    prev = _STREAM_STATE["status"] or {}
+    changed = {key: val for key, val in payload.items() if prev.get(key) != val}
+    _STREAM_STATE["status"] = payload
+    if changed:
+        hub.publish("status", changed)
+    with history_lock:
+        if not len(_history_series):
+            return
+        point = {key: _history_series.at(-1, key) for key in
+                 ("height_local", "height_remote", "peers", "latency", "activity", "activity_rate", "height_dx")}
+        point["ts"] = _history_series.at(-1)
+        point["history"] = _history_series.maxlen
+    point["window"] = WINDOW
+    hub.publish("point", point)
+
+
+def _stream_log_follower():
+    """Publish new node log lines from the log follower while anyone is subscribed."""
+    follower = _log_follower()
+    if follower is not None:
+        # start after the initial tail; subscribers already loaded it with the page
+        follower.ready.wait(LOG_READY_WAIT_SEC)
+    cursor = follower.cursor() if follower is not None else 0
+    while True:
+        with _stream_log_lock:
+            if follower is None or not _STREAM_HUB.clients:
+                _STREAM_STATE["log_follower"] = False
+                return
+        try:
+            follower.wait(cursor, STREAM_KEEPALIVE_SEC)
+            lines, cursor, reset = follower.read(LOG_STREAM_LINES, since=cursor)
+            if lines:
+                _STREAM_HUB.publish("log", {"lines": lines, "replace": reset, "cursor": cursor})
+        except Exception:
+            app.logger.debug("stream log follower error", exc_info=True)
+        # coalesce bursts into at most one log event per interval
+        time.sleep(max(STREAM_LOG_SEC, 0.2))
+
+
+def _start_stream_log_follower():
+    with _stream_log_lock:
+        if _STREAM_STATE["log_follower"]:
+            return
+        _STREAM_STATE["log_follower"] = True
+    threading.Thread(target=_stream_log_follower, daemon=True).start()
+
+
+_STREAM_HUB.on_first_subscriber(_start_stream_log_follower)
+
+
+@app.route("/api/stream")
+def api_stream():
+    if not STREAM_ENABLED:
+        return jsonify({"ok": False, "error": "stream disabled"}), 404
+    seq = _STREAM_HUB.subscribe()
+    if seq is None:
+        # Every waitress thread held by a stream is one less for regular requests; polling still works.
+        return jsonify({"ok": False, "error": "too many stream clients"}), 503
+    last_id = request.headers.get("Last-Event-ID", "")
+    if last_id.isdigit():
+        seq = int(last_id)
+    resp = Response(_STREAM_HUB.frames(seq), mimetype="text/event-stream")
+    resp.call_on_close(_STREAM_HUB.unsubscribe)
+    resp.headers["Cache-Control"] = "no-cache"
+    resp.headers["X-Accel-Buffering"] = "no"
+    return resp
+
+# ----- Response compression -----
+try:
+    import brotli  # optional
+except ImportError:
+    brotli = None
+try:
+    import zstandard  # optional
+except ImportError:
+    zstandard = None
+
+COMPRESS_TYPES = {"application/json", "application/octet-stream", "application/javascript", "text/html", "text/css"}
+_GZIP_HEADER = b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff"
+_compress_cache = {}
+_compress_lock = threading.Lock()
+
+
+def _accepted_encodings():
+    accepted = request.accept_encodings
+    return {enc for enc in ("br", "zstd", "gzip") if accepted[enc] > 0}
+
+
+def _negotiate_encoding():
+    accepted = _accepted_encodings()
+    if "br" in accepted and brotli is not None:
+        return "br"
+    if "zstd" in accepted and zstandard is not None:
+        return "zstd"
+    return "gzip" if "gzip" in accepted else None
+
+
+def _compress_body(body, encoding):
+    if encoding == "br":
+        return brotli.compress(body, quality=min(max(COMPRESS_LEVEL, 0), 11))
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=max(COMPRESS_LEVEL, 1)).compress(body)
+    comp = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, 31)
+    return comp.compress(body) + comp.flush()
+
+
+def _compress_cached(body, encoding):
+    """Compressed ``body``, reused while the same bytes are served again (another tab, the next poll)."""
+    key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+    with _compress_lock:
+        hit = _compress_cache.get(key)
+    if hit is not None:
+        return hit
+    data = _compress_body(body, encoding)
+    with _compress_lock:
+        _compress_cache[key] = data
+        while len(_compress_cache) > COMPRESS_CACHE:
+            _compress_cache.pop(next(iter(_compress_cache)))
+    return data
+
+
+def _gzip_prefix(data):
+    """Raw deflate of ``data`` ending on a full flush, so a tail can be spliced on per request."""
+    comp = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, -15)
+    return comp.compress(data) + comp.flush(zlib.Z_FULL_FLUSH), zlib.crc32(data), len(data)
+
+
+def _gzip_splice(prefix, tail):
+    # the tail (a few bytes) goes out as one final stored block after the byte-aligned prefix
+    deflated, crc, size = prefix
+    stored = b"\x01" + struct.pack("<HH", len(tail), len(tail) ^ 0xFFFF) + tail
+    trailer = struct.pack("<II", zlib.crc32(tail, crc), (size + len(tail)) & 0xFFFFFFFF)
+    return _GZIP_HEADER + deflated + stored + trailer
+
+
+@app.after_request
+def _compress_response(resp):
+    if not COMPRESS or resp.status_code != 200 or resp.direct_passthrough or resp.is_streamed:
+        return resp
+    if resp.mimetype not in COMPRESS_TYPES or "Content-Encoding" in resp.headers:
+        return resp
+    resp.vary.add("Accept-Encoding")
+    body = resp.get_data()
+    if len(body) < COMPRESS_MIN_BYTES:
+        return resp
+    encoding = _negotiate_encoding()
+    if encoding is None:
+        return resp
+    resp.set_data(_compress_cached(body, encoding))
+    resp.headers["Content-Encoding"] = encoding
+    return resp
+
+
+# ----- Packed chart encoding -----
+_F32_MAX_EXACT = float(1 << 24)
+_NAN = float("nan")
+
+
+def _le_bytes(arr):
+    if sys.byteorder != "little":
+        arr.byteswap()
+    return base64.b64encode(arr.tobytes()).decode("ascii")
+
+
+def _pack_labels(labels):
+    deltas = array("i", [0] * len(labels))
+    try:
+        for i in range(1, len(labels)):
+            deltas[i] = labels[i] - labels[i - 1]
+    except OverflowError:
+        # a gap (or clock step) beyond int32 milliseconds: keep the plain list
+        return labels
+    return {"t0": labels[0] if labels else 0, "dt": _le_bytes(deltas)}
+
+
+def _pack_values(values):
+    wide = array("d", [_NAN if v is None else v for v in values])
+    finite = [v for v in wide if v == v]
+    if finite and all(v.is_integer() for v in finite):
+        # heights, counters, peers: change from the previous known point, exact in float32
+        base = prev = finite[0]
+        deltas = array("f", [0.0] * len(wide))
+        for i, v in enumerate(wide):
+            if v == v:
+                deltas[i] = v - prev
+                prev = v
+            else:
+                deltas[i] = _NAN
+        if all(abs(d) < _F32_MAX_EXACT for d in deltas if d == d):
+            return {"d32": _le_bytes(deltas), "base": base}
+    elif not finite or max(abs(v) for v in finite) < _F32_MAX_EXACT:
+        return {"f32": _le_bytes(array("f", wide))}
+    return {"f64": _le_bytes(wide)}
+
+
+def _pack_chart(payload):
+    """``format=packed`` form of a chart payload.
+
+    ``labels`` become ``{"t0": first_ms, "dt": base64 int32 deltas}`` and every
+    list aligned with them becomes base64 little-endian floats with NaN for
+    missing points: ``{"f32": ...}``, ``{"f64": ...}`` for values float32 would
+    round, or ``{"d32": ..., "base": first}`` holding per-point changes for
+    integer series (heights, totals, peers). Nested payloads (``/api/history``) are packed
+    per key; everything else is passed through.
+    """
+    labels = payload.get("labels")
+    out = {}
+    for key, val in payload.items():
+        if isinstance(val, dict):
+            out[key] = _pack_chart(val)
+        elif key == "labels" and isinstance(val, list):
+            out[key] = _pack_labels(val)
+        elif isinstance(labels, list) and isinstance(val, list) and len(val) == len(labels):
+            out[key] = _pack_values(val)
+        else:
+            out[key] = val
+    return out
+
+
+def _chart_response(payload):
+    if request.args.get("format") == "packed":
+        payload = _pack_chart(payload)
+    return jsonify(payload)
 
-threading.Thread(target=sampler, daemon=True).start()
 
 # ----- Utils -----
-def _series_to_payload(series):
+def _series_to_payload(series, column):
     with lock:
-        labels = [ts for ts,_ in series]
-        data   = [v  for _,v  in series]
-    return {"labels": labels, "data": data, "len": len(data), "last": (data[-1] if data else None)}
+        start, meta = _ring_delta(series, *_delta_args())
+        labels = series.labels(start)
+        data = series.column(column, start)
+        last = series.at(-1, column) if len(series) else None
+    return {"labels": labels, "data": data, "len": len(data), "last": last, **meta}
+
+
+_RAW_CHART_SERIES = {
+    "height_local": "height",
+    "height_remote": "remote",
+    "peers": "peers",
+    "latency": "latency",
+}
+
+
+def _chart_plan():
+    """Pick the data source for a chart request, or None when the raw window already fits.
+
+    ``range`` (seconds, default the current window) and ``points`` (default
+    ``DASH_CHART_POINTS``) come from the query string. The coarsest rollup
+    tier whose bucket is no wider than ``range / points`` is used, and its
+    buckets are merged further down to about ``points``.
+    """
+    try:
+        range_sec = float(request.args.get("range") or WINDOW * SAMPLE_SEC)
+        points = int(request.args.get("points") or CHART_POINTS)
+    except (TypeError, ValueError):
+        return None
+    points = min(max(points, 12), 5000)
+    width_sec = range_sec / points
+    if width_sec <= SAMPLE_SEC:
+        return None
+    tier = None
+    for candidate in ROLLUP_TIERS:
+        if candidate.bucket_ms / 1000.0 <= width_sec:
+            tier = candidate
+    if tier is None and range_sec > WINDOW * SAMPLE_SEC:
+        tier = ROLLUP_TIERS[0]
+    return {
+        "tier": tier,
+        "since_ms": int(time.time() * 1000 - range_sec * 1000),
+        "width_ms": int(width_sec * 1000),
+    }
+
+
+def _chart_entries(plan, key):
+    tier = plan["tier"]
+    since_ms = plan["since_ms"]
+    if tier is not None:
+        return tier.entries(key, since_ms)
+    name = _RAW_CHART_SERIES.get(key)
+    ring, ring_lock = (live_series, lock) if name else (_history_series, history_lock)
+    with ring_lock:
+        start = ring.index_since(since_ms)
+        labels = ring.labels(start)
+        values = ring.column(name or key, start)
+    return [(ts, 1, v, v, v, v) for ts, v in zip(labels, values) if v is not None]
+
+
+def _chart_buckets(plan, key):
+    """``[start_ms, count, min, max, sum, last]`` per output bucket of ``plan["width_ms"]``."""
+    width_ms = plan["width_ms"]
+    out = []
+    for start, count, lo, hi, total, last in _chart_entries(plan, key):
+        slot = start - start % width_ms
+        if out and out[-1][0] == slot:
+            cur = out[-1]
+            cur[1] += count
+            cur[2] = min(cur[2], lo)
+            cur[3] = max(cur[3], hi)
+            cur[4] += total
+            cur[5] = last
+        else:
+            out.append([slot, count, lo, hi, total, last])
+    return out
+
+
+def _chart_meta(plan, labels):
+    return {
+        "len": len(labels),
+        "tier": plan["tier"].name if plan["tier"] is not None else "raw",
+        "bucket_sec": plan["width_ms"] / 1000.0,
+        # downsampled views are always sent whole; cursors only apply to raw rings
+        "reset": True,
+    }
+
+
+def _rollup_series_payload(plan, key):
+    buckets = _chart_buckets(plan, key)
+    labels = [b[0] for b in buckets]
+    data = [b[4] / b[1] for b in buckets]
+    return {
+        "labels": labels,
+        "data": data,
+        "min": [b[2] for b in buckets],
+        "max": [b[3] for b in buckets],
+        "last": buckets[-1][5] if buckets else None,
+        **_chart_meta(plan, labels),
+    }
+
+
+def _rollup_height_payload(plan):
+    local = _chart_buckets(plan, "height_local")
+    remote_lookup = {b[0]: b[5] for b in _chart_buckets(plan, "height_remote")}
+    labels = [b[0] for b in local]
+    return {
+        "labels": labels,
+        "local": [b[5] for b in local],
+        "local_min": [b[2] for b in local],
+        "local_max": [b[3] for b in local],
+        "remote": [remote_lookup.get(ts) for ts in labels],
+        **_chart_meta(plan, labels),
+    }
+
+
+def _rollup_activity_payload(plan):
+    """Activity chart from bucket stats: rates are the bucket means of the per-sample rates."""
+    activity = _chart_buckets(plan, "activity")
+    rate_lookup = {b[0]: b[4] / b[1] for b in _chart_buckets(plan, "activity_rate")}
+    sync_lookup = {b[0]: b[4] / b[1] for b in _chart_buckets(plan, "height_dx")}
+    labels = [b[0] for b in activity]
+    totals = [max(_finite(b[5], 0.0), 0.0) for b in activity]
+    activity_rate = [rate_lookup.get(ts, 0.0) for ts in labels]
+    sync_rate = [sync_lookup.get(ts, 0.0) for ts in labels]
+    return {
+        "labels": labels,
+        "activity_rate": activity_rate,
+        "sync_rate": sync_rate,
+        "rate": activity_rate,
+        "total": totals,
+        "height_dx": sync_rate,
+        **_chart_meta(plan, labels),
+    }
 
 
 def _average_height_rate(window_sec=300):
@@ -997,11 +2901,11 @@ def _average_height_rate(window_sec=300):
     window_ms = int(window_sec * 1000.0)
     cutoff_ms = int(time.time() * 1000) - window_ms
     with lock:
-        filtered = [item for item in height_series if item[0] >= cutoff_ms]
-    if len(filtered) < 2:
-        return None
-    start_ts, start_height = filtered[0]
-    end_ts, end_height = filtered[-1]
+        start = live_series.index_since(cutoff_ms)
+        if len(live_series) - start < 2:
+            return None
+        start_ts, start_height = live_series.at(start), live_series.at(start, "height")
+        end_ts, end_height = live_series.at(-1), live_series.at(-1, "height")
     dt = (end_ts - start_ts) / 1000.0
     if dt <= 0:
         return None
@@ -1017,18 +2921,13 @@ def _average_height_rate(window_sec=300):
 def _apply_window_points(points:int):
     """Adjust in-memory window length (number of points) for all series."""
     global WINDOW
-    global height_series, remote_height_series, peers_series, lat_series
-    global activity_labels, activity_mined, activity_processed, activity_sealed
     WINDOW = max(12, int(points))
+    rows = _history_rows(WINDOW) if WINDOW > len(live_series) else []
     with lock:
-        height_series = deque(list(height_series)[-WINDOW:], maxlen=WINDOW)
-        remote_height_series = deque(list(remote_height_series)[-WINDOW:], maxlen=WINDOW)
-        peers_series = deque(list(peers_series)[-WINDOW:], maxlen=WINDOW)
-        lat_series = deque(list(lat_series)[-WINDOW:], maxlen=WINDOW)
-        activity_labels = deque(list(activity_labels)[-WINDOW:], maxlen=WINDOW)
-        activity_mined = deque(list(activity_mined)[-WINDOW:], maxlen=WINDOW)
-        activity_processed = deque(list(activity_processed)[-WINDOW:], maxlen=WINDOW)
-        activity_sealed = deque(list(activity_sealed)[-WINDOW:], maxlen=WINDOW)
+        live_series.resize(WINDOW)
+        activity_series.resize(WINDOW)
+        if len(rows) > len(live_series):
+            _live_series_fill_locked(rows)
     try:
         _set_history_points(WINDOW)
     except Exception:
@@ -1045,9 +2944,7 @@ def index():
     return render_template("index.html", app_version=APP_VERSION)
 
 # ----- Status & charts -----
-@app.route("/api/status")
-def status():
-    ok, health_text, h, p, rpc_latency_ms, remote_h = sample_once()
+def _build_status_payload(ok, health_text, h, p, rpc_latency_ms, remote_h, seen_ms=None, probed=None):
     node_state = _current_node_state()
     local_height = int(h) if h is not None else 0
     remote_height_val = None
@@ -1057,13 +2954,13 @@ def status():
         except Exception:
             remote_height_val = None
     if remote_height_val is None:
-        remote_height = get_remote_height()
+        remote_height = _probed_value(probed, "remote", get_remote_height)
         if remote_height is not None:
             try:
                 remote_height_val = int(remote_height)
             except Exception:
                 remote_height_val = None
-    mining_state_sync = is_mining_state_sync_enabled()
+    mining_state_sync = _probed_value(probed, "mining_state_sync", is_mining_state_sync_enabled)
     avg_height_rate_5m = None
     try:
         avg_height_rate_5m = _average_height_rate(300)
@@ -1082,7 +2979,7 @@ def status():
         node_uptime_sec = 0
     if node_uptime_sec <= 0:
         try:
-            node_uptime_val = get_node_uptime_sec()
+            node_uptime_val = _probed_value(probed, "uptime", get_node_uptime_sec)
             if node_uptime_val is not None:
                 node_uptime_sec = int(max(_finite(node_uptime_val, 0.0), 0.0))
         except Exception:
@@ -1096,7 +2993,7 @@ def status():
         node_state_payload = dict(node_state)
     else:
         node_state_payload = node_state or {}
-    return jsonify({
+    return {
         "ok": ok,
         "status": "ok" if ok else "degraded",
         "health": "ok" if ok else "degraded",
@@ -1107,110 +3004,227 @@ def status():
         "mining_state_sync": mining_state_sync,
         "peers": int(p),
         "rpc_latency_ms": int(rpc_latency_ms),
-        "last_seen_ts": int(time.time()*1000),
+        "last_seen_ts": int(seen_ms) if seen_ms is not None else int(time.time()*1000),
         "freshness_ms": int((time.time()-APP_START)*1000),
         "window_points": int(WINDOW),
         "sample_sec": int(SAMPLE_SEC),
         "uptime_sec": node_uptime_sec,
         "node_state": node_state_payload,
         "eta_to_sync_sec": eta_to_sync_sec,
-    })
+    }
+
+
+def _apply_status_fallbacks(data, side):
+    """Fill height/peers/activity gaps from the already-loaded sidecar dict."""
+    for name in ("_apply_sidecar_fixes_to_status_dict", "_merge_activity"):
+        fixer = globals().get(name)
+        if callable(fixer):
+            try:
+                data = fixer(data, side)
+            except Exception:
+                pass
+    return data
+
+
+def _record_status_history(ts_ms, payload):
+    # History buffer used by /api/history warm-start; fed once per sample by the sampler.
+    extract = globals().get("_extract")
+    push = globals().get("_push")
+    if callable(extract) and callable(push):
+        try:
+            push(ts_ms, *extract(payload))
+        except Exception:
+            pass
+
+
+def _assemble_status(result, side, seen_ms=None, probed=None):
+    """Single-pass /api/status pipeline: build and apply sidecar fallbacks."""
+    ok, health_text, h, p, rpc_latency_ms, remote_h = result
+    ts_ms = int(seen_ms) if seen_ms is not None else int(time.time() * 1000)
+    payload = _apply_status_fallbacks(
+        _build_status_payload(ok, health_text, h, p, rpc_latency_ms, remote_h, seen_ms=ts_ms, probed=probed),
+        side or {},
+    )
+    if probed is not None:
+        payload["late_probes"] = list(probed.get("late") or [])
+    return payload
+
+
+def _sample_with_sidecar():
+    try:
+        side = _sidecar_json()
+    except NameError:
+        side = {}
+    return sample_once(side), side
+
+
+def _publish_status_snapshot(result, side=None, probed=None):
+    ok, health_text = result[0], result[1]
+    meta = globals().get("_last_sample_meta") or {}
+    ts_ms = int(meta.get("ts_ms") or int(time.time() * 1000))
+    payload = _assemble_status(result, side, seen_ms=ts_ms, probed=probed)
+    payload["snapshot_ts_ms"] = ts_ms
+    body = json.dumps(payload, separators=(",", ":"))
+    with _status_snapshot_cond:
+        prev = _status_snapshot.get("current")
+        generation = (prev["generation"] + 1) if prev else 1
+        # body always ends with "}" -> leave it open so the per-request age can be appended
+        _status_snapshot["current"] = {
+            "generation": generation,
+            "ts_ms": ts_ms,
+            "etag": f"{generation:x}-{ts_ms:x}",
+            "prefix": body[:-1].encode("utf-8") + b',"snapshot_age_ms":',
+            "ok": ok,
+            "health_text": health_text,
+            "payload": payload,
+        }
+        _status_snapshot_cond.notify_all()
+    return _status_snapshot["current"]
+
+
+def _wait_status_snapshot(min_generation=0, timeout=0.0):
+    deadline = time.time() + max(float(timeout), 0.0)
+    with _status_snapshot_cond:
+        while True:
+            snap = _status_snapshot.get("current")
+            if snap and snap["generation"] >= min_generation:
+                return snap
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return snap
+            _status_snapshot_cond.wait(remaining)
+
+
+def _request_fresh_snapshot(timeout=None):
+    current = _status_snapshot.get("current")
+    target = (current["generation"] + 1) if current else 1
+    _sampler_wake.set()
+    if timeout is None:
+        timeout = max(SAMPLE_SEC, 1) + REMOTE_RPC_TIMEOUT + 5.0
+    return _wait_status_snapshot(target, timeout)
+
+
+def _status_snapshot_response(snap):
+    now_ms = int(time.time() * 1000)
+    age_ms = max(now_ms - int(snap["ts_ms"]), 0)
+    tail = str(age_ms).encode("ascii") + b"}"
+    if request.if_none_match and request.if_none_match.contains_weak(snap["etag"]):
+        resp = Response(status=304)
+    elif COMPRESS and "gzip" in _accepted_encodings():
+        # deflated once per snapshot; only the age is appended per request
+        if "gzip_prefix" not in snap:
+            snap["gzip_prefix"] = _gzip_prefix(snap["prefix"])
+        resp = Response(_gzip_splice(snap["gzip_prefix"], tail), mimetype="application/json")
+        resp.headers["Content-Encoding"] = "gzip"
+        resp.vary.add("Accept-Encoding")
+    else:
+        resp = Response(snap["prefix"] + tail, mimetype="application/json")
+    resp.set_etag(snap["etag"], weak=True)
+    resp.headers["Cache-Control"] = "no-cache"
+    resp.headers["Age"] = str(age_ms // 1000)
+    resp.headers["X-Snapshot-Age-Ms"] = str(age_ms)
+    resp.headers["X-Snapshot-Generation"] = str(snap["generation"])
+    return resp
+
+
+@app.route("/api/status")
+def status():
+    if STATUS_SNAPSHOT:
+        snap = _wait_status_snapshot(1, STATUS_SNAPSHOT_WAIT_SEC)
+        if snap is not None:
+            return _status_snapshot_response(snap)
+    result, side = _sample_with_sidecar()
+    resp = jsonify(_assemble_status(result, side))
+    resp.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, max-age=0'
+    resp.headers['Pragma'] = 'no-cache'
+    resp.headers['Expires'] = '0'
+    return resp
 
 @app.route("/api/chart/height")
 def chart_height():
+    plan = _chart_plan()
+    if plan is not None:
+        return _chart_response(_rollup_height_payload(plan))
     with lock:
-        local_points = list(height_series)
-        remote_points = list(remote_height_series)
-    labels = [ts for ts, _ in local_points]
-    local = [val for _, val in local_points]
-    remote_lookup = {ts: val for ts, val in remote_points}
-    remote = [remote_lookup.get(ts) for ts in labels]
-    return jsonify({
+        start, meta = _ring_delta(live_series, *_delta_args())
+        labels = live_series.labels(start)
+        local = live_series.column("height", start)
+        remote = live_series.column("remote", start)
+    return _chart_response({
         "labels": labels,
         "local": local,
         "remote": remote,
         "len": len(labels),
+        **meta,
     })
 
 @app.route("/api/chart/peers")
 def chart_peers():
-    return jsonify(_series_to_payload(peers_series))
+    plan = _chart_plan()
+    if plan is not None:
+        return _chart_response(_rollup_series_payload(plan, "peers"))
+    return _chart_response(_series_to_payload(live_series, "peers"))
 
 @app.route("/api/chart/latency")
 def chart_latency():
-    return jsonify(_series_to_payload(lat_series))
+    plan = _chart_plan()
+    if plan is not None:
+        return _chart_response(_rollup_series_payload(plan, "latency"))
+    return _chart_response(_series_to_payload(live_series, "latency"))
+
+def _ring_activity_payload(ring, cursor=None, since_ms=None, epoch=None):
+    """Activity chart from a history ring; both rates are maintained on append."""
+    start, meta = _ring_delta(ring, cursor, since_ms, epoch)
+    labels = ring.labels(start)
+    activity_rate = ring.column("activity_rate", start)
+    sync_rate = ring.column("height_dx", start)
+    return {
+        "labels": labels,
+        "activity_rate": activity_rate,
+        "sync_rate": sync_rate,
+        "rate": activity_rate,
+        "total": ring.column("activity", start),
+        "height_dx": sync_rate,
+        "len": len(labels),
+        **meta,
+    }
 
-@app.route("/api/chart/activity")
-def chart_activity():
-    try:
-        hist_payload = _history_payload()
-    except Exception:
-        hist_payload = {}
-    labels = (hist_payload.get("activity") or {}).get("labels") or []
-    if labels:
-        totals_raw = (hist_payload.get("activity") or {}).get("series") or []
-        totals = [max(_finite(totals_raw[idx], 0.0), 0.0) if idx < len(totals_raw) else 0.0 for idx in range(len(labels))]
-        activity_rate = _rate_series_from(labels, totals)
-        sync_raw = (hist_payload.get("height_dx") or {}).get("series") or []
-        if sync_raw:
-            sync_rate = [max(_finite(sync_raw[idx], 0.0), 0.0) if idx < len(sync_raw) else 0.0 for idx in range(len(labels))]
-        else:
-            height_series = (hist_payload.get("height_local") or {}).get("series") or []
-            sync_rate = _rate_series_from(labels, height_series)
-        return jsonify({
-            "labels": labels,
-            "activity_rate": activity_rate,
-            "sync_rate": sync_rate,
-            "rate": activity_rate,
-            "total": totals,
-            "height_dx": sync_rate,
-            "len": len(labels)
-        })
+def _activity_payload_locked(cursor=None, since_ms=None, epoch=None):
+    """Activity chart from the first ring holding data; the caller holds ``lock`` and ``history_lock``."""
+    if len(_history_series):
+        return _ring_activity_payload(_history_series, cursor, since_ms, epoch)
     hist = globals().get("_hist")
     hist_lock = globals().get("_hist_lock")
     if hist and hist_lock:
         with hist_lock:
-            labels = [ts for ts,_ in hist.get("activity", [])]
-            total_series_raw = [v for _,v in hist.get("activity", [])]
-            height_dx_series = [v for _,v in hist.get("height_dx", [])]
-            height_local_series_raw = [v for _,v in hist.get("height_local", [])]
-        if labels:
-            totals = [max(_finite(total_series_raw[idx], 0.0), 0.0) if idx < len(total_series_raw) else 0.0 for idx in range(len(labels))]
-            activity_rate = _rate_series_from(labels, totals)
-            if height_dx_series:
-                sync_rate = [max(_finite(height_dx_series[idx], 0.0), 0.0) if idx < len(height_dx_series) else 0.0 for idx in range(len(labels))]
-            else:
-                sync_rate = _rate_series_from(labels, [height_local_series_raw[idx] if idx < len(height_local_series_raw) else 0.0 for idx in range(len(labels))])
-            return jsonify({
-                "labels": labels,
-                "activity_rate": activity_rate,
-                "sync_rate": sync_rate,
-                "rate": activity_rate,
-                "total": totals,
-                "height_dx": sync_rate,
-                "len": len(labels)
-            })
-    with lock:
-        labels = list(activity_labels)
-        totals = _activity_total_series_locked()
-        height_points = list(height_series)
-    activity_rate = _rate_series_from(labels, totals)
-    height_rate_map = {}
-    if height_points:
-        height_labels = [ts for ts,_ in height_points]
-        height_values = [val for _,val in height_points]
-        height_rates = _rate_series_from(height_labels, height_values)
-        height_rate_map = {height_labels[idx]: height_rates[idx] for idx in range(len(height_labels))}
-    sync_rate = [max(_finite(height_rate_map.get(ts, 0.0), 0.0), 0.0) for ts in labels]
-    return jsonify({
+            return _ring_activity_payload(hist, cursor, since_ms, epoch)
+    start, meta = _ring_delta(activity_series, cursor, since_ms, epoch)
+    labels = activity_series.labels(start)
+    totals = activity_series.column("total", start)
+    activity_rate = activity_series.column("rate", start)
+    live_start = live_series.index_since(labels[0]) if labels else len(live_series)
+    height_rate_map = dict(zip(live_series.labels(live_start), live_series.column("height_rate", live_start)))
+    sync_rate = [height_rate_map.get(ts, 0.0) for ts in labels]
+    return {
         "labels": labels,
         "activity_rate": activity_rate,
         "sync_rate": sync_rate,
         "rate": activity_rate,
         "total": totals,
         "height_dx": sync_rate,
-        "len": len(labels)
-    })
+        "len": len(labels),
+        **meta,
+    }
+
+@app.route("/api/chart/activity")
+def chart_activity():
+    plan = _chart_plan()
+    if plan is not None:
+        return _chart_response(_rollup_activity_payload(plan))
+    delta = _delta_args()
+    with lock, history_lock:
+        payload = _activity_payload_locked(*delta)
+    return _chart_response(payload)
 
 # Accept totals (inc or abs)
 @app.route("/api/chart/push", methods=["POST"])
@@ -1227,7 +3241,6 @@ def chart_push():
         mined_val = max(_finite(mined, 0.0), 0.0)
         processed_val = max(_finite(processed, 0.0), 0.0)
         sealed_val = max(_finite(sealed, 0.0), 0.0)
-        activity_labels.append(now_ms)
         if mode == "abs":
             totals["mined"] = mined_val
             totals["processed"] = processed_val
@@ -1236,39 +3249,71 @@ def chart_push():
             totals["mined"] = max(_finite(totals.get("mined", 0.0) + mined_val, 0.0), 0.0)
             totals["processed"] = max(_finite(totals.get("processed", 0.0) + processed_val, 0.0), 0.0)
             totals["sealed"] = max(_finite(totals.get("sealed", 0.0) + sealed_val, 0.0), 0.0)
-        activity_mined.append(float(totals["mined"]))
-        activity_processed.append(float(totals["processed"]))
-        activity_sealed.append(float(totals["sealed"]))
+        activity_series.append(now_ms, totals["mined"], totals["processed"], totals["sealed"],
+                               totals["mined"] + totals["processed"] + totals["sealed"])
         globals()["_ACTIVITY_TOTALS_LAST_TS"] = now_ms
     return jsonify({"ok": True})
 
 # ----- Controls -----
+def _docker_list_api(client):
+    items = []
+    for info in client.containers(all=True):
+        names = info.get("Names") or []
+        name = (names[0] if names else info.get("Id", "")[:12]).lstrip("/")
+        items.append({"name": name, "status": info.get("Status") or info.get("State") or ""})
+    return items
+
+
 def docker_list():
     if not (ENABLE_CONTROL and ALLOW_DOCKER):
         return []
-    try:
-        out = subprocess.check_output(
-            ["docker","ps","-a","--format","{{.Names}}|{{.Status}}"],
-            text=True, timeout=3
-        )
+    items = None
+    client = _docker_client()
+    if client is not None:
+        try:
+            if DOCKER_EVENTS:
+                watcher = _container_watcher(client)
+                if watcher.ready.wait(3.0):
+                    items = watcher.items()
+            if items is None:
+                items = _docker_list_api(client)
+        except Exception:
+            return []
+    else:
+        try:
+            out = subprocess.check_output(
+                ["docker","ps","-a","--format","{{.Names}}|{{.Status}}"],
+                text=True, timeout=3
+            )
+        except Exception:
+            return []
         items = []
         for line in out.strip().splitlines():
             name, status = (line.split("|",1)+[""])[:2]
-            entry = {"name": name, "status": status}
-            try:
-                entry["auto_restart"] = _get_auto_restart_status(name)
-            except Exception:
-                entry["auto_restart"] = {"installed": False, "enabled": False, "active": False, "interval": None, "interval_hours": None}
-            items.append(entry)
-        return items
-    except Exception:
-        return []
+            items.append({"name": name, "status": status})
+    for entry in items:
+        entry["auto_restart"] = _auto_restart_entry(entry["name"])
+    return items
 
 def docker_action(name, action):
     if not (ENABLE_CONTROL and ALLOW_DOCKER):
         return {"ok":False, "error":"docker control disabled"}
     if not name:
         return {"ok":False, "error":"missing container name"}
+    client = _docker_client()
+    if client is not None and action in ("start", "stop", "restart"):
+        try:
+            client.action(name, action, stop_timeout=10)
+        except DockerAPIError as e:
+            return {"ok":False, "error":str(e)}
+        except Exception as e:
+            return {"ok":False, "error":str(e)}
+        _DOCKER_INSPECT_CACHE.pop(name, None)
+        watcher = _CONTAINER_WATCHER.get("watcher")
+        if watcher is not None:
+            # don't wait for the event to land before the UI's follow-up refresh
+            watcher.refresh(name)
+        return {"ok":True, "output":name}
     cmd = None
     if action == "start":   cmd = ["docker","start",name]
     elif action == "stop":  cmd = ["docker","stop","-t","10",name]
@@ -1341,6 +3386,12 @@ def _ensure_backup_dir():
 def _is_container_running(name: str) -> bool:
     if not name or not ALLOW_DOCKER:
         return False
+    if _docker_client() is not None:
+        try:
+            data = _docker_inspect(name, max_age=0)
+            return bool((data.get("State") or {}).get("Running"))
+        except Exception:
+            return False
     try:
         out = subprocess.check_output(["docker", "inspect", "-f", "{{.State.Running}}", name], text=True, timeout=5)
         return out.strip().lower() == "true"
@@ -1377,153 +3428,899 @@ def _unique_temp_path(base: Path) -> Path:
     return candidate
 
 
-def _format_bytes(num: float) -> str:
-    try:
-        value = float(num)
-    except Exception:
-        value = 0.0
-    if not math.isfinite(value) or value <= 0:
-        return "0 B"
-    units = ["B", "KB", "MB", "GB", "TB", "PB"]
-    idx = 0
-    while value >= 1024 and idx < len(units) - 1:
-        value /= 1024.0
-        idx += 1
-    if idx == 0:
-        return f"{int(value)} {units[idx]}"
-    return f"{value:.1f} {units[idx]}"
+def _format_bytes(num: float) -> str:
+    try:
+        value = float(num)
+    except Exception:
+        value = 0.0
+    if not math.isfinite(value) or value <= 0:
+        return "0 B"
+    units = ["B", "KB", "MB", "GB", "TB", "PB"]
+    idx = 0
+    while value >= 1024 and idx < len(units) - 1:
+        value /= 1024.0
+        idx += 1
+    if idx == 0:
+        return f"{int(value)} {units[idx]}"
+    return f"{value:.1f} {units[idx]}"
+
+
+# name: (archive suffix or None for CHAIN_BACKUP_SUFFIX, default level, max level)
+_BACKUP_COMPRESSORS = {
+    "pigz": (None, 6, 9),
+    "zstd": (".tar.zst", 3, 19),
+    "gzip": (None, 6, 9),
+}
+BACKUP_PIPE_CHUNK = 1 << 20
+
+
+CHUNK_MANIFEST_SUFFIX = ".chunks.json"
+CHUNK_STORE_DIR = CHAIN_BACKUP_DIR / "chunks"
+
+
+def _backup_suffixes():
+    suffixes = [CHAIN_BACKUP_SUFFIX]
+    for suffix, _level, _max in _BACKUP_COMPRESSORS.values():
+        if suffix and suffix not in suffixes:
+            suffixes.append(suffix)
+    suffixes.append(CHUNK_MANIFEST_SUFFIX)
+    return suffixes
+
+
+def _backup_compressor():
+    """``(name, argv, suffix, threads)`` for the configured backup compressor."""
+    name = CHAIN_BACKUP_COMPRESSOR
+    if name == "auto":
+        name = next((cand for cand in ("pigz", "zstd") if shutil.which(cand)), "gzip")
+    if name not in _BACKUP_COMPRESSORS:
+        raise RuntimeError(f"Unsupported backup compressor: {name}")
+    if not shutil.which(name):
+        raise RuntimeError(f"Backup compressor not found: {name}")
+    suffix, level, max_level = _BACKUP_COMPRESSORS[name]
+    try:
+        level = int(CHAIN_BACKUP_LEVEL)
+    except ValueError:
+        pass
+    level = max(1, min(level, max_level))
+    threads = CHAIN_BACKUP_THREADS
+    if name == "zstd":
+        argv = ["zstd", f"-{level}", f"-T{threads}", "-q", "-c"]
+    elif name == "pigz":
+        argv = ["pigz", f"-{level}", "-p", str(threads), "-c"]
+    else:
+        argv = ["gzip", f"-{level}", "-c"]
+        threads = 1
+    return name, argv, suffix or CHAIN_BACKUP_SUFFIX, threads
+
+
+def _backup_decompressor(name: str):
+    """Command decompressing the archive ``name`` from stdin to stdout."""
+    if name.endswith(".zst"):
+        return ["zstd", "-dcq"]
+    if shutil.which("pigz"):
+        return ["pigz", "-dc", "-p", str(CHAIN_BACKUP_THREADS)]
+    return ["gzip", "-dc"]
+
+
+def _tree_size(root) -> int:
+    """Apparent size of the regular files below ``root``, for progress and ETA."""
+    total = 0
+    stack = [str(root)]
+    while stack:
+        _check_chain_job_cancelled()
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        total += entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    continue
+    return total
+
+
+def _parse_backup_timestamp(name: str):
+    if not name:
+        return None
+    prefix = f"{CHAIN_BACKUP_PREFIX}-"
+    suffix = next((cand for cand in _backup_suffixes() if cand and name.endswith(cand)), None)
+    if not name.startswith(prefix) or suffix is None:
+        return None
+    ts_part = name[len(prefix):-len(suffix)]
+    try:
+        return datetime.strptime(ts_part, "%Y%m%d-%H%M%S").replace(tzinfo=timezone.utc)
+    except Exception:
+        return None
+
+
+def _format_backup_progress_message(dest_name: str, size_bytes: int = 0, progress=None, label=None) -> str:
+    parts = [label or f"Creating {dest_name}"]
+    if progress:
+        total = progress.get("total") or 0
+        if total:
+            parts.append(f"{min(99, int(progress['bytes_in'] * 100 / total))}%")
+        parts.append(f"{progress['rate_mb_s']:.1f} MB/s")
+        if progress.get("eta_sec") is not None:
+            parts.append(f"ETA {int(progress['eta_sec']) // 60}:{int(progress['eta_sec']) % 60:02d}")
+    return " · ".join(parts)
+
+
+# ----- Backup catalog -----
+# Listing is served from an index persisted as <backup dir>/.catalog.json.
+# Adding, removing or renaming a backup changes the directory's mtime, so a
+# single stat of the directory tells whether the index still matches; only
+# then is the directory globbed again. Jobs record what a scan cannot
+# recover (source height, duration, checksum) when they complete.
+BACKUP_CATALOG_NAME = ".catalog.json"
+_backup_catalog = {"entries": None, "dir_mtime_ns": None}
+_backup_catalog_lock = threading.Lock()
+
+
+def _catalog_path() -> Path:
+    return CHAIN_BACKUP_DIR / BACKUP_CATALOG_NAME
+
+
+def _scan_backup(path: Path, stat, known=None):
+    """Catalog entry for one backup file, keeping recorded fields of an unchanged ``known`` entry."""
+    if known and known.get("mtime_ns") == stat.st_mtime_ns and known.get("file_size") == stat.st_size:
+        return known
+    item = {
+        "name": path.name,
+        "size": stat.st_size,
+        "file_size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "modified": datetime.fromtimestamp(stat.st_mtime, timezone.utc).isoformat(),
+        "kind": "archive",
+    }
+    if path.name.endswith(CHUNK_MANIFEST_SUFFIX):
+        summary = _chunk_manifest_summary(path, stat)
+        if summary is None:
+            return None
+        # physical: the manifest plus the chunks this snapshot added to the store
+        item.update(kind="chunks", logical=summary["logical"], size=stat.st_size + summary["stored"])
+    else:
+        sha256 = _read_backup_meta(path).get("tar_sha256")
+        if sha256:
+            item["sha256"] = sha256
+    item["physical"] = item["size"]
+    for key in ("height", "duration_sec", "sha256"):
+        if known and key in known and key not in item:
+            item[key] = known[key]
+    return item
+
+
+def _catalog_in_sync(catalog) -> bool:
+    try:
+        return catalog["entries"] is not None and os.stat(CHAIN_BACKUP_DIR).st_mtime_ns == catalog["dir_mtime_ns"]
+    except OSError:
+        return False
+
+
+def _save_backup_catalog(catalog, expected_mtime_ns):
+    """Persist the catalog.
+
+    Creating and renaming the temp file move the directory mtime. The recorded
+    mtime only follows them when the directory still had ``expected_mtime_ns``
+    (the mtime the entries were built against) just before the write; any other
+    change stays visible and the next listing rescans.
+    """
+    path = _catalog_path()
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        before_ns = os.stat(CHAIN_BACKUP_DIR).st_mtime_ns
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({"version": 1, "entries": list(catalog["entries"].values())}, fh, separators=(",", ":"))
+        os.replace(tmp, path)
+        if expected_mtime_ns is not None and before_ns == expected_mtime_ns:
+            catalog["dir_mtime_ns"] = os.stat(CHAIN_BACKUP_DIR).st_mtime_ns
+    except OSError:
+        app.logger.warning("Failed to write backup catalog", exc_info=True)
+
+
+def _reconcile_backup_catalog(catalog, dir_mtime_ns):
+    """Rebuild the entries from a glob; ``dir_mtime_ns`` was read before globbing."""
+    known = catalog["entries"]
+    if known is None:
+        try:
+            with open(_catalog_path(), "r", encoding="utf-8") as fh:
+                known = {item["name"]: item for item in json.load(fh).get("entries", ())}
+        except (OSError, ValueError, KeyError, TypeError):
+            known = {}
+    entries = {}
+    names = {path.name: path for suffix in _backup_suffixes()
+             for path in CHAIN_BACKUP_DIR.glob(f"{CHAIN_BACKUP_PREFIX}-*{suffix}")}
+    for name, path in names.items():
+        try:
+            item = _scan_backup(path, path.stat(), known.get(name))
+        except OSError:
+            continue
+        if item is not None:
+            entries[name] = item
+    catalog["entries"] = entries
+    catalog["dir_mtime_ns"] = dir_mtime_ns
+    _save_backup_catalog(catalog, dir_mtime_ns)
+
+
+def _backup_catalog_entries():
+    """Catalog entries by name, reconciled with the directory when its mtime moved."""
+    with _backup_catalog_lock:
+        catalog = _backup_catalog
+        try:
+            dir_mtime_ns = os.stat(CHAIN_BACKUP_DIR).st_mtime_ns
+        except FileNotFoundError:
+            _ensure_backup_dir()
+            dir_mtime_ns = os.stat(CHAIN_BACKUP_DIR).st_mtime_ns
+        if catalog["entries"] is None or catalog["dir_mtime_ns"] != dir_mtime_ns:
+            _reconcile_backup_catalog(catalog, dir_mtime_ns)
+        return catalog["entries"]
+
+
+def _catalog_record(name: str, **fields):
+    """Store job results for the backup ``name`` in the catalog."""
+    with _backup_catalog_lock:
+        catalog = _backup_catalog
+        path = CHAIN_BACKUP_DIR / name
+        try:
+            item = _scan_backup(path, path.stat(), (catalog["entries"] or {}).get(name))
+        except OSError:
+            return
+        if item is None:
+            return
+        item = dict(item, **{key: value for key, value in fields.items() if value is not None})
+        if catalog["entries"] is None:
+            catalog["entries"] = {}
+        catalog["entries"][name] = item
+        _save_backup_catalog(catalog, catalog["dir_mtime_ns"])
+
+
+def list_chain_backups():
+    try:
+        entries = _backup_catalog_entries()
+    except Exception:
+        app.logger.warning("Failed to read backup catalog", exc_info=True)
+        return []
+    backups = sorted(entries.values(), key=lambda item: item.get("mtime_ns", 0), reverse=True)
+    return [{key: value for key, value in item.items() if key not in ("mtime_ns", "file_size")} for item in backups]
+
+
+def _prune_chain_backups():
+    if CHAIN_BACKUP_MAX <= 0:
+        return
+    backups = list_chain_backups()
+    pruned_chunks = False
+    for item in backups[CHAIN_BACKUP_MAX:]:
+        if not item or not item.get("name"):
+            continue
+        try:
+            _unlink_backup(CHAIN_BACKUP_DIR / item["name"])
+            pruned_chunks = pruned_chunks or item.get("kind") == "chunks"
+        except Exception:
+            app.logger.warning("Failed to prune backup %s", item["name"], exc_info=True)
+    if pruned_chunks:
+        _gc_chunk_store()
+
+
+def _backup_pump(src, dst, counter, digest=None):
+    buf = bytearray(BACKUP_PIPE_CHUNK)
+    view = memoryview(buf)
+    try:
+        while True:
+            n = src.readinto(buf)
+            if not n:
+                break
+            dst.write(view[:n])
+            counter[0] += n
+            if digest is not None:
+                digest.update(view[:n])
+    except (OSError, ValueError):
+        pass
+    finally:
+        try:
+            dst.close()
+        except OSError:
+            pass
+
+
+def _backup_progress(dest_name, started, bytes_in, bytes_out, total):
+    rate = bytes_in / max(time.monotonic() - started, 1e-3)
+    progress = {
+        "path": dest_name,
+        "size": bytes_out,
+        "bytes_in": bytes_in,
+        "bytes_out": bytes_out,
+        "total": total,
+        "rate_mb_s": round(rate / (1024 * 1024), 1),
+        "eta_sec": int(max(total - bytes_in, 0) / rate) if total and rate > 0 else None,
+    }
+    return progress
+
+
+def _wait_pipeline(procs, pump, tick, label):
+    """Wait for the ``pump`` thread, calling ``tick()`` about once a second.
+
+    A cancel request terminates ``procs`` and raises ChainJobCancelled.
+    """
+    while pump.is_alive():
+        if _chain_job_cancel_event.is_set():
+            for proc in procs:
+                proc.terminate()
+            for proc in procs:
+                try:
+                    proc.wait(timeout=3)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+            raise ChainJobCancelled(f"Chain {label} cancelled")
+        pump.join(timeout=1)
+        tick()
+
+
+def _backup_meta_path(path: Path) -> Path:
+    """Sidecar file holding the SHA-256 of an archive's tar stream."""
+    return path.with_name(path.name + ".meta.json")
+
+
+def _read_backup_meta(path: Path):
+    try:
+        with open(_backup_meta_path(path), "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def _unlink_backup(path: Path):
+    with _backup_catalog_lock:
+        catalog = _backup_catalog
+        in_sync = _catalog_in_sync(catalog)
+        path.unlink(missing_ok=True)
+        _backup_meta_path(path).unlink(missing_ok=True)
+        # our own unlinks moved the mtime; only they are accounted for
+        expected = os.stat(CHAIN_BACKUP_DIR).st_mtime_ns if in_sync else None
+        if catalog["entries"] is not None and catalog["entries"].pop(path.name, None) is not None:
+            _save_backup_catalog(catalog, expected)
+        elif expected is not None:
+            catalog["dir_mtime_ns"] = expected
+
+
+def _stream_backup(dest_path, dest_name, total, compressor, source=CHAIN_DATA_DIR):
+    """Stream ``tar`` of ``source`` through the multi-threaded compressor into ``dest_path``.
+
+    Bytes in are counted on the pipe between the two processes, bytes out on
+    the destination file; both are reported through _chain_job_progress.
+    """
+    import tempfile
+    _name, argv, _suffix, _threads = compressor
+    counter = [0]
+    started = time.monotonic()
+    with open(dest_path, "wb") as out, tempfile.TemporaryFile() as tar_err, tempfile.TemporaryFile() as comp_err:
+        tar = subprocess.Popen(
+            ["tar", "-cf", "-", "-C", str(source.parent), source.name],
+            stdout=subprocess.PIPE,
+            stderr=tar_err,
+        )
+        comp = subprocess.Popen(argv, stdin=subprocess.PIPE, stdout=out, stderr=comp_err)
+        _chain_job_set_process(tar)
+        digest = hashlib.sha256()
+        pump = threading.Thread(target=_backup_pump, args=(tar.stdout, comp.stdin, counter, digest),
+                                name="chain-backup-pump", daemon=True)
+        pump.start()
+
+        def tick():
+            progress = _backup_progress(dest_name, started, counter[0], os.fstat(out.fileno()).st_size, total)
+            _chain_job_progress(_format_backup_progress_message(dest_name, progress["size"], progress), progress)
+
+        try:
+            _wait_pipeline((tar, comp), pump, tick, "backup")
+            tar.stdout.close()
+            tar_rc = tar.wait()
+            comp_rc = comp.wait()
+        finally:
+            _chain_job_clear_process()
+        if tar_rc != 0 or comp_rc != 0:
+            err = tar_err if tar_rc != 0 else comp_err
+            err.seek(0)
+            text = err.read().decode("utf-8", "replace").strip()
+            raise RuntimeError(text or f"Backup command failed ({argv[0]})")
+    meta = {"tar_sha256": digest.hexdigest(), "tar_bytes": counter[0], "compressor": argv[0]}
+    meta_path = _backup_meta_path(dest_path)
+    tmp = meta_path.with_name(meta_path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(meta, fh)
+    os.replace(tmp, meta_path)
+    progress = _backup_progress(dest_name, started, counter[0], dest_path.stat().st_size, total)
+    progress["elapsed_sec"] = round(time.monotonic() - started, 1)
+    progress["sha256"] = meta["tar_sha256"]
+    progress.pop("eta_sec")
+    return progress
+
+
+# ----- Chunk store backups -----
+# Snapshots are manifests listing every directory, symlink and file of the
+# data directory; file contents are fixed-size chunks stored once under
+# chunks/<aa>/<sha256> (zlib), so a snapshot only writes chunks that changed.
+# Files whose inode, size and mtime match the previous snapshot are not read.
+_CHUNK_SUMMARIES = {}
+
+
+def _chunk_path(digest: str) -> Path:
+    return CHUNK_STORE_DIR / digest[:2] / digest
+
+
+def _chunk_level() -> int:
+    try:
+        return max(1, min(int(CHAIN_BACKUP_LEVEL), 9))
+    except ValueError:
+        return 1
+
+
+def _store_chunk(data, level):
+    """Store one chunk; returns ``(digest, bytes written)`` (0 when already present)."""
+    digest = hashlib.sha256(data).hexdigest()
+    path = _chunk_path(digest)
+    if path.exists():
+        return digest, 0
+    packed = zlib.compress(data, level)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{digest}.{threading.get_ident()}.tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(packed)
+    os.replace(tmp, path)
+    return digest, len(packed)
+
+
+def _load_chunk(digest: str) -> bytes:
+    with open(_chunk_path(digest), "rb") as fh:
+        data = zlib.decompress(fh.read())
+    if hashlib.sha256(data).hexdigest() != digest:
+        raise RuntimeError(f"Chunk {digest[:12]} is corrupt")
+    return data
+
+
+def _read_chunk_manifest(path):
+    with open(path, "r", encoding="utf-8") as fh:
+        return json.load(fh)
 
 
-def _parse_backup_timestamp(name: str):
-    if not name:
-        return None
-    prefix = f"{CHAIN_BACKUP_PREFIX}-"
-    suffix = CHAIN_BACKUP_SUFFIX
-    if not name.startswith(prefix) or not name.endswith(suffix):
-        return None
-    ts_part = name[len(prefix):-len(suffix)] if suffix else name[len(prefix):]
+def _chunk_manifest_summary(path, stat=None):
+    """``{"logical", "stored"}`` of a snapshot manifest, cached per mtime."""
     try:
-        return datetime.strptime(ts_part, "%Y%m%d-%H%M%S").replace(tzinfo=timezone.utc)
-    except Exception:
+        stat = stat or path.stat()
+        cached = _CHUNK_SUMMARIES.get(path.name)
+        if cached and cached[0] == stat.st_mtime_ns:
+            return cached[1]
+        manifest = _read_chunk_manifest(path)
+        summary = {"logical": int(manifest.get("logical") or 0), "stored": int(manifest.get("stored") or 0)}
+    except (OSError, ValueError):
         return None
+    _CHUNK_SUMMARIES[path.name] = (stat.st_mtime_ns, summary)
+    return summary
 
 
-def _format_backup_progress_message(dest_name: str, size_bytes: int = 0) -> str:
-    ts = _parse_backup_timestamp(dest_name)
-    return f"Creating {dest_name}"
-
-
-def list_chain_backups():
+def _chunk_manifests():
+    """Snapshot manifests, newest first, from one directory scan."""
+    found = []
     try:
-        _ensure_backup_dir()
-    except Exception:
+        it = os.scandir(CHAIN_BACKUP_DIR)
+    except FileNotFoundError:
         return []
-    pattern = f"{CHAIN_BACKUP_PREFIX}-*{CHAIN_BACKUP_SUFFIX}"
-    backups = []
-    try:
-        candidates = sorted(CHAIN_BACKUP_DIR.glob(pattern), key=lambda p: p.stat().st_mtime, reverse=True)
-    except Exception:
-        candidates = []
-    for path in candidates:
+    with it:
+        for entry in it:
+            name = entry.name
+            if not (name.startswith(f"{CHAIN_BACKUP_PREFIX}-") and name.endswith(CHUNK_MANIFEST_SUFFIX)):
+                continue
+            try:
+                found.append((entry.stat().st_mtime_ns, name))
+            except OSError:
+                continue
+    found.sort(reverse=True)
+    return [CHAIN_BACKUP_DIR / name for _mtime, name in found]
+
+
+def _previous_chunk_files():
+    """File entries of the newest readable snapshot, keyed by relative path."""
+    for path in _chunk_manifests():
         try:
-            stat = path.stat()
-        except OSError:
+            manifest = _read_chunk_manifest(path)
+        except (OSError, ValueError):
             continue
-        backups.append({
-            "name": path.name,
-            "size": stat.st_size,
-            "modified": datetime.fromtimestamp(stat.st_mtime, timezone.utc).isoformat(),
-        })
-    return backups
+        if manifest.get("chunk_size") != CHAIN_BACKUP_CHUNK_MB << 20:
+            return {}
+        return {entry["path"]: entry for entry in manifest.get("entries", ()) if entry.get("type") == "file"}
+    return {}
 
 
-def _prune_chain_backups():
-    if CHAIN_BACKUP_MAX <= 0:
-        return
-    backups = list_chain_backups()
-    for item in backups[CHAIN_BACKUP_MAX:]:
-        if not item or not item.get("name"):
+def _walk_tree(root):
+    """``(relative path, DirEntry)`` below ``root``, directories before their contents."""
+    stack = [""]
+    while stack:
+        _check_chain_job_cancelled()
+        rel_dir = stack.pop()
+        try:
+            with os.scandir(os.path.join(root, rel_dir) if rel_dir else root) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
             continue
+        for entry in entries:
+            rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            yield rel, entry
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(rel)
+
+
+def _chunk_backup(dest_path, dest_name, total, source=CHAIN_DATA_DIR):
+    """Write an incremental snapshot of ``source``; returns the progress details."""
+    chunk_size = CHAIN_BACKUP_CHUNK_MB << 20
+    level = _chunk_level()
+    previous = _previous_chunk_files()
+    started = time.monotonic()
+    bytes_in = [0]
+    stored = [0]
+    reused = 0
+    entries = [{"path": "", "type": "dir", "mode": source.stat().st_mode & 0o7777}]
+    # a staged copy gets fresh inodes on every run, so only size and mtime can match
+    same = ("size", "mtime_ns") if source != CHAIN_DATA_DIR else ("size", "mtime_ns", "ino")
+    pending = deque()
+    next_report = [time.monotonic() + 1]
+
+    def settle(limit):
+        while len(pending) > limit:
+            chunks, future = pending.popleft()
+            digest, written = future.result()
+            chunks.append(digest)
+            stored[0] += written
+        if time.monotonic() >= next_report[0]:
+            next_report[0] = time.monotonic() + 1
+            progress = _backup_progress(dest_name, started, bytes_in[0], stored[0], total)
+            _chain_job_progress(_format_backup_progress_message(dest_name, stored[0], progress), progress)
+
+    with ThreadPoolExecutor(max_workers=CHAIN_BACKUP_THREADS, thread_name_prefix="chain-chunk") as pool:
+        for rel, entry in _walk_tree(str(source)):
+            st = entry.stat(follow_symlinks=False)
+            if entry.is_symlink():
+                entries.append({"path": rel, "type": "symlink", "target": os.readlink(entry.path)})
+            elif entry.is_dir(follow_symlinks=False):
+                entries.append({"path": rel, "type": "dir", "mode": st.st_mode & 0o7777})
+            elif entry.is_file(follow_symlinks=False):
+                item = {"path": rel, "type": "file", "mode": st.st_mode & 0o7777, "size": st.st_size,
+                        "mtime_ns": st.st_mtime_ns, "ino": st.st_ino}
+                prev = previous.get(rel)
+                if prev and all(prev.get(key) == item[key] for key in same):
+                    item["chunks"] = prev["chunks"]
+                    bytes_in[0] += st.st_size
+                    reused += st.st_size
+                else:
+                    item["chunks"] = []
+                    with open(entry.path, "rb") as fh:
+                        while True:
+                            data = fh.read(chunk_size)
+                            if not data:
+                                break
+                            bytes_in[0] += len(data)
+                            pending.append((item["chunks"], pool.submit(_store_chunk, data, level)))
+                            settle(CHAIN_BACKUP_THREADS * 2)
+                            _check_chain_job_cancelled()
+                entries.append(item)
+            settle(CHAIN_BACKUP_THREADS * 2)
+        settle(0)
+    manifest = {
+        "version": 1,
+        "created": datetime.utcnow().replace(tzinfo=timezone.utc).isoformat(),
+        "root": CHAIN_DATA_DIR.name,
+        "chunk_size": chunk_size,
+        "logical": bytes_in[0],
+        "stored": stored[0],
+        "reused": reused,
+        "entries": entries,
+    }
+    tmp = dest_path.with_name(dest_path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, separators=(",", ":"))
+    os.replace(tmp, dest_path)
+    progress = _backup_progress(dest_name, started, bytes_in[0], stored[0], total)
+    progress.pop("eta_sec")
+    progress.update(elapsed_sec=round(time.monotonic() - started, 1), logical=bytes_in[0], reused=reused)
+    return progress
+
+
+def _safe_join(root: Path, rel: str) -> Path:
+    target = (root / rel) if rel else root
+    if rel and (os.path.isabs(rel) or ".." in Path(rel).parts):
+        raise RuntimeError(f"Unsafe path in snapshot: {rel}")
+    return target
+
+
+def _ordered_map(pool, fn, items, window):
+    """``pool.map`` keeping at most ``window`` results in flight, in order."""
+    pending = deque()
+    for item in items:
+        pending.append(pool.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _restore_chunk_snapshot(manifest_path, parent: Path):
+    """Rebuild the data directory of a snapshot under ``parent``; returns the progress details.
+
+    Chunks are read, decompressed and hash-checked on a thread pool ahead of
+    the writer, so a corrupt or missing chunk fails the restore.
+    """
+    manifest = _read_chunk_manifest(manifest_path)
+    root = parent / manifest["root"]
+    total = int(manifest.get("logical") or 0)
+    name = manifest_path.name
+    written = 0
+    started = time.monotonic()
+    next_report = started + 1
+    dirs = []
+    files = [entry for entry in manifest["entries"] if entry.get("type") == "file"]
+    with ThreadPoolExecutor(max_workers=CHAIN_BACKUP_THREADS, thread_name_prefix="chain-restore") as pool:
+        chunks = _ordered_map(pool, _load_chunk, (digest for entry in files for digest in entry["chunks"]),
+                              CHAIN_BACKUP_THREADS * 2)
+        for entry in manifest["entries"]:
+            _check_chain_job_cancelled()
+            target = _safe_join(root, entry["path"])
+            kind = entry.get("type")
+            if kind == "dir":
+                target.mkdir(parents=True, exist_ok=True)
+                dirs.append((target, entry["mode"]))
+            elif kind == "symlink":
+                os.symlink(entry["target"], target)
+            elif kind == "file":
+                with open(target, "wb") as fh:
+                    for _digest in entry["chunks"]:
+                        data = next(chunks)
+                        fh.write(data)
+                        written += len(data)
+                        if time.monotonic() >= next_report:
+                            next_report = time.monotonic() + 1
+                            _chain_job_progress(f"Restoring {name}", _backup_progress(name, started, written, written, total))
+                            _check_chain_job_cancelled()
+                os.chmod(target, entry["mode"])
+                os.utime(target, ns=(entry["mtime_ns"], entry["mtime_ns"]))
+    for target, mode in reversed(dirs):
+        os.chmod(target, mode)
+    progress = _backup_progress(name, started, written, written, total)
+    progress.pop("eta_sec")
+    progress.update(elapsed_sec=round(time.monotonic() - started, 1), verified=True)
+    return progress
+
+
+def _gc_chunk_store():
+    """Remove chunks no remaining snapshot references; returns the bytes freed."""
+    live = set()
+    for path in _chunk_manifests():
         try:
-            (CHAIN_BACKUP_DIR / item["name"]).unlink(missing_ok=True)
-        except Exception:
-            app.logger.warning("Failed to prune backup %s", item["name"], exc_info=True)
+            manifest = _read_chunk_manifest(path)
+        except (OSError, ValueError):
+            # an unreadable manifest may still reference anything
+            app.logger.warning("Skipping chunk store cleanup: unreadable %s", path.name)
+            return 0
+        for entry in manifest.get("entries", ()):
+            live.update(entry.get("chunks", ()))
+    freed = 0
+    for bucket in (CHUNK_STORE_DIR.iterdir() if CHUNK_STORE_DIR.exists() else ()):
+        for chunk in bucket.iterdir():
+            if chunk.name in live:
+                continue
+            try:
+                freed += chunk.stat().st_size
+                chunk.unlink()
+            except OSError:
+                continue
+    return freed
+
+
+# ----- Hot backups -----
+# Phase one copies the data directory into a staging tree while the node runs
+# (reflinked where the filesystem supports it), phase two stops the node and
+# copies only the files whose size or mtime moved since, and the archive or
+# snapshot is then built from the frozen staging tree after the node restarted.
+_FICLONE = 0x40049409
+HOT_SETTLE_NS = 2_000_000_000
+
+
+def _hot_staging_dir() -> Path:
+    return CHAIN_BACKUP_DIR / ".hot-staging" / CHAIN_DATA_DIR.name
+
+
+def _remove_path(path: Path):
+    try:
+        if path.is_dir() and not path.is_symlink():
+            shutil.rmtree(path)
+        else:
+            path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _copy_file(src: str, dst: Path):
+    """Copy one file, as a reflink when the filesystem allows it."""
+    import fcntl
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        try:
+            fcntl.ioctl(fout.fileno(), _FICLONE, fin.fileno())
+            return
+        except OSError:
+            pass
+    shutil.copyfile(src, dst)
+
+
+def _sync_tree(src: Path, dst: Path, live: bool, tick=None):
+    """Make ``dst`` match ``src``, copying only files whose size or mtime differ.
+
+    With ``live`` the source is still being written: copies keep the mtime
+    seen before copying (or none at all for files touched in the last few
+    seconds), so anything that changed meanwhile differs in the next pass.
+    ``tick(scanned bytes, copied bytes)`` is called after every regular file.
+    Returns ``(total bytes, copied bytes)``.
+    """
+    total = copied = 0
+    seen = set()
+    dst.mkdir(parents=True, exist_ok=True)
+    for rel, entry in _walk_tree(str(src)):
+        seen.add(rel)
+        target = dst / rel
+        try:
+            st = entry.stat(follow_symlinks=False)
+            if entry.is_symlink():
+                link = os.readlink(entry.path)
+                if not target.is_symlink() or os.readlink(target) != link:
+                    _remove_path(target)
+                    os.symlink(link, target)
+            elif entry.is_dir(follow_symlinks=False):
+                if target.is_symlink() or (target.exists() and not target.is_dir()):
+                    _remove_path(target)
+                target.mkdir(exist_ok=True)
+                os.chmod(target, st.st_mode & 0o7777)
+            elif entry.is_file(follow_symlinks=False):
+                total += st.st_size
+                try:
+                    tst = os.lstat(target)
+                except FileNotFoundError:
+                    tst = None
+                if tst is not None and tst.st_size == st.st_size and tst.st_mtime_ns == st.st_mtime_ns:
+                    if tick is not None:
+                        tick(total, copied)
+                    continue
+                if tst is not None:
+                    _remove_path(target)
+                _copy_file(entry.path, target)
+                os.chmod(target, st.st_mode & 0o7777)
+                mtime = st.st_mtime_ns
+                if live and time.time_ns() - mtime < HOT_SETTLE_NS:
+                    mtime = 0
+                os.utime(target, ns=(st.st_atime_ns, mtime))
+                copied += st.st_size
+                if tick is not None:
+                    tick(total, copied)
+        except FileNotFoundError:
+            # removed by the running node; the next pass drops it
+            seen.discard(rel)
+    stale = [rel for rel, _entry in _walk_tree(str(dst)) if rel not in seen]
+    for rel in stale:
+        _remove_path(dst / rel)
+    return total, copied
+
+
+def _hot_stage_progress(label: str, phase: str, total: int):
+    """``_sync_tree`` tick reporting scanned/copied bytes about once a second."""
+    started = time.monotonic()
+    next_report = [started]
+
+    def tick(scanned, copied):
+        now = time.monotonic()
+        if now < next_report[0]:
+            return
+        next_report[0] = now + 1
+        progress = _backup_progress(None, started, scanned, copied, max(total, scanned))
+        # the archive name only exists once staging is done
+        del progress["path"]
+        progress["phase"] = phase
+        _chain_job_progress(_format_backup_progress_message("", copied, progress, label), progress)
+
+    return tick
+
+
+def _hot_stage(container_name: str, details: dict):
+    """Run both copy phases; returns ``(staging dir, total bytes)`` with the node running again."""
+    staging = _hot_staging_dir()
+    phases = details.setdefault("phases", {})
+    _chain_job_progress("Measuring chain data…", details)
+    estimate = _tree_size(CHAIN_DATA_DIR)
+    started = time.monotonic()
+    details["phase"] = "copying, node running"
+    _chain_job_progress("Copying chain data (node running)…", details)
+    total, copied = _sync_tree(CHAIN_DATA_DIR, staging, live=True,
+                               tick=_hot_stage_progress("Copying chain data (node running)…", details["phase"],
+                                                        estimate))
+    phases["copy_sec"] = round(time.monotonic() - started, 1)
+    details["copied_live"] = copied
+    _check_chain_job_cancelled()
+    started = time.monotonic()
+    was_running = _stop_container_for_job(container_name)
+    details["phase"] = "syncing changes, node stopped"
+    _chain_job_progress("Syncing changed files (node stopped)…", details)
+    try:
+        total, copied = _sync_tree(CHAIN_DATA_DIR, staging, live=False,
+                                   tick=_hot_stage_progress("Syncing changed files (node stopped)…",
+                                                            details["phase"], total))
+    finally:
+        if was_running:
+            _start_container_for_job(container_name)
+    phases["stopped_sec"] = round(time.monotonic() - started, 2)
+    details["phase"] = "archiving, node running"
+    details.update(copied_stopped=copied, downtime_sec=phases["stopped_sec"] if was_running else 0)
+    return staging, total
 
 
 def _chain_backup_task(container_name: str):
     was_running = False
     dest_path = None
+    staging = None
     details = {"container": container_name}
     status = "error"
     message = ''
+    job_started = time.monotonic()
+    snap = _status_snapshot.get("current") or {}
+    height = (snap.get("payload") or {}).get("height") or _height_from_file() or None
     try:
         _check_chain_job_cancelled()
         _ensure_backup_dir()
         if not CHAIN_DATA_DIR.exists():
             raise RuntimeError(f"Chain data directory not found: {CHAIN_DATA_DIR}")
+        chunked = CHAIN_BACKUP_MODE == "chunks"
+        compressor = ("chunks", None, CHUNK_MANIFEST_SUFFIX, CHAIN_BACKUP_THREADS) if chunked else _backup_compressor()
+        details.update({"compressor": compressor[0], "threads": compressor[3]})
+        source = CHAIN_DATA_DIR
+        if CHAIN_BACKUP_HOT:
+            staging = _hot_staging_dir()
+            source, total = _hot_stage(container_name, details)
+        else:
+            _chain_job_progress("Measuring chain data…", details)
+            # sized while the node still runs: only the stream itself needs it stopped
+            total = _tree_size(CHAIN_DATA_DIR)
+            _check_chain_job_cancelled()
+            was_running = _stop_container_for_job(container_name)
+        details["total"] = total
         _check_chain_job_cancelled()
-        was_running = _stop_container_for_job(container_name)
-        _check_chain_job_cancelled()
+        started = time.monotonic()
         timestamp = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
-        dest_name = f"{CHAIN_BACKUP_PREFIX}-{timestamp}{CHAIN_BACKUP_SUFFIX}"
+        dest_name = f"{CHAIN_BACKUP_PREFIX}-{timestamp}{compressor[2]}"
         dest_path = CHAIN_BACKUP_DIR / dest_name
         _chain_job_progress(_format_backup_progress_message(dest_name, 0), {"path": dest_name})
-        parent = CHAIN_DATA_DIR.parent
-        arcname = CHAIN_DATA_DIR.name
-        proc = subprocess.Popen(
-            ["tar", "-czf", str(dest_path), "-C", str(parent), arcname],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
-        _chain_job_set_process(proc)
-        stdout = ''
-        stderr = ''
-        try:
-            while True:
-                if _chain_job_cancel_event.is_set():
-                    proc.terminate()
-                    try:
-                        proc.wait(timeout=3)
-                    except subprocess.TimeoutExpired:
-                        proc.kill()
-                    raise ChainJobCancelled("Chain backup cancelled")
-                try:
-                    out, err = proc.communicate(timeout=1)
-                    stdout = out or ''
-                    stderr = err or ''
-                    break
-                except subprocess.TimeoutExpired:
-                    try:
-                        size_bytes = dest_path.stat().st_size if dest_path and dest_path.exists() else 0
-                    except Exception:
-                        size_bytes = 0
-                    progress_details = {"path": dest_name}
-                    if size_bytes:
-                        progress_details["size"] = size_bytes
-                    _chain_job_progress(_format_backup_progress_message(dest_name, size_bytes), progress_details)
-                    continue
-        finally:
-            _chain_job_clear_process()
-        if proc.returncode != 0:
-            raise RuntimeError(stderr.strip() or stdout.strip() or "Backup command failed")
+        if chunked:
+            details.update(_chunk_backup(dest_path, dest_name, total, source))
+        else:
+            details.update(_stream_backup(dest_path, dest_name, total, compressor, source))
+        details.setdefault("phases", {})["archive_sec"] = round(time.monotonic() - started, 1)
+        if not CHAIN_BACKUP_HOT:
+            details["downtime_sec"] = details["phases"]["archive_sec"] if was_running else 0
         _check_chain_job_cancelled()
         size = dest_path.stat().st_size
         details.update({"path": dest_name, "size": size})
         status = "success"
         message = f"Backup created: {dest_name}"
+        details["height"] = height
+        _catalog_record(dest_name, height=height, duration_sec=round(time.monotonic() - job_started, 1),
+                        sha256=details.get("sha256"))
     except ChainJobCancelled as exc:
         message = str(exc) or "Chain backup cancelled"
         status = "cancelled"
-        if dest_path and dest_path.exists():
-            dest_path.unlink(missing_ok=True)
+        if dest_path:
+            _unlink_backup(dest_path)
         if dest_path:
             details.setdefault("path", dest_path.name)
         details["cancelled"] = True
     except Exception as exc:
         message = str(exc)
-        if dest_path and dest_path.exists():
-            dest_path.unlink(missing_ok=True)
+        if dest_path:
+            _unlink_backup(dest_path)
         if dest_path:
             details.setdefault("path", dest_path.name)
     finally:
@@ -1536,14 +4333,91 @@ def _chain_backup_task(container_name: str):
         if restart_error:
             message = f"{message} (failed to restart container: {restart_error})"
             status = "error"
-        _chain_job_finish(status, message, details=details)
+        if staging is not None:
+            shutil.rmtree(staging.parent, ignore_errors=True)
+        # still inside the job, so no new snapshot can add chunks while these run
         if status == "success":
             _prune_chain_backups()
+        elif CHAIN_BACKUP_MODE == "chunks":
+            _gc_chunk_store()
+        _chain_job_finish(status, message, details=details)
+
+
+def _extract_archive(backup_path: Path, parent: Path):
+    """Decompress and untar ``backup_path`` under ``parent``; returns the progress details.
+
+    The decompressor reads the archive through a descriptor shared with this
+    process, so its file offset is the compressed progress. The tar stream
+    is hashed on the way into ``tar`` and checked against the SHA-256
+    recorded next to the archive when it was written.
+    """
+    import tempfile
+    name = backup_path.name
+    meta = _read_backup_meta(backup_path)
+    argv = _backup_decompressor(name)
+    total = backup_path.stat().st_size
+    counter = [0]
+    digest = hashlib.sha256()
+    started = time.monotonic()
+    with open(backup_path, "rb") as src, tempfile.TemporaryFile() as dec_err, tempfile.TemporaryFile() as tar_err:
+        dec = subprocess.Popen(argv, stdin=src, stdout=subprocess.PIPE, stderr=dec_err)
+        tar = subprocess.Popen(["tar", "-xf", "-", "-C", str(parent)], stdin=subprocess.PIPE, stderr=tar_err)
+        _chain_job_set_process(dec)
+        pump = threading.Thread(target=_backup_pump, args=(dec.stdout, tar.stdin, counter, digest),
+                                name="chain-restore-pump", daemon=True)
+        pump.start()
+
+        def tick():
+            read = os.lseek(src.fileno(), 0, os.SEEK_CUR)
+            _chain_job_progress(f"Restoring {name}", _backup_progress(name, started, read, counter[0], total))
+
+        try:
+            _wait_pipeline((dec, tar), pump, tick, "restore")
+            dec.stdout.close()
+            dec_rc = dec.wait()
+            tar_rc = tar.wait()
+        finally:
+            _chain_job_clear_process()
+        if dec_rc != 0 or tar_rc != 0:
+            err = dec_err if dec_rc != 0 else tar_err
+            err.seek(0)
+            text = err.read().decode("utf-8", "replace").strip()
+            raise RuntimeError(text or f"Restore command failed ({argv[0] if dec_rc else 'tar'})")
+    expected = meta.get("tar_sha256")
+    if expected and (expected != digest.hexdigest() or meta.get("tar_bytes") != counter[0]):
+        raise RuntimeError(f"Checksum mismatch restoring {name}")
+    progress = _backup_progress(name, started, total, counter[0], total)
+    progress.pop("eta_sec")
+    progress.update(elapsed_sec=round(time.monotonic() - started, 1), verified=bool(expected))
+    return progress
+
+
+def _remove_tree_async(path: Path):
+    """Delete ``path`` in the background at idle IO and lowest CPU priority."""
+    argv = ["rm", "-rf", "--", str(path)]
+    if shutil.which("nice"):
+        argv = ["nice", "-n", "19"] + argv
+    if shutil.which("ionice"):
+        argv = ["ionice", "-c", "3"] + argv
+    try:
+        proc = subprocess.Popen(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except OSError:
+        threading.Thread(target=shutil.rmtree, args=(str(path), True), daemon=True).start()
+        return
+    # reap it so it does not linger as a zombie
+    threading.Thread(target=proc.wait, daemon=True).start()
+
+
+def _restored_tree(staging: Path) -> Path:
+    trees = [child for child in staging.iterdir() if child.is_dir() and not child.is_symlink()]
+    if len(trees) != 1:
+        raise RuntimeError("Backup does not contain a single data directory")
+    return trees[0]
 
 
 def _chain_restore_task(container_name: str, backup_name: str):
     was_running = False
-    temp_backup = None
+    staging = None
     details = {"container": container_name, "backup": backup_name}
     status = "error"
     message = ''
@@ -1561,64 +4435,52 @@ def _chain_restore_task(container_name: str, backup_name: str):
         _check_chain_job_cancelled()
         parent = CHAIN_DATA_DIR.parent
         parent.mkdir(parents=True, exist_ok=True)
-        was_running = _stop_container_for_job(container_name)
-        _check_chain_job_cancelled()
-        if CHAIN_DATA_DIR.exists():
-            temp_backup = _unique_temp_path(parent / f"{CHAIN_DATA_DIR.name}.pre-restore")
-            shutil.move(str(CHAIN_DATA_DIR), str(temp_backup))
+        # extracted next to the live directory while the node keeps running,
+        # so the swap below is two renames on the same filesystem
+        staging = _unique_temp_path(parent / f".{CHAIN_DATA_DIR.name}.restore")
+        staging.mkdir()
+        phases = details.setdefault("phases", {})
+        started = time.monotonic()
+        if backup_path.name.endswith(CHUNK_MANIFEST_SUFFIX):
+            details.update(_restore_chunk_snapshot(backup_path, staging))
+        else:
+            details.update(_extract_archive(backup_path, staging))
+        tree = _restored_tree(staging)
+        phases["extract_sec"] = round(time.monotonic() - started, 1)
         _check_chain_job_cancelled()
-        proc = subprocess.Popen(
-            ["tar", "-xzf", str(backup_path), "-C", str(parent)],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
-        _chain_job_set_process(proc)
-        stdout = ''
-        stderr = ''
+        started = time.monotonic()
+        was_running = _stop_container_for_job(container_name)
+        previous = None
+        if CHAIN_DATA_DIR.exists() or CHAIN_DATA_DIR.is_symlink():
+            previous = _unique_temp_path(parent / f"{CHAIN_DATA_DIR.name}.pre-restore")
+            os.rename(CHAIN_DATA_DIR, previous)
         try:
-            while True:
-                if _chain_job_cancel_event.is_set():
-                    proc.terminate()
-                    try:
-                        proc.wait(timeout=3)
-                    except subprocess.TimeoutExpired:
-                        proc.kill()
-                    raise ChainJobCancelled("Chain restore cancelled")
-                try:
-                    out, err = proc.communicate(timeout=1)
-                    stdout = out or ''
-                    stderr = err or ''
-                    break
-                except subprocess.TimeoutExpired:
-                    continue
-        finally:
-            _chain_job_clear_process()
-        if proc.returncode != 0:
-            raise RuntimeError(stderr.strip() or stdout.strip() or "Restore command failed")
+            os.rename(tree, CHAIN_DATA_DIR)
+        except OSError:
+            if previous is not None:
+                os.rename(previous, CHAIN_DATA_DIR)
+            raise
+        if was_running:
+            _start_container_for_job(container_name)
+            was_running = False
+        phases["swap_sec"] = round(time.monotonic() - started, 2)
+        details["downtime_sec"] = phases["swap_sec"]
         status = "success"
         message = f"Restored from {backup_name}"
         details["restored"] = backup_name
-        if temp_backup and temp_backup.exists():
-            shutil.rmtree(temp_backup, ignore_errors=True)
-            temp_backup = None
+        if previous is not None:
+            _remove_tree_async(previous)
+            details["removing"] = previous.name
     except ChainJobCancelled as exc:
         message = str(exc) or "Chain restore cancelled"
         status = "cancelled"
         details["cancelled"] = True
-        if temp_backup and temp_backup.exists() and not CHAIN_DATA_DIR.exists():
-            shutil.move(str(temp_backup), str(CHAIN_DATA_DIR))
-            temp_backup = None
     except Exception as exc:
         message = str(exc)
-        if temp_backup and temp_backup.exists() and not CHAIN_DATA_DIR.exists():
-            shutil.move(str(temp_backup), str(CHAIN_DATA_DIR))
-            temp_backup = None
     finally:
         restart_error = None
-        if temp_backup and temp_backup.exists() and not CHAIN_DATA_DIR.exists():
-            shutil.move(str(temp_backup), str(CHAIN_DATA_DIR))
-            temp_backup = None
+        if staging is not None and staging.exists():
+            _remove_tree_async(staging)
         if was_running:
             try:
                 _start_container_for_job(container_name)
@@ -1646,7 +4508,9 @@ def _chain_delete_task(container_name: str, backup_name: str):
         if not backup_path.exists():
             raise RuntimeError(f"Backup not found: {backup_name}")
         _check_chain_job_cancelled()
-        backup_path.unlink()
+        _unlink_backup(backup_path)
+        if backup_name.endswith(CHUNK_MANIFEST_SUFFIX):
+            details["freed"] = _gc_chunk_store()
         details["deleted"] = backup_name
         status = "success"
         message = f"Deleted backup {backup_name}"
@@ -1757,6 +4621,98 @@ def api_chain_backups():
         "job": _chain_job_snapshot(),
     })
 
+# ----- Combined dashboard refresh -----
+DASHBOARD_SECTIONS = ("status", "live", "activity", "containers", "backups", "logs")
+DASHBOARD_DEFAULT_SECTIONS = ("status", "live", "activity")
+
+
+def _dashboard_status():
+    if STATUS_SNAPSHOT:
+        snap = _wait_status_snapshot(1, STATUS_SNAPSHOT_WAIT_SEC)
+        if snap is not None and snap.get("payload") is not None:
+            data = dict(snap["payload"])
+            data["snapshot_age_ms"] = max(int(time.time() * 1000) - snap["ts_ms"], 0)
+            return data
+    result, side = _sample_with_sidecar()
+    return _assemble_status(result, side)
+
+
+def _live_section_locked(cursor=None):
+    """Height, remote height, peers and latency sharing one timestamp array."""
+    start, meta = _ring_delta(live_series, cursor)
+    labels = live_series.labels(start)
+    section = {"labels": labels, "len": len(labels), **meta}
+    for key in ("height", "remote", "peers", "latency"):
+        section[key] = live_series.column(key, start)
+    return section
+
+
+def _live_section_rollup(plan):
+    height = _rollup_height_payload(plan)
+    labels = height["labels"]
+    section = {
+        "labels": labels,
+        "height": height["local"],
+        "remote": height["remote"],
+        **_chart_meta(plan, labels),
+    }
+    for key in ("peers", "latency"):
+        lookup = {b[0]: b[4] / b[1] for b in _chart_buckets(plan, key)}
+        section[key] = [lookup.get(ts) for ts in labels]
+    return section
+
+
+@app.route("/api/dashboard")
+def api_dashboard():
+    """Everything one page refresh needs, read under one pass of the series locks.
+
+    ``fields`` is a comma-separated subset of DASHBOARD_SECTIONS (default
+    status,live,activity). ``live_cursor``/``activity_cursor`` turn the chart
+    sections into deltas like the /api/chart/* cursors, ``format=packed``
+    encodes them as with _pack_chart, and ``log_limit``/``log_since`` select
+    log lines like /api/logs/recent.
+    """
+    raw = request.args.get("fields") or ",".join(DASHBOARD_DEFAULT_SECTIONS)
+    fields = [f for f in (part.strip() for part in raw.split(",")) if f in DASHBOARD_SECTIONS]
+    out = {"ts_ms": int(time.time() * 1000)}
+    if "status" in fields:
+        out["status"] = _dashboard_status()
+    if "live" in fields or "activity" in fields:
+        plan = _chart_plan()
+        if plan is not None:
+            if "live" in fields:
+                out["live"] = _live_section_rollup(plan)
+            if "activity" in fields:
+                out["activity"] = _rollup_activity_payload(plan)
+        else:
+            with lock, history_lock:
+                if "live" in fields:
+                    out["live"] = _live_section_locked(request.args.get("live_cursor"))
+                if "activity" in fields:
+                    out["activity"] = _activity_payload_locked(request.args.get("activity_cursor"))
+        if "activity" in out:
+            # "rate" and "height_dx" are aliases kept for /api/chart/activity clients
+            out["activity"].pop("rate", None)
+            out["activity"].pop("height_dx", None)
+        if request.args.get("format") == "packed":
+            for key in ("live", "activity"):
+                if key in out:
+                    out[key] = _pack_chart(out[key])
+    if "containers" in fields:
+        out["containers"] = {"enabled": ENABLE_CONTROL and bool(ALLOW_DOCKER), "containers": docker_list()}
+    if "backups" in fields:
+        out["backups"] = {"backups": list_chain_backups(), "job": _chain_job_snapshot()}
+    if "logs" in fields:
+        try:
+            limit = int(request.args.get("log_limit", "50"))
+        except ValueError:
+            limit = 50
+        out["logs"] = _logs_payload(limit, _log_since_arg("log_since"))
+    resp = jsonify(out)
+    resp.headers["Cache-Control"] = "no-store"
+    return resp
+
+
 @app.route("/api/control", methods=["POST"])
 def api_control():
     if not ENABLE_CONTROL:
@@ -1813,14 +4769,16 @@ def api_control():
         ok, msg = trigger_chain_delete(name, backup_name)
         return (jsonify({"ok": ok, "message": msg}), 200 if ok else 400)
     elif action == "sample_now":
+        if STATUS_SNAPSHOT:
+            snap = _request_fresh_snapshot()
+            if snap is None:
+                return jsonify({"ok": False, "health_text": "sampler has not published a snapshot yet"})
+            return jsonify({"ok": snap["ok"], "health_text": snap["health_text"], "ts_ms": snap["ts_ms"]})
         ok, ht, *_ = sample_once()
         return jsonify({"ok": ok, "health_text": ht})
     elif action == "clear_totals":
         with lock:
-            activity_labels.clear()
-            activity_mined.clear()
-            activity_processed.clear()
-            activity_sealed.clear()
+            activity_series.clear()
             totals = _activity_totals_state()
             totals["mined"] = 0.0
             totals["processed"] = 0.0
@@ -1846,11 +4804,13 @@ def api_logs_recent():
         limit_int = int(limit_param)
     except Exception:
         limit_int = 50
-    lines = _get_recent_logs(limit_int)
+    logs = _logs_payload(limit_int, _log_since_arg("since"))
     return jsonify({
-        "lines": lines,
-        "limit": max(1, min(int(limit_int), 200)),
-        "count": len(lines),
+        "lines": logs["lines"],
+        "limit": max(1, min(int(limit_int), LOG_BUFFER_LINES)),
+        "count": len(logs["lines"]),
+        "cursor": logs["cursor"],
+        "reset": logs["reset"],
         "generated_ts": int(time.time() * 1000),
     })
 
@@ -1858,11 +4818,6 @@ def api_logs_recent():
 def healthz():
     return "ok\n", 200, {"content-type":"text/plain; charset=utf-8"}
 
-if __name__ == "__main__":
-    host = os.getenv("HOST", "0.0.0.0")
-    port = int(os.getenv("PORT", "8080"))
-    app.run(host, port)
-
 def _sample_once():
     # simple sampler heartbeat
     import time
@@ -1905,6 +4860,16 @@ def api_chart_reset():
         b=bufs.get(k)
         if b and hasattr(b,'clear'):b.clear()
     [clr(k)for k in (bufs.keys()if what=='all'else[what])]
+    # Clearing a ring bumps its epoch, so cursor readers get "reset": true next time.
+    if what in ('all','live','height','peers','latency'):
+        with lock: live_series.clear()
+    if what in ('all','activity'):
+        with lock: activity_series.clear()
+    if what in ('all','history'):
+        with history_lock: _history_series.clear()
+        hist_lock=globals().get('_hist_lock')
+        if hist_lock:
+            with hist_lock: _hist.clear()
     return jsonify({'ok':True,'cleared':what})
 
 def _sampler_loop():
@@ -1926,36 +4891,76 @@ def _sampler_loop():
         time.sleep(1.0)
 
 # ---- BEGIN: height-from-logs fallback ----
-import subprocess, shlex, re
-
 HEIGHT_CACHE = {"value": 0, "ts": 0}
+# Where the last scan of the container's json-file log stopped and what it found.
+_LOG_HEIGHT_SCAN = {"path": None, "inode": None, "offset": 0, "height": 0}
+_LOG_HEIGHT_RE = re.compile(rb"\bnumber=(\d+)\b")
+LOG_HEIGHT_SCAN_MAX_BYTES = 8 * 1024 * 1024
+_log_height_lock = threading.Lock()
+
+
+def _node_log_path():
+    if _docker_client() is not None:
+        return (_docker_inspect(MINING_STATE_SYNC_CONTAINER) or {}).get("LogPath") or ""
+    if _LOG_HEIGHT_SCAN["path"]:
+        return _LOG_HEIGHT_SCAN["path"]
+    return subprocess.check_output(
+        [DOCKER_BIN or "docker", "inspect", "-f", "{{.LogPath}}", MINING_STATE_SYNC_CONTAINER],
+        text=True, timeout=5,
+    ).strip()
+
+
+def _last_height_in(mm, lo, hi):
+    """Reverse search of ``mm[lo:hi]`` for the last ``number=NNN``; mmap.rfind walks it backwards natively."""
+    end = hi
+    while end > lo:
+        pos = mm.rfind(b"number=", lo, end)
+        if pos < 0:
+            return None
+        # \b still sees the byte before ``pos``, so "blocknumber=" is rejected here
+        m = _LOG_HEIGHT_RE.match(mm, pos, hi)
+        if m:
+            return int(m.group(1))
+        end = pos
+    return None
+
 
 def _tail_height_from_logs():
-    try:
-        # Locate the JSON log file once
-        logpath = subprocess.check_output(
-            shlex.split("docker inspect -f '{{.LogPath}}' blockdag-testnet-network"),
-            text=True
-        ).strip()
-        # Read backwards for speed (tac); find first 'number=NNN'
-        cmd = f"tac {shlex.quote(logpath)}"
-        p = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE, text=True, bufsize=1)
-
-        number_re = re.compile(r'\bnumber=(\d+)\b')
-        for _ in range(5000):  # read up to ~5k lines backwards
-            line = p.stdout.readline()
-            if not line:
-                break
-            m = number_re.search(line)
-            if m:
-                return int(m.group(1))
-    except Exception:
-        pass
-    return 0
+    """Last ``number=NNN`` in the node's json-file log, scanning only bytes appended since the last call.
+
+    Complete lines up to ``offset`` have been searched already; a rotated or
+    truncated file (new inode, or shorter than the offset) starts over, and at
+    most LOG_HEIGHT_SCAN_MAX_BYTES from the end are searched in one go.
+    """
+    with _log_height_lock:
+        state = _LOG_HEIGHT_SCAN
+        try:
+            path = _node_log_path()
+            if not path:
+                return state["height"]
+            with open(path, "rb") as fh:
+                st = os.fstat(fh.fileno())
+                if path != state["path"] or st.st_ino != state["inode"] or st.st_size < state["offset"]:
+                    state.update(path=path, inode=st.st_ino, offset=0, height=0)
+                if st.st_size == state["offset"]:
+                    return state["height"]
+                with mmap.mmap(fh.fileno(), st.st_size, access=mmap.ACCESS_READ) as mm:
+                    # only whole lines; a line still being written is searched next time
+                    hi = mm.rfind(b"\n", state["offset"], st.st_size) + 1
+                    if hi <= state["offset"]:
+                        return state["height"]
+                    found = _last_height_in(mm, max(state["offset"], hi - LOG_HEIGHT_SCAN_MAX_BYTES), hi)
+                    state["offset"] = hi
+                    if found is not None:
+                        state["height"] = found
+        except Exception:
+            # keep the last known value (e.g. log not readable, or empty file that mmap refuses)
+            pass
+        return state["height"]
 
-def get_chain_height_fallback():
+
+def _log_height_fallback():
     # Very light caching to avoid running for every poll
-    import time
     now = time.time()
     if now - HEIGHT_CACHE["ts"] < 2:   # 2s cache
         return HEIGHT_CACHE["value"]
@@ -1966,6 +4971,108 @@ def get_chain_height_fallback():
 # ---- END: height-from-logs fallback ----
 
 # ---- BEGIN: height file fallback helpers ----
+# Shared head segment written by bdag_sidecar.py (HeadSegment); keep the layout in sync.
+_HEAD_MAGIC = b"BDAGHD01"
+_HEAD_HEADER = struct.Struct("<8sQ")
+_HEAD_SEQ = struct.Struct("<Q")
+_HEAD_BODY = struct.Struct("<qqqqB7x" + "qdd" * 3 + "qqq")
+_HEAD_KINDS = ("mined", "processed", "sealed")
+
+
+class _HeadSnapshot:
+    """Seqlock reader for the sidecar's shared head segment.
+
+    The body is only unpacked when the sequence number moved; an odd or
+    changing sequence means a write is in progress and the read is retried.
+    A missing segment is looked for again at most every few seconds, and a
+    mapped one is re-stat'ed as often and remapped when the file was replaced.
+    A segment whose ``ts`` or sequence has not moved for ``stale_sec`` (the
+    sidecar stopped, or publishes elsewhere) reads as None so head.json is used.
+    """
+
+    REOPEN_SEC = 5.0
+
+    def __init__(self, path, stale_sec=HEAD_SHM_STALE_SEC):
+        self.path = path
+        self.stale_sec = stale_sec
+        self.mm = None
+        self.ino = None
+        self.seq = 0
+        self.values = None
+        self.moved = 0.0
+        self.lock = threading.Lock()
+        self._next_open = 0.0
+
+    def _close(self):
+        self.mm.close()
+        self.mm = self.ino = self.values = None
+        self.seq = 0
+
+    def _open(self):
+        now = time.time()
+        if now < self._next_open:
+            return self.mm is not None
+        self._next_open = now + self.REOPEN_SEC
+        if self.mm is not None:
+            try:
+                if os.stat(self.path).st_ino == self.ino:
+                    return True
+            except OSError:
+                pass
+            self._close()
+        try:
+            with open(self.path, "rb") as fh:
+                ino = os.fstat(fh.fileno()).st_ino
+                mm = mmap.mmap(fh.fileno(), _HEAD_HEADER.size + _HEAD_BODY.size, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return False
+        if _HEAD_HEADER.unpack_from(mm, 0)[0] != _HEAD_MAGIC:
+            mm.close()
+            return False
+        self.mm, self.ino = mm, ino
+        return True
+
+    def read(self):
+        """The head as the dict head.json would hold, or None without a fresh published segment."""
+        with self.lock:
+            if not self._open():
+                return None
+            now = time.time()
+            for _ in range(64):
+                seq = _HEAD_SEQ.unpack_from(self.mm, 8)[0]
+                if seq & 1:
+                    time.sleep(0)
+                    continue
+                if seq == self.seq:
+                    break
+                values = _HEAD_BODY.unpack_from(self.mm, _HEAD_HEADER.size)
+                if _HEAD_SEQ.unpack_from(self.mm, 8)[0] == seq:
+                    self.seq, self.values, self.moved = seq, values, now
+                    break
+            if not self.values or self.stale(now):
+                return None
+            return self._as_dict()
+
+    def stale(self, now=None):
+        now = time.time() if now is None else now
+        return now - self.moved > self.stale_sec or now * 1000 - self.values[0] > self.stale_sec * 1000
+
+    def _as_dict(self):
+        values = self.values
+        data = {"ts": values[0], "height": values[1], "peers": values[2], "height_remote": values[3],
+                "source": "bdag_sidecar"}
+        if values[4]:
+            activity = {}
+            for idx, kind in enumerate(_HEAD_KINDS):
+                count, rate, window = values[5 + 3 * idx:8 + 3 * idx]
+                activity[kind] = {"count": count, "rate_per_s": rate, "window_sec": window}
+            activity["totals"] = dict(zip(_HEAD_KINDS, values[14:17]))
+            data["activity"] = activity
+        return data
+
+
+_HEAD_SNAPSHOT = {"reader": _HeadSnapshot(HEAD_SHM_PATH) if HEAD_SHM_PATH else None}
+
 _SIDECAR_PATH_CACHE = {"paths": None, "resolved": None}
 
 
@@ -1990,13 +5097,7 @@ def _sidecar_candidate_paths(path_hint=None):
         return list(cache["paths"])
 
     paths = []
-    env_keys = (
-        "BDAG_SIDECAR_PATH",
-        "BDAG_SIDE_STATUS_PATH",
-        "BDAG_HEAD_JSON",
-        "BDAG_HEAD_PATH",
-    )
-    for key in env_keys:
+    for key in SIDECAR_PATH_ENV:
         raw = os.getenv(key, "").strip()
         if not raw:
             continue
@@ -2021,8 +5122,162 @@ def _sidecar_candidate_paths(path_hint=None):
     return list(paths)
 
 
+class _SidecarFileCache:
+    """Parsed head.json per path, reused until the file's inode or mtime changes.
+
+    Each read costs one ``stat``; with ``BDAG_SIDECAR_INOTIFY=1`` a watcher on
+    the file's directory marks entries stale instead and a hit costs nothing.
+    The cached dicts are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, inotify=False):
+        self.entries = {}
+        self.counts = {"hits": 0, "misses": 0, "errors": 0}
+        self.lock = threading.Lock()
+        self.inotify = inotify
+        self.watch = None
+        self.generation = 0
+
+    def load(self, path):
+        entry = self.entries.get(path)
+        if entry is not None and entry[0] is None:
+            self.counts["hits"] += 1
+            return entry[1]
+        generation = self.generation
+        watched = self._watched(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            self.entries.pop(path, None)
+            return None
+        key = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if entry is not None and entry[0] == key:
+            self.counts["hits"] += 1
+            if watched and generation == self.generation:
+                self.entries[path] = (None, entry[1])
+            return entry[1]
+        try:
+            with open(path, "rb") as fh:
+                data = json.loads(fh.read())
+        except (OSError, ValueError):
+            self.counts["errors"] += 1
+            return None
+        self.counts["misses"] += 1
+        # trust a watched path until the watcher reports a change, unless one
+        # already arrived while it was being read
+        trusted = watched and generation == self.generation
+        self.entries[path] = (None if trusted else key, data)
+        return data
+
+    def _watched(self, path):
+        if not self.inotify:
+            return False
+        with self.lock:
+            if self.watch is None:
+                self.watch = _InotifyWatch(self._changed)
+            return self.watch.add(os.path.dirname(path) or ".")
+
+    def _changed(self, path):
+        self.generation += 1
+        if path is None:
+            self.entries.clear()
+        else:
+            self.entries.pop(path, None)
+
+    def stats(self):
+        data = dict(self.counts)
+        data["paths"] = sorted(self.entries)
+        data["inotify"] = bool(self.watch and self.watch.alive)
+        return data
+
+
+class _InotifyWatch:
+    """Directory watches over inotify(7) via libc.
+
+    ``callback(path)`` runs for every file created, written, replaced or
+    removed in a watched directory, and ``callback(None)`` when events may
+    have been lost.
+    """
+
+    _EVENT = struct.Struct("iIII")
+    # IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    _MASK = 0x002 | 0x008 | 0x040 | 0x080 | 0x100 | 0x200
+    _Q_OVERFLOW = 0x4000
+    _IGNORED = 0x8000
+
+    def __init__(self, callback):
+        self.callback = callback
+        self.dirs = {}
+        self.fd = -1
+        self.alive = False
+        try:
+            import ctypes
+            import ctypes.util
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            self._add = libc.inotify_add_watch
+            self._add.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+            self.fd = libc.inotify_init1(os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return
+        if self.fd < 0:
+            return
+        self.alive = True
+        threading.Thread(target=self._run, name="sidecar-inotify", daemon=True).start()
+
+    def add(self, directory):
+        if not self.alive:
+            return False
+        if directory in self.dirs.values():
+            return True
+        wd = self._add(self.fd, os.fsencode(directory), self._MASK)
+        if wd < 0:
+            return False
+        self.dirs[wd] = directory
+        return True
+
+    def _run(self):
+        try:
+            while True:
+                buf = os.read(self.fd, 64 * 1024)
+                offset = 0
+                while offset < len(buf):
+                    wd, mask, _cookie, size = self._EVENT.unpack_from(buf, offset)
+                    offset += self._EVENT.size
+                    name = buf[offset:offset + size].rstrip(b"\0")
+                    offset += size
+                    if mask & (self._Q_OVERFLOW | self._IGNORED):
+                        # dropped events or a vanished directory: distrust everything
+                        self.dirs.pop(wd, None)
+                        self.callback(None)
+                    elif wd in self.dirs and name:
+                        self.callback(os.path.join(self.dirs[wd], os.fsdecode(name)))
+        except OSError:
+            pass
+        finally:
+            self.alive = False
+            self.dirs.clear()
+            self.callback(None)
+
+
+_SIDECAR_FILES = _SidecarFileCache(SIDECAR_INOTIFY)
+
+
+@app.route("/api/sidecar/cache")
+def sidecar_cache_stats():
+    """head.json parse counters; misses should track sidecar writes, not requests."""
+    data = _SIDECAR_FILES.stats()
+    reader = _HEAD_SNAPSHOT["reader"]
+    data["shm_seq"] = reader.seq if reader is not None and reader.mm is not None else None
+    data["shm_stale"] = reader.stale() if reader is not None and reader.values else None
+    return jsonify(data)
+
+
 def _load_sidecar_json(path_override=None):
-    import json, os
+    reader = _HEAD_SNAPSHOT["reader"]
+    if reader is not None and not path_override:
+        head = reader.read()
+        if head is not None:
+            return head
     cache = _SIDECAR_PATH_CACHE
     candidates = _sidecar_candidate_paths(path_override)
     if not path_override:
@@ -2033,25 +5288,19 @@ def _load_sidecar_json(path_override=None):
     for candidate in candidates:
         if not candidate:
             continue
-        try:
-            if os.path.exists(candidate):
-                with open(candidate, "r") as f:
-                    data = json.load(f)
-                if not path_override:
-                    cache["resolved"] = candidate
-                return data
-        except Exception:
-            continue
+        data = _SIDECAR_FILES.load(candidate)
+        if data is not None:
+            if not path_override:
+                cache["resolved"] = candidate
+            return data
     return {}
 
 
 def _height_from_file(path=None):
     try:
-        if path:
-            paths = _sidecar_candidate_paths(path)
-        else:
-            paths = _sidecar_candidate_paths()
-        for cand in paths:
+        if not path:
+            return int(_load_sidecar_json().get("height") or 0)
+        for cand in _sidecar_candidate_paths(path):
             data = _load_sidecar_json(cand)
             if data:
                 return int(data.get("height") or 0)
@@ -2062,17 +5311,25 @@ def _height_from_file(path=None):
 
 def get_chain_height_fallback():
     h = _height_from_file()
-    return h if h else 0
+    return h if h else _log_height_fallback()
 
 
-def height_or_fb(h):
+def height_or_fb(h, side=None):
     try:
-        return h if h else get_chain_height_fallback()
+        if h:
+            return h
+        if side is not None:
+            sh = int(side.get("height") or 0)
+            if sh:
+                return sh
+            # no sidecar height: scan the node log instead
+            return _log_height_fallback()
+        return get_chain_height_fallback()
     except Exception:
         return h or 0
 # ---- END: height file fallback helpers ----
 
-def peers_or_fb(peers):
+def peers_or_fb(peers, side=None):
     try:
         p = int(peers or 0)
     except Exception:
@@ -2080,7 +5337,8 @@ def peers_or_fb(peers):
     if p > 0:
         return p
     try:
-        side = _status_from_file()
+        if side is None:
+            side = _status_from_file()
         sp = int(side.get("peers") or 0)
         if sp > 0:
             return sp
@@ -2088,86 +5346,52 @@ def peers_or_fb(peers):
         pass
     return p
 
-_RECENT_LOGS_CACHE = {"ts": 0, "limit": 0, "lines": []}
-
-def _get_recent_logs(limit=50):
+def _logs_payload(limit=50, since=None):
     try:
-        limit_int = max(1, min(int(limit), 200))
+        limit_int = max(1, min(int(limit), LOG_BUFFER_LINES))
     except Exception:
         limit_int = 50
-    now = time.time()
-    cache = _RECENT_LOGS_CACHE
-    if cache["lines"] and cache["limit"] == limit_int and (now - cache["ts"]) < 2:
-        return list(cache["lines"])
-    lines = []
+    follower = _log_follower()
+    if follower is None:
+        return {"lines": [], "cursor": 0, "reset": True}
+    # the first request after start-up waits for the initial tail
+    follower.ready.wait(LOG_READY_WAIT_SEC)
+    lines, cursor, reset = follower.read(limit_int, since)
+    return {"lines": lines, "cursor": cursor, "reset": reset}
+
+
+def _log_since_arg(name):
     try:
-        import re
-        ansi_re = re.compile(r"\x1B\[[0-?]*[ -/]*[@-~]")
-    except Exception:
-        ansi_re = None
+        return int(request.args[name])
+    except (KeyError, ValueError):
+        return None
+
+# ---- BEGIN: /api/status sidecar fallbacks ----
+# The sidecar is read once per sample and these helpers patch the status dict
+# before it is serialized; there are no after_request rewrites of /api/status.
+def _status_from_file(path=None):
     try:
-        out = subprocess.check_output(
-            ["docker", "logs", "--tail", str(limit_int), "--timestamps", "blockdag-testnet-network"],
-            stderr=subprocess.STDOUT,
-            text=True,
-            timeout=4,
-        )
-        raw = [ln.rstrip() for ln in out.splitlines() if ln.strip()]
-        if ansi_re:
-            lines = [ansi_re.sub("", ln) for ln in raw]
-        else:
-            lines = raw
+        return _load_sidecar_json(path)
     except Exception:
-        pass
-    cache.update({"ts": now, "limit": limit_int, "lines": lines})
-    return list(lines)
-
-# ---- BEGIN: /api/status height fixer hook ----
-try:
-    import json
-    from flask import request
-except Exception:
-    pass
+        return {}
 
-@app.after_request
-def _fix_status_height(resp):
-    try:
-        if resp.mimetype == "application/json" and request.path == "/api/status":
-            data = json.loads(resp.get_data(as_text=True))
-            # Only fix when height is missing or zero
-            h0 = int(data.get("height") or 0)
-            if h0 <= 0:
-                # try sidecar file
-                new_h = get_chain_height_fallback()
-                if new_h:
-                    data["height"] = int(new_h)
-                    data["height_local"] = int(new_h)
-                    resp.set_data(json.dumps(data))
-    except Exception:
-        pass
-    return resp
-# ---- END: /api/status height fixer hook ----
 
-# ---- BEGIN: /api/status peers fixer (uses sidecar) ----
-def _status_from_file(path=None):
+def _sidecar_json(path=None):
     try:
         return _load_sidecar_json(path)
     except Exception:
         return {}
 
-# Reuse existing hook; if missing, this defines it; if present, it augments it.
-try:
-    from flask import request
-except Exception:
-    request = None
 
-def _apply_sidecar_fixes_to_status_dict(data):
-    side = _status_from_file()
+def _apply_sidecar_fixes_to_status_dict(data, side=None):
+    if side is None:
+        side = _status_from_file()
     # height
     h0 = int(data.get("height") or 0)
     sh = int(side.get("height") or 0)
     if h0 <= 0 and sh > 0:
         data["height"] = sh
+        data["height_local"] = sh
     # peers
     p0 = int(data.get("peers") or 0)
     sp = int(side.get("peers") or 0)
@@ -2175,34 +5399,10 @@ def _apply_sidecar_fixes_to_status_dict(data):
         data["peers"] = sp
     return data
 
-# wrap/extend after_request
-try:
-    _existing_after_request = _fix_status_height  # if our earlier hook exists
-except NameError:
-    _existing_after_request = None
-
-@app.after_request
-def _fix_status_height_and_peers(resp):
-    try:
-        if resp.mimetype == "application/json" and request and request.path == "/api/status":
-            import json as _json
-            data = _json.loads(resp.get_data(as_text=True))
-            data = _apply_sidecar_fixes_to_status_dict(data)
-            resp.set_data(_json.dumps(data))
-    except Exception:
-        pass
-    return resp
-# ---- END: /api/status peers fixer ----
-
-# ---- BEGIN: /api/status activity injector (from sidecar) ----
-def _sidecar_json(path=None):
-    try:
-        return _load_sidecar_json(path)
-    except Exception:
-        return {}
 
-def _merge_activity(dst):
-    side = _sidecar_json()
+def _merge_activity(dst, side=None):
+    if side is None:
+        side = _sidecar_json()
     act  = side.get("activity") or {}
     if not act:
         return dst
@@ -2219,25 +5419,7 @@ def _merge_activity(dst):
             if k not in dst["activity"]:
                 dst["activity"][k] = v
     return dst
-
-# Extend/compose the existing after_request hook
-try:
-    from flask import request
-except Exception:
-    request = None
-
-@app.after_request
-def _inject_activity(resp):
-    try:
-        if resp.mimetype == "application/json" and request and request.path == "/api/status":
-            import json as _json
-            data = _json.loads(resp.get_data(as_text=True))
-            data = _merge_activity(data)
-            resp.set_data(_json.dumps(data))
-    except Exception:
-        pass
-    return resp
-# ---- END: /api/status activity injector ----
+# ---- END: /api/status sidecar fallbacks ----
 
 # --- auto-injected: polling interval context (do not remove) ---
 try:
@@ -2313,7 +5495,7 @@ except Exception:
 
 # === AUTO_CHART_BUFFER_BEGIN ===
 # Lightweight, safe server-side chart buffer that:
-# - Captures each /api/status response into in-memory deques
+# - Captures each assembled /api/status payload into in-memory deques
 # - Serves /api/history for chart warm-start
 # - Computes height delta/second
 try:
@@ -2323,17 +5505,7 @@ try:
     from flask import request, jsonify, Response
     _HIST_CAP = int(os.getenv("BDAG_HISTORY_CAP", "720"))  # ~24 min @ 2s
     _hist_lock = Lock()
-    _hist = {
-        "height_local": deque(maxlen=_HIST_CAP),
-        "height_remote": deque(maxlen=_HIST_CAP),
-        "peers":    deque(maxlen=_HIST_CAP),
-        "latency":  deque(maxlen=_HIST_CAP),
-        "mined":    deque(maxlen=_HIST_CAP),
-        "processed":deque(maxlen=_HIST_CAP),
-        "sealed":   deque(maxlen=_HIST_CAP),
-        "activity": deque(maxlen=_HIST_CAP),
-        "height_dx":deque(maxlen=_HIST_CAP),
-    }
+    _hist = SeriesRing(_HIST_CAP, HISTORY_FIELDS, rates={"activity_rate": "activity"})
     _last_ht = {"t": None, "h": None}
 
     def _extract(payload: dict):
@@ -2395,93 +5567,16 @@ try:
                     dx = max((height - _last_ht["h"]) / dt, 0.0)
             _last_ht["t"] = ts_ms
             _last_ht["h"] = height
-            _hist["height_local"].append((ts_ms, height))
-            _hist["height_remote"].append((ts_ms, remote))
-            _hist["peers"].append((ts_ms, peers))
-            _hist["latency"].append((ts_ms, latency))
-            _hist["mined"].append((ts_ms, mined))
-            _hist["processed"].append((ts_ms, processed))
-            _hist["sealed"].append((ts_ms, sealed))
-            _hist["activity"].append((ts_ms, activity))
-            _hist["height_dx"].append((ts_ms, dx))
-
-    # Wrap only /api/status to capture responses (no changes to your handler)
-    try:
-        _status_view = (app.view_functions.get('api_status')
-                        or app.view_functions.get('status')
-                        or app.view_functions.get('api.status'))
-        if _status_view:
-            def _wrap(view):
-                def _inner(*a, **kw):
-                    out = view(*a, **kw)
-                    try:
-                        # Normalize to Response so we can read body
-                        if isinstance(out, Response):
-                            resp = out
-                        elif isinstance(out, tuple):
-                            resp = out[0] if isinstance(out[0], Response) else Response(out[0])
-                        elif isinstance(out, (dict, list)):
-                            resp = jsonify(out)
-                        else:
-                            resp = Response(out)
-
-                        if request.path == "/api/status":
-                            body = resp.get_data(as_text=True)
-                            if body:
-                                payload = json.loads(body)
-                                fixer = globals().get("_apply_sidecar_fixes_to_status_dict")
-                                if callable(fixer):
-                                    try:
-                                        payload = fixer(payload)
-                                    except Exception:
-                                        pass
-                                merger = globals().get("_merge_activity")
-                                if callable(merger):
-                                    try:
-                                        payload = merger(payload)
-                                    except Exception:
-                                        pass
-                                ts_ms = int(time.time() * 1000)
-                                h,r,p,l,m,pr,s,a = _extract(payload)
-                                _push(ts_ms, h,r,p,l,m,pr,s,a)
-
-                        # hard no-cache on /api/status responses
-                        if request.path == "/api/status":
-                            resp.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, max-age=0'
-                            resp.headers['Pragma'] = 'no-cache'
-                            resp.headers['Expires'] = '0'
-                        return resp
-                    except Exception:
-                        return out
-                _inner.__name__ = view.__name__
-                return _inner
-            app.view_functions[_status_view.__name__] = _wrap(_status_view)
-    except Exception:
-        pass
+            _hist.append(ts_ms, height, remote, peers, latency, mined, processed, sealed, activity, dx)
 
     @app.route("/api/history")
     def api_history():
-        try:
-            payload = _history_payload()
-        except Exception:
-            payload = {}
-        if any((payload.get(k) or {}).get("labels") for k in ("height_local","height_remote","peers","latency","activity","mined","processed","sealed","height_dx")):
-            return jsonify(payload)
+        delta = _delta_args()
+        with history_lock:
+            if len(_history_series):
+                return _chart_response(_ring_history_payload(_history_series, *delta))
         with _hist_lock:
-            def pack(key):
-                arr = list(_hist[key])
-                return {"labels":[t for (t,_) in arr], "series":[v for (_,v) in arr]}
-            return jsonify({
-                "height_local": pack("height_local"),
-                "height_remote": pack("height_remote"),
-                "peers":    pack("peers"),
-                "latency":  pack("latency"),
-                "mined":    pack("mined"),
-                "processed":pack("processed"),
-                "sealed":   pack("sealed"),
-                "activity": pack("activity"),
-                "height_dx":pack("height_dx"),
-            })
+            return _chart_response(_ring_history_payload(_hist, *delta))
 except Exception:
     # Defensive: never break the app if imports fail
     pass
@@ -2490,3 +5585,15 @@ try:
     from flask import render_template
 except Exception:
     pass
+
+# Start sampling only once every helper and route above is defined.
+try:
+    _history_warm_start()
+except Exception:
+    app.logger.warning("history warm start failed", exc_info=True)
+threading.Thread(target=sampler, daemon=True).start()
+
+if __name__ == "__main__":
+    host = os.getenv("HOST", "0.0.0.0")
+    port = int(os.getenv("PORT", "8080"))
+    app.run(host, port)
@@ -66,7 +66,7 @@ Group=$SERVICE_GROUP
 WorkingDirectory=$INSTALL_DIR
 Environment=PYTHONPATH=$INSTALL_DIR
 Environment=\"PYTHONWARNINGS=ignore:Unverified HTTPS request\"
-ExecStart=$INSTALL_DIR/.venv/bin/waitress-serve --listen=0.0.0.0:8080 app:app
+ExecStart=$INSTALL_DIR/.venv/bin/waitress-serve --listen=0.0.0.0:8080 --threads=8 app:app
 Restart=on-failure
 RestartSec=2
 
@@ -88,13 +88,15 @@ if [[ -f "$INSTALL_DIR/scripts/$SIDECAR_SERVICE" ]]; then
 else
   echo "Warning: sidecar service file scripts/$SIDECAR_SERVICE not found." >&2
 fi
-if [[ -f "$INSTALL_DIR/scripts/$SIDECAR_TIMER" ]]; then
-  sudo install -m 0644 "$INSTALL_DIR/scripts/$SIDECAR_TIMER" "$SYSTEMD_DIR/$SIDECAR_TIMER"
-else
-  echo "Warning: sidecar timer file scripts/$SIDECAR_TIMER not found." >&2
-fi
+# the sidecar now runs as a daemon; retire the oneshot timer from older installs
 if systemctl list-unit-files | grep -q "^$SIDECAR_TIMER"; then
-  sudo systemctl enable --now "$SIDECAR_TIMER"
+  sudo systemctl disable --now "$SIDECAR_TIMER" || true
+  sudo rm -f "$SYSTEMD_DIR/$SIDECAR_TIMER"
+fi
+sudo systemctl daemon-reload
+if systemctl list-unit-files | grep -q "^$SIDECAR_SERVICE"; then
+  sudo systemctl enable "$SIDECAR_SERVICE"
+  sudo systemctl restart "$SIDECAR_SERVICE"
 fi
 
 printf "[7/7] Installation complete.\n"
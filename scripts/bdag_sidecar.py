@@ -1,15 +1,28 @@
 #!/usr/bin/env python3
-"""Sidecar helper to mirror BlockDAG node status into legacy head.json files."""
+"""Sidecar helper to mirror BlockDAG node status into legacy head.json files.
+
+Runs once per invocation or, with ``--daemon``, stays resident: state lives in
+memory and is checkpointed to state.json, RPC connections are kept alive
+between samples, and the remote height is refreshed on its own slower cadence.
+
+Each sample is published to a fixed-layout shared-memory segment
+(``BDAG_HEAD_SHM``) that the dashboard reads without parsing; the head.json
+files remain as a compatibility output.
+"""
+import argparse
+import http.client
 import json
+import mmap
 import os
 import re
+import signal
+import struct
 import subprocess
 import sys
 import time
 from datetime import datetime, timezone
 from typing import Any, Dict, Tuple
-import urllib.error
-import urllib.request
+import urllib.parse
 
 STATE_DIR = os.getenv("BDAG_SIDECAR_STATE_DIR", "/var/lib/bdag-sidecar")
 STATE_PATH = os.path.join(STATE_DIR, "state.json")
@@ -17,31 +30,87 @@ ACTIVITY_CONTAINER = os.getenv("BDAG_NODE_CONTAINER", "blockdag-testnet-network"
 ACTIVITY_WINDOW_SEC = max(float(os.getenv("BDAG_ACTIVITY_WINDOW_SEC", "15")), 1.0)
 ACTIVITY_BOOT_WINDOW = os.getenv("BDAG_ACTIVITY_BOOT_WINDOW", "45s")
 ACTIVITY_TAIL = os.getenv("BDAG_ACTIVITY_TAIL", "2000")
-
-MINED_PATTERNS = [r"\bmined\b", r"\bmining\s+completed\b"]
-PROCESSED_PATTERNS = [
-    r"\bprocessed\b",
-    r"\baccepted\b",
-    r"\bapplied\b",
-    r"\bImported new chain segment\b",
-]
-SEALED_PATTERNS = [r"\bsealed\b", r"\bblock\s+sealed\b"]
-
-
-def _rpc(url, method):
-    payload = json.dumps({"jsonrpc": "2.0", "id": 1, "method": method, "params": []}).encode()
-    req = urllib.request.Request(url, data=payload, headers={"Content-Type": "application/json"})
-    try:
-        with urllib.request.urlopen(req, timeout=3) as resp:
-            data = resp.read()
+SIDECAR_INTERVAL_SEC = float(os.getenv("BDAG_SIDECAR_INTERVAL_SEC", "10"))
+SIDECAR_CHECKPOINT_SEC = float(os.getenv("BDAG_SIDECAR_CHECKPOINT_SEC", "60"))
+REMOTE_INTERVAL_SEC = float(os.getenv("BDAG_SIDECAR_REMOTE_SEC", "10"))
+RPC_TIMEOUT = 3
+HEAD_SHM_PATH = os.getenv("BDAG_HEAD_SHM", "/dev/shm/bdag-head").strip()
+HEAD_JSON_REFRESH_SEC = float(os.getenv("BDAG_HEAD_JSON_REFRESH_SEC", "30"))
+LOG_READ_CHUNK = 4 * 1024 * 1024
+LOG_BOOT_READ_BYTES = 8 * 1024 * 1024
+
+# Shared head segment layout; keep in sync with _HeadSnapshot in app.py.
+# Header: magic + sequence number (odd while a write is in progress).
+# Body: ts, height, peers, height_remote, has_activity, then count/rate/window
+# for mined, processed and sealed, then the three totals.
+HEAD_MAGIC = b"BDAGHD01"
+HEAD_HEADER = struct.Struct("<8sQ")
+HEAD_SEQ = struct.Struct("<Q")
+HEAD_BODY = struct.Struct("<qqqqB7x" + "qdd" * 3 + "qqq")
+ACTIVITY_KINDS = ("mined", "processed", "sealed")
+
+# One pass per line; the group name of each match is the counter it feeds.
+ACTIVITY_RE = re.compile(
+    r"\b(?:"
+    r"(?P<mined>mined|mining\s+completed)"
+    r"|(?P<processed>processed|accepted|applied|imported\s+new\s+chain\s+segment)"
+    r"|(?P<sealed>(?:block\s+)?sealed)"
+    r")\b",
+    re.IGNORECASE,
+)
+
+
+class _RpcClient:
+    """JSON-RPC over one keep-alive HTTP(S) connection, reopened once if it went stale."""
+
+    def __init__(self, url: str, timeout: float = RPC_TIMEOUT):
+        parts = urllib.parse.urlsplit(url)
+        self.https = parts.scheme == "https"
+        self.host = parts.netloc
+        self.path = (parts.path or "/") + ("?" + parts.query if parts.query else "")
+        self.timeout = timeout
+        self.conn = None
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def call(self, method: str):
+        body = json.dumps({"jsonrpc": "2.0", "id": 1, "method": method, "params": []})
+        for attempt in (0, 1):
+            if self.conn is None:
+                factory = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+                self.conn = factory(self.host, timeout=self.timeout)
+            try:
+                self.conn.request("POST", self.path, body, {"Content-Type": "application/json"})
+                resp = self.conn.getresponse()
+                data = resp.read()
+            except (http.client.HTTPException, OSError):
+                self.close()
+                if attempt:
+                    return {}
+                continue
+            if resp.will_close:
+                self.close()
             try:
                 return json.loads(data.decode())
             except Exception:
                 return {}
-    except urllib.error.URLError:
         return {}
 
 
+_RPC_CLIENTS: Dict[str, _RpcClient] = {}
+_REMOTE_CACHE = {"ts": 0.0, "height": 0}
+
+
+def _rpc(url, method):
+    client = _RPC_CLIENTS.get(url)
+    if client is None:
+        client = _RPC_CLIENTS[url] = _RpcClient(url)
+    return client.call(method)
+
+
 def _parse_hex(value):
     if value is None:
         return 0
@@ -94,6 +163,9 @@ def _load_state() -> Dict[str, Any]:
                 data.setdefault("totals", {"mined": 0, "processed": 0, "sealed": 0})
                 data.setdefault("last_iso", None)
                 data.setdefault("last_epoch", None)
+                data.setdefault("log_path", None)
+                data.setdefault("log_inode", None)
+                data.setdefault("log_offset", None)
                 return data
     except Exception:
         pass
@@ -101,6 +173,9 @@ def _load_state() -> Dict[str, Any]:
         "last_iso": None,
         "last_epoch": None,
         "totals": {"mined": 0, "processed": 0, "sealed": 0},
+        "log_path": None,
+        "log_inode": None,
+        "log_offset": None,
     }
 
 
@@ -122,15 +197,112 @@ def _iso_now() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
 
-def _count_patterns(patterns, text: str) -> int:
-    total = 0
-    for pat in patterns:
-        total += len(re.findall(pat, text, flags=re.IGNORECASE))
-    return total
+def _count_activity(text: str, counts: Dict[str, int]) -> None:
+    for match in ACTIVITY_RE.finditer(text):
+        counts[match.lastgroup] += 1
 
 
-def _collect_activity(state: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
-    updated = dict(state)
+def _boot_window_sec() -> float:
+    raw = (ACTIVITY_BOOT_WINDOW or "").strip().lower()
+    units = {"s": 1, "m": 60, "h": 3600}
+    try:
+        if raw and raw[-1] in units:
+            return float(raw[:-1]) * units[raw[-1]]
+        return float(raw)
+    except ValueError:
+        return 45.0
+
+
+def _container_log_path(state: Dict[str, Any]):
+    path = state.get("log_path")
+    if path and os.path.exists(path):
+        return path
+    try:
+        out = subprocess.check_output(
+            ["docker", "inspect", "-f", "{{.LogPath}}", ACTIVITY_CONTAINER],
+            text=True, stderr=subprocess.DEVNULL, timeout=10,
+        )
+    except Exception:
+        return None
+    path = out.strip()
+    return path if path and os.path.exists(path) else None
+
+
+def _scan_json_log(path: str, offset: int, counts: Dict[str, int], since_iso=None) -> Tuple[int, int, Any]:
+    """Count activity in the complete lines of a json-file log from ``offset``.
+
+    Returns ``(new_offset, lines, last_iso)``; a trailing partial line is left
+    for the next call. Lines older than ``since_iso`` are skipped.
+    """
+    lines = 0
+    last_iso = None
+    with open(path, "rb") as fh:
+        fh.seek(offset)
+        pending = b""
+        while True:
+            chunk = fh.read(LOG_READ_CHUNK)
+            if not chunk:
+                break
+            data = pending + chunk
+            cut = data.rfind(b"\n") + 1
+            pending = data[cut:]
+            offset += cut
+            for raw in data[:cut].splitlines():
+                try:
+                    entry = json.loads(raw)
+                except ValueError:
+                    continue
+                iso = entry.get("time") or ""
+                if since_iso and iso < since_iso:
+                    continue
+                lines += 1
+                last_iso = iso or last_iso
+                _count_activity(entry.get("log") or "", counts)
+    return offset, lines, last_iso
+
+
+def _tail_json_log(state: Dict[str, Any], counts: Dict[str, int]):
+    """Read only the bytes appended to the container's json-file log since the saved offset.
+
+    Returns the number of new lines, or None when the log file is not
+    available (other logging driver, no permission) and ``docker logs`` is used.
+    """
+    path = _container_log_path(state)
+    if not path:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    offset = state.get("log_offset")
+    since_iso = None
+    lines = 0
+    last_iso = None
+    if path != state.get("log_path") or not isinstance(offset, int):
+        # first run (or a new container): count only the boot window near the end
+        offset = max(st.st_size - LOG_BOOT_READ_BYTES, 0)
+        boot_start = datetime.fromtimestamp(time.time() - _boot_window_sec(), timezone.utc)
+        since_iso = boot_start.isoformat().replace("+00:00", "Z")
+    elif st.st_ino != state.get("log_inode") or st.st_size < offset:
+        # rotated by max-size: finish the previous file first, then start the new one from 0
+        rotated = path + ".1"
+        try:
+            if os.stat(rotated).st_ino == state.get("log_inode"):
+                _, lines, last_iso = _scan_json_log(rotated, offset, counts)
+        except OSError:
+            pass
+        offset = 0
+    try:
+        offset, new_lines, new_iso = _scan_json_log(path, offset, counts, since_iso)
+    except OSError:
+        return None
+    state.update(log_path=path, log_inode=st.st_ino, log_offset=offset)
+    if new_iso or last_iso:
+        state["last_iso"] = new_iso or last_iso
+    return lines + new_lines
+
+
+def _docker_logs_activity(state: Dict[str, Any], counts: Dict[str, int]) -> int:
     try:
         cmd = ["docker", "logs", "--timestamps"]
         last_iso = state.get("last_iso")
@@ -138,21 +310,14 @@ def _collect_activity(state: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str,
             cmd += ["--since", last_iso]
         else:
             cmd += ["--since", ACTIVITY_BOOT_WINDOW]
-        if ACTIVITY_TAIL:
-            cmd += ["--tail", ACTIVITY_TAIL]
+            if ACTIVITY_TAIL:
+                cmd += ["--tail", ACTIVITY_TAIL]
         cmd.append(ACTIVITY_CONTAINER)
         logs = subprocess.check_output(cmd, text=True, stderr=subprocess.STDOUT)
     except Exception:
         logs = ""
 
-    if not logs:
-        if updated.get("last_iso") is None:
-            updated["last_iso"] = _iso_now()
-        if updated.get("last_epoch") is None:
-            updated["last_epoch"] = time.time()
-        return {}, updated
-
-    mined = processed = sealed = 0
+    lines = 0
     new_last_iso = state.get("last_iso")
     for line in logs.splitlines():
         if not line.strip():
@@ -169,10 +334,28 @@ def _collect_activity(state: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str,
             payload = rest
         else:
             payload = line
-        mined += _count_patterns(MINED_PATTERNS, payload)
-        processed += _count_patterns(PROCESSED_PATTERNS, payload)
-        sealed += _count_patterns(SEALED_PATTERNS, payload)
+        lines += 1
+        _count_activity(payload, counts)
+    if lines:
+        state["last_iso"] = new_last_iso or _iso_now()
+    return lines
 
+
+def _collect_activity(state: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    updated = dict(state)
+    counts = {"mined": 0, "processed": 0, "sealed": 0}
+    lines = _tail_json_log(updated, counts)
+    if lines is None:
+        lines = _docker_logs_activity(updated, counts)
+
+    if not lines:
+        if updated.get("last_iso") is None:
+            updated["last_iso"] = _iso_now()
+        if updated.get("last_epoch") is None:
+            updated["last_epoch"] = time.time()
+        return {}, updated
+
+    mined, processed, sealed = counts["mined"], counts["processed"], counts["sealed"]
     now_epoch = time.time()
     last_epoch = state.get("last_epoch")
     elapsed = now_epoch - last_epoch if isinstance(last_epoch, (int, float)) else ACTIVITY_WINDOW_SEC
@@ -185,7 +368,6 @@ def _collect_activity(state: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str,
     totals["sealed"] = max(0, int(totals.get("sealed", 0)) + sealed)
 
     updated["last_epoch"] = now_epoch
-    updated["last_iso"] = new_last_iso or _iso_now()
 
     if mined == processed == sealed == 0:
         return {}, updated
@@ -211,15 +393,29 @@ def _collect_activity(state: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str,
     return activity_payload, updated
 
 
-def gather_status():
+def _remote_height(remote_url: str) -> int:
+    now = time.monotonic()
+    if _REMOTE_CACHE["ts"] and now - _REMOTE_CACHE["ts"] < REMOTE_INTERVAL_SEC:
+        return _REMOTE_CACHE["height"]
+    remote_height = 0
+    remote_resp = _rpc(remote_url, os.getenv("BDAG_REMOTE_RPC_METHOD", "eth_blockNumber"))
+    if isinstance(remote_resp, dict):
+        remote_height = _parse_hex(remote_resp.get("result"))
+    _REMOTE_CACHE.update(ts=now, height=remote_height)
+    return remote_height
+
+
+def gather_status(state=None):
+    """One sample as ``(payload, state)``; without ``state`` it is loaded and saved here (oneshot)."""
     node_url = os.getenv("BDAG_RPC_BASE", "http://127.0.0.1:18545").strip()
     remote_url = os.getenv("BDAG_REMOTE_RPC_BASE", "https://rpc.awakening.bdagscan.com").strip()
 
     height = 0
     peers = 0
-    remote_height = 0
 
-    state = _load_state()
+    oneshot = state is None
+    if oneshot:
+        state = _load_state()
 
     local_block = _rpc(node_url, os.getenv("BDAG_LOCAL_HEIGHT_METHOD", "eth_blockNumber"))
     if isinstance(local_block, dict):
@@ -233,12 +429,10 @@ def gather_status():
         peer_info = _rpc(node_url, "bdag_getPeerInfo")
         peers = max(peers, _count_peers(peer_info))
 
-    remote_resp = _rpc(remote_url, os.getenv("BDAG_REMOTE_RPC_METHOD", "eth_blockNumber"))
-    if isinstance(remote_resp, dict):
-        remote_height = _parse_hex(remote_resp.get("result"))
+    remote_height = _remote_height(remote_url) if remote_url else 0
 
     activity_payload, updated_state = _collect_activity(state)
-    if updated_state != state:
+    if oneshot and updated_state != state:
         _save_state(updated_state)
 
     now_ms = int(time.time() * 1000)
@@ -251,10 +445,10 @@ def gather_status():
     }
     if activity_payload:
         payload["activity"] = activity_payload
-    return payload
+    return payload, updated_state
 
 
-def write_payload(payload):
+def _payload_paths():
     paths = [
         "/run/bdag/head.json",
         "/var/run/bdag/head.json",
@@ -272,22 +466,155 @@ def write_payload(payload):
                     paths.append(entry)
                 else:
                     paths.append(os.path.join(entry, "head.json"))
+    return paths
 
+
+class HeadSegment:
+    """Fixed-layout head snapshot in a shared-memory file, published under a seqlock.
+
+    The writer bumps the sequence to an odd value, rewrites the body and bumps
+    it back to even; readers retry while it is odd or changed under them, so
+    they never see a torn record and can tell a new sample by the sequence alone.
+    """
+
+    def __init__(self, path: str):
+        size = HEAD_HEADER.size + HEAD_BODY.size
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            os.fchmod(fd, 0o644)
+            if os.fstat(fd).st_size != size:
+                os.ftruncate(fd, size)
+            self.mm = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        magic, seq = HEAD_HEADER.unpack_from(self.mm, 0)
+        if magic != HEAD_MAGIC:
+            seq = 0
+            HEAD_HEADER.pack_into(self.mm, 0, HEAD_MAGIC, seq)
+        self.seq = seq + (seq & 1)
+
+    def publish(self, payload: Dict[str, Any]) -> None:
+        activity = payload.get("activity") or {}
+        fields = [int(payload.get(key) or 0) for key in ("ts", "height", "peers", "height_remote")]
+        fields.append(1 if activity else 0)
+        for kind in ACTIVITY_KINDS:
+            entry = activity.get(kind) or {}
+            fields += [int(entry.get("count") or 0), float(entry.get("rate_per_s") or 0.0),
+                       float(entry.get("window_sec") or 0.0)]
+        totals = activity.get("totals") or {}
+        fields += [int(totals.get(kind) or 0) for kind in ACTIVITY_KINDS]
+        body = HEAD_BODY.pack(*fields)
+        HEAD_SEQ.pack_into(self.mm, 8, self.seq + 1)
+        self.mm[HEAD_HEADER.size:HEAD_HEADER.size + len(body)] = body
+        self.seq += 2
+        HEAD_SEQ.pack_into(self.mm, 8, self.seq)
+
+
+def open_head_segment():
+    if not HEAD_SHM_PATH:
+        return None
+    try:
+        return HeadSegment(HEAD_SHM_PATH)
+    except (OSError, ValueError) as exc:
+        print(f"bdag_sidecar: shared head segment unavailable: {exc}", file=sys.stderr)
+        return None
+
+
+# path -> (content key without ts, monotonic time of the last write)
+_WRITTEN: Dict[str, Tuple[str, float]] = {}
+
+
+def _write_atomic(path: str, body: str) -> None:
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            fh.write(body)
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except Exception:
+            pass
+        raise
+
+
+def write_payload(payload, paths=None, segment=None):
+    """Publish to the shared segment, then refresh the compatibility head.json files.
+
+    The JSON files are replaced atomically when something other than ``ts``
+    changed since this process last wrote them, and otherwise at least every
+    ``HEAD_JSON_REFRESH_SEC`` so readers checking ``ts`` still see a live sidecar.
+    """
+    if segment is not None:
+        segment.publish(payload)
+    key = json.dumps({k: v for k, v in payload.items() if k != "ts"}, sort_keys=True)
     body = json.dumps(payload, separators=(",", ":"))
-    for path in paths:
+    now = time.monotonic()
+    for path in paths or _payload_paths():
+        last = _WRITTEN.get(path)
+        if last is not None and last[0] == key and now - last[1] < HEAD_JSON_REFRESH_SEC:
+            continue
         try:
-            directory = os.path.dirname(path)
-            if directory and not os.path.exists(directory):
-                os.makedirs(directory, exist_ok=True)
-            with open(path, "w", encoding="utf-8") as fh:
-                fh.write(body)
+            _write_atomic(path, body)
         except Exception:
             continue
+        _WRITTEN[path] = (key, now)
 
 
-def main():
-    payload = gather_status()
-    write_payload(payload)
+def run_daemon(interval: float, checkpoint_sec: float) -> int:
+    """Sample every ``interval`` seconds until SIGTERM/SIGINT.
+
+    state.json is written on every tick that moved the activity totals, so the
+    log offset is never behind the totals it produced and a crash cannot count
+    the same lines twice, and otherwise every ``checkpoint_sec``.
+    """
+    def _stop(signum, frame):
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+    state = _load_state()
+    paths = _payload_paths()
+    segment = open_head_segment()
+    checkpoint_at = time.monotonic() + checkpoint_sec
+    next_tick = time.monotonic()
+    try:
+        while True:
+            totals = dict(state.get("totals") or {})
+            try:
+                payload, state = gather_status(state)
+                write_payload(payload, paths, segment)
+            except Exception as exc:  # keep running; the next tick retries
+                print(f"bdag_sidecar: sample failed: {exc}", file=sys.stderr)
+            now = time.monotonic()
+            if now >= checkpoint_at or state.get("totals") != totals:
+                _save_state(state)
+                checkpoint_at = now + checkpoint_sec
+            # fixed cadence; ticks missed while a sample overran are dropped, not queued
+            next_tick = max(next_tick + interval, now)
+            time.sleep(max(next_tick - time.monotonic(), 0.0))
+    finally:
+        _save_state(state)
+        for client in _RPC_CLIENTS.values():
+            client.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mirror BlockDAG node status into head.json files.")
+    parser.add_argument("--daemon", action="store_true",
+                        help="stay resident and sample every --interval seconds instead of once")
+    parser.add_argument("--interval", type=float, default=SIDECAR_INTERVAL_SEC,
+                        help="seconds between samples in daemon mode (fractions allowed; BDAG_SIDECAR_INTERVAL_SEC)")
+    parser.add_argument("--checkpoint", type=float, default=SIDECAR_CHECKPOINT_SEC,
+                        help="seconds between state.json checkpoints in daemon mode (BDAG_SIDECAR_CHECKPOINT_SEC)")
+    args = parser.parse_args(argv)
+    if args.daemon:
+        return run_daemon(max(args.interval, 0.1), max(args.checkpoint, 1.0))
+    payload, _ = gather_status()
+    write_payload(payload, segment=open_head_segment())
     return 0
 
 
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Bytes-per-refresh benchmark for the chart payload encodings.
+
+Fills the live and history rings with the given number of synthetic samples
+and fetches a full ``/api/dashboard?fields=live,activity`` read as plain JSON
+and as ``format=packed``, each with and without gzip.
+
+Usage: python3 scripts/bench_chart_encoding.py [points]
+"""
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _setup():
+    os.environ.setdefault("BDAG_HISTORY_STORE", "0")
+    os.environ.setdefault("BDAG_REMOTE_RPC_BASE", "")
+    os.environ.setdefault("BDAG_RPC_BASE", "http://127.0.0.1:9")
+    # keep the sampler from appending while the rings are measured
+    os.environ.setdefault("BDAG_SAMPLE_SEC", "3600")
+    sys.path.insert(0, ROOT)
+    import app  # noqa: E402
+    return app
+
+
+def _fill(m, points):
+    rnd = random.Random(7)
+    base = int(time.time() * 1000) - points * 5000
+    with m.lock:
+        m.live_series.clear()
+        m.live_series.resize(points)
+        for i in range(points):
+            remote = 40_000_010 + i * 3 if i % 50 else None
+            m.live_series.append(base + i * 5000 + rnd.randint(0, 40), 40_000_000 + i * 3, remote,
+                                 rnd.randint(5, 12), rnd.randint(10, 60))
+    with m.history_lock:
+        m._history_series.clear()
+        m._history_series.resize(points)
+        total = 0
+        for i in range(points):
+            total += rnd.randint(0, 3)
+            m._history_series.append(base + i * 5000, 40_000_000 + i * 3, 40_000_010 + i * 3, 9, 20,
+                                     1, 2, 3, total, 0.6)
+
+
+def _fetch(client, query, gzip):
+    headers = {"Accept-Encoding": "gzip"} if gzip else {"Accept-Encoding": "identity"}
+    start = time.perf_counter()
+    resp = client.get("/api/dashboard?fields=live,activity" + query, headers=headers)
+    return len(resp.data), time.perf_counter() - start
+
+
+def main():
+    points = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    m = _setup()
+    _fill(m, points)
+    client = m.app.test_client()
+    print(f"points={points}")
+    plain = None
+    for label, query, gzip in (
+        ("json", "", False),
+        ("json + gzip", "", True),
+        ("packed", "&format=packed", False),
+        ("packed + gzip", "&format=packed", True),
+    ):
+        size, elapsed = _fetch(client, query, gzip)
+        plain = plain or size
+        print(f"{label:<16} {size / 1024:10.1f} KiB  x{plain / size:5.1f}  {elapsed * 1000:8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Memory/CPU benchmark for the chart series storage.
+
+Compares the old per-series deques of (ts, value) tuples against the columnar
+SeriesRing used by app.py, holding the four live chart columns (height,
+remote height, peers, latency) at the given number of points.
+
+Usage: python3 scripts/bench_series_memory.py [points]
+"""
+import os
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COLUMNS = ("height", "remote", "peers", "latency")
+
+
+def _setup():
+    os.environ.setdefault("BDAG_HISTORY_STORE", "0")
+    os.environ.setdefault("BDAG_REMOTE_RPC_BASE", "")
+    os.environ.setdefault("BDAG_RPC_BASE", "http://127.0.0.1:9")
+    sys.path.insert(0, ROOT)
+    import app  # noqa: E402
+    return app
+
+
+def _rows(points):
+    base = int(time.time() * 1000) - points * 5000
+    for i in range(points):
+        yield base + i * 5000, 1_000_000 + i, (1_000_050 + i) if i % 7 else None, i % 12, 20 + i % 9
+
+
+def _build_deques(points):
+    series = {name: deque(maxlen=points) for name in COLUMNS}
+    for ts, *values in _rows(points):
+        for name, val in zip(COLUMNS, values):
+            series[name].append((ts, val))
+    return series
+
+
+def _build_ring(m, points):
+    ring = m.SeriesRing(points, COLUMNS)
+    for row in _rows(points):
+        ring.append(*row)
+    return ring
+
+
+def _serialize_deques(series):
+    labels = [ts for ts, _ in series["height"]]
+    return labels, [[v for _, v in series[name]] for name in COLUMNS]
+
+
+def _serialize_ring(ring):
+    return ring.labels(), [ring.column(name) for name in COLUMNS]
+
+
+def _resize_deques(series, points):
+    return {name: deque(list(dq)[-points:], maxlen=points) for name, dq in series.items()}
+
+
+def _measure(label, build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    obj = build()
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{label:<24} {size / 1024 / 1024:8.2f} MiB retained   build {elapsed * 1000:8.1f} ms")
+    return obj
+
+
+def _timeit(label, fn, repeat=5):
+    best = min(_once(fn) for _ in range(repeat))
+    print(f"{label:<24} {best * 1000:8.2f} ms")
+
+
+def _once(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    points = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    m = _setup()
+    print(f"points={points} columns={len(COLUMNS)}")
+    series = _measure("deque of tuples", lambda: _build_deques(points))
+    ring = _measure("SeriesRing", lambda: _build_ring(m, points))
+    _timeit("serialize deques", lambda: _serialize_deques(series))
+    _timeit("serialize SeriesRing", lambda: _serialize_ring(ring))
+    _timeit("resize deques (-10%)", lambda: _resize_deques(series, points * 9 // 10))
+    _timeit("resize SeriesRing (-10%)", lambda: ring.resize(points * 9 // 10), repeat=1)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Microbenchmark for the /api/status assembly pipeline.
+
+Compares the old stacked after_request chain (three JSON parse/re-serialize
+hooks plus the view wrapper, each re-reading head.json) against the current
+single-pass builder and the pre-serialized snapshot served per request.
+
+Usage: python3 scripts/bench_status_pipeline.py [iterations]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAD = {
+    "ts": int(time.time() * 1000),
+    "height": 1234567,
+    "peers": 9,
+    "height_remote": 1234600,
+    "source": "bdag_sidecar",
+    "activity": {
+        "mined": {"count": 2, "rate_per_s": 0.2, "window_sec": 10.0},
+        "processed": {"count": 40, "rate_per_s": 4.0, "window_sec": 10.0},
+        "sealed": {"count": 3, "rate_per_s": 0.3, "window_sec": 10.0},
+        "totals": {"mined": 812, "processed": 50211, "sealed": 904},
+    },
+}
+
+
+def _setup():
+    tmp = tempfile.mkdtemp(prefix="bdag-bench-")
+    head_path = os.path.join(tmp, "head.json")
+    with open(head_path, "w", encoding="utf-8") as fh:
+        json.dump(HEAD, fh)
+    os.environ["BDAG_SIDECAR_PATH"] = head_path
+    os.environ.setdefault("BDAG_REMOTE_RPC_BASE", "")
+    os.environ.setdefault("BDAG_RPC_BASE", "http://127.0.0.1:9")
+    sys.path.insert(0, ROOT)
+    import app  # noqa: E402
+    return app
+
+
+def _legacy(m, result):
+    # jsonify() in the view ...
+    body = json.dumps(m._build_status_payload(*result))
+    # ... _fix_status_height
+    data = json.loads(body)
+    if int(data.get("height") or 0) <= 0:
+        side = m._load_sidecar_json()
+        data["height"] = int(side.get("height") or 0)
+    body = json.dumps(data)
+    # ... _fix_status_height_and_peers
+    data = json.loads(body)
+    data = m._apply_sidecar_fixes_to_status_dict(data, m._load_sidecar_json())
+    body = json.dumps(data)
+    # ... _inject_activity
+    data = json.loads(body)
+    data = m._merge_activity(data, m._load_sidecar_json())
+    body = json.dumps(data)
+    # ... and the _wrap'ped view parsing it once more for the history buffer
+    data = json.loads(body)
+    data = m._apply_sidecar_fixes_to_status_dict(data, m._load_sidecar_json())
+    data = m._merge_activity(data, m._load_sidecar_json())
+    m._push(int(time.time() * 1000), *m._extract(data))
+    return body
+
+
+def _single_pass(m, result):
+    side = m._sidecar_json()
+    payload = m._assemble_status(result, side)
+    m._record_status_history(int(time.time() * 1000), payload)
+    return json.dumps(payload, separators=(",", ":"))
+
+
+def _snapshot_serve(snap):
+    age_ms = max(int(time.time() * 1000) - snap["ts_ms"], 0)
+    return snap["prefix"] + str(age_ms).encode("ascii") + b"}"
+
+
+def _measure(label, fn, iterations):
+    fn()
+    start_cpu = time.process_time()
+    for _ in range(iterations):
+        fn()
+    cpu_us = (time.process_time() - start_cpu) / iterations * 1e6
+    tracemalloc.start()
+    peaks = []
+    for _ in range(min(iterations, 200)):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        fn()
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    peak_kb = sum(peaks) / len(peaks) / 1024.0
+    print(f"{label:<28} {cpu_us:10.1f} us/call {peak_kb:10.1f} KiB peak alloc/call")
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    m = _setup()
+    result = (True, "ok", 0, 0, 12, 1234600)
+    snap = m._publish_status_snapshot(result, m._sidecar_json())
+    print(f"iterations={iterations}")
+    _measure("legacy hooks (per request)", lambda: _legacy(m, result), iterations)
+    _measure("single-pass (per sample)", lambda: _single_pass(m, result), iterations)
+    _measure("snapshot serve (per request)", lambda: _snapshot_serve(snap), iterations)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
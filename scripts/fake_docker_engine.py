@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""Fake Docker Engine on a unix socket, for exercising app.py's Engine API paths.
+
+Serves the handful of endpoints the dashboard uses (``/containers/json``,
+``/containers/{id}/json``, ``/stop``, ``/start``, ``/restart``, ``/logs`` and
+``/events``) over HTTP/1.1 keep-alive, with log bodies and the ``/logs`` and
+``/events`` streams sent chunked. ``tests/test_docker_engine.py`` runs
+DockerEngineClient, the log follower and the events watcher against it;
+run standalone it keeps serving and logs a line every second, for pointing
+a dashboard at it.
+
+Usage: python3 scripts/fake_docker_engine.py [SOCK]   (then BDAG_DOCKER_SOCKET=SOCK)
+"""
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qsl, unquote, urlparse
+
+DEFAULT_SOCKET = "/tmp/fake-docker.sock"
+CONTAINER = "blockdag-testnet-network"
+
+
+def _rfc3339(ns):
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(ns // 10**9)) + f".{ns % 10**9:09d}Z"
+
+
+class FakeEngine:
+    """Container table, per-container log lines and the event feed, shared by all handlers."""
+
+    def __init__(self, names=(CONTAINER,)):
+        self.cond = threading.Condition()
+        self.containers = {name: {"running": True, "started": time.time_ns(), "finished": 0, "lines": []}
+                           for name in names}
+        self.events = []
+        self.connections = 0
+        self.subscribers = 0
+        # (connection number, request line) of every request served
+        self.requests = []
+        # close each connection after its next response without "Connection: close",
+        # the way dockerd drops idle keep-alive connections
+        self.drop_idle = False
+        self.closed = False
+
+    def log(self, name, text):
+        with self.cond:
+            lines = self.containers[name]["lines"]
+            # strictly increasing, like the engine's nanosecond timestamps
+            ns = max(time.time_ns(), lines[-1][0] + 1) if lines else time.time_ns()
+            lines.append((ns, text))
+            self.cond.notify_all()
+
+    def set_running(self, name, running):
+        with self.cond:
+            entry = self.containers[name]
+            if entry["running"] != running:
+                entry["running"] = running
+                entry["started" if running else "finished"] = time.time_ns()
+                self.events.append({"Type": "container", "Action": "start" if running else "die",
+                                    "Actor": {"ID": name, "Attributes": {"name": name}},
+                                    "time": int(time.time())})
+            self.cond.notify_all()
+
+    def inspect(self, name):
+        entry = self.containers[name]
+        return {
+            "Id": name,
+            "Name": "/" + name,
+            "Config": {"Tty": False, "Env": ["NODE_ARGS=--miningstatesync"]},
+            "State": {
+                "Status": "running" if entry["running"] else "exited",
+                "Running": entry["running"],
+                "ExitCode": 0,
+                "StartedAt": _rfc3339(entry["started"]),
+                "FinishedAt": _rfc3339(entry["finished"]) if entry["finished"] else "0001-01-01T00:00:00Z",
+            },
+        }
+
+    def shutdown(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    @property
+    def engine(self):
+        return self.server.engine
+
+    def _send(self, status, body=b"", content_type="application/json"):
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body).encode()
+        # decided before the client can see the response (and reset the flag)
+        if self.engine.drop_idle:
+            self.close_connection = True
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _start_chunked(self, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def _chunk(self, data):
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def _end_chunked(self):
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def _route(self):
+        with self.engine.cond:
+            self.engine.requests.append((self.client_address[1], self.requestline))
+        url = urlparse(self.path)
+        parts = [unquote(p) for p in url.path.strip("/").split("/")]
+        if parts and parts[0].startswith("v1."):
+            parts = parts[1:]
+        return parts, dict(parse_qsl(url.query))
+
+    def _container(self, parts):
+        name = parts[1] if len(parts) > 2 and parts[0] == "containers" else None
+        if name not in self.engine.containers:
+            self._send(404, {"message": f"No such container: {name}"})
+            return None
+        return name
+
+    def do_GET(self):
+        parts, query = self._route()
+        if parts == ["containers", "json"]:
+            with self.engine.cond:
+                items = [{"Id": name, "Names": ["/" + name], "State": "running" if c["running"] else "exited",
+                          "Status": "Up" if c["running"] else "Exited (0)"}
+                         for name, c in self.engine.containers.items()]
+            return self._send(200, items)
+        if parts == ["events"]:
+            return self._events()
+        name = self._container(parts)
+        if name is None:
+            return None
+        if parts[2] == "json":
+            with self.engine.cond:
+                return self._send(200, self.engine.inspect(name))
+        if parts[2] == "logs":
+            return self._logs(name, query)
+        return self._send(404, {"message": "page not found"})
+
+    def do_POST(self):
+        parts, _query = self._route()
+        name = self._container(parts)
+        if name is None:
+            return None
+        action = parts[2]
+        if action not in ("start", "stop", "restart"):
+            return self._send(404, {"message": "page not found"})
+        if action in ("stop", "restart"):
+            self.engine.set_running(name, False)
+        if action in ("start", "restart"):
+            self.engine.set_running(name, True)
+        return self._send(204)
+
+    def _select(self, name, query):
+        lines = self.engine.containers[name]["lines"]
+        if query.get("since"):
+            secs, _, frac = query["since"].partition(".")
+            since_ns = int(secs) * 10**9 + int(frac.ljust(9, "0")[:9] or 0)
+            return [line for line in lines if line[0] >= since_ns]
+        if "tail" in query and query["tail"] != "all":
+            tail = int(query["tail"])
+            return lines[-tail:] if tail else []
+        return list(lines)
+
+    def _frame(self, ns, text, timestamps):
+        data = (f"{_rfc3339(ns)} " if timestamps else "").encode() + text.encode() + b"\n"
+        return b"\x01\x00\x00\x00" + len(data).to_bytes(4, "big") + data
+
+    def _logs(self, name, query):
+        engine = self.engine
+        timestamps = query.get("timestamps") in ("1", "true")
+        with engine.cond:
+            pending = self._select(name, query)
+            sent = len(engine.containers[name]["lines"])
+        self._start_chunked("application/vnd.docker.raw-stream")
+        for ns, text in pending:
+            self._chunk(self._frame(ns, text, timestamps))
+        if query.get("follow") in ("1", "true"):
+            while True:
+                with engine.cond:
+                    engine.cond.wait_for(lambda: engine.closed or not engine.containers[name]["running"]
+                                         or len(engine.containers[name]["lines"]) > sent, 1.0)
+                    new = engine.containers[name]["lines"][sent:]
+                    sent += len(new)
+                    done = engine.closed or not engine.containers[name]["running"]
+                for ns, text in new:
+                    self._chunk(self._frame(ns, text, timestamps))
+                if done:
+                    break
+        self._end_chunked()
+        self.close_connection = True
+
+    def _events(self):
+        engine = self.engine
+        with engine.cond:
+            sent = len(engine.events)
+            engine.subscribers += 1
+        self._start_chunked("application/json")
+        while True:
+            with engine.cond:
+                engine.cond.wait_for(lambda: engine.closed or len(engine.events) > sent, 1.0)
+                if engine.closed:
+                    break
+                new = engine.events[sent:]
+                sent += len(new)
+            for event in new:
+                self._chunk(json.dumps(event).encode() + b"\n")
+        self._end_chunked()
+        self.close_connection = True
+
+
+class FakeDockerServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path, engine):
+        if os.path.exists(path):
+            os.unlink(path)
+        self.engine = engine
+        super().__init__(path, _Handler)
+
+    def get_request(self):
+        sock, _addr = super().get_request()
+        self.engine.connections += 1
+        # BaseHTTPRequestHandler expects a (host, port) peer address
+        return sock, ("local", self.engine.connections)
+
+
+def serve(path, engine=None):
+    server = FakeDockerServer(path, engine or FakeEngine())
+    threading.Thread(target=server.serve_forever, name="fake-docker", daemon=True).start()
+    return server
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_SOCKET
+    engine = FakeEngine()
+    serve(path, engine)
+    print(f"fake Docker Engine on {path} (container {CONTAINER})")
+    count = 0
+    try:
+        while True:
+            time.sleep(1)
+            count += 1
+            engine.log(CONTAINER, f"INFO tick {count}")
+    except KeyboardInterrupt:
+        engine.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""Test setup: app.py reads its configuration from the environment at import time.
+
+Everything the app could touch on the host (Docker socket, backup directory,
+shared head segment, history store) is pointed into a throw-away directory
+before the first ``import app``.
+"""
+import os
+import sys
+import tempfile
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPTS = os.path.join(ROOT, "scripts")
+TMP = tempfile.mkdtemp(prefix="bdag-tests-")
+
+os.environ.update({
+    "BDAG_HISTORY_STORE": "0",
+    "BDAG_REMOTE_RPC_BASE": "",
+    "BDAG_RPC_BASE": "http://127.0.0.1:9",
+    # one sampler tick at start-up, then none while the tests run
+    "BDAG_SAMPLE_SEC": "3600",
+    "BDAG_DOCKER_SOCKET": os.path.join(TMP, "docker.sock"),
+    "BDAG_NODE_CONTAINER": "blockdag-testnet-network",
+    "BDAG_CHAIN_BACKUP_DIR": os.path.join(TMP, "backups"),
+    "BDAG_CHAIN_DATA_DIR": os.path.join(TMP, "data"),
+    "BDAG_HEAD_SHM": os.path.join(TMP, "head-shm"),
+    "BDAG_SIDECAR_STATE_DIR": os.path.join(TMP, "sidecar"),
+})
+sys.path[:0] = [ROOT, SCRIPTS]
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return predicate()
+
+
+@pytest.fixture(scope="session")
+def app_module():
+    import app
+    # let the start-up sampler tick finish so it does not append under a test
+    wait_for(lambda: app._status_snapshot.get("current") is not None, 15.0)
+    return app
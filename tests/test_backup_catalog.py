@@ -0,0 +1,75 @@
+"""The backup catalog index and its directory-mtime staleness check."""
+import os
+
+import pytest
+
+
+@pytest.fixture
+def backups(app_module):
+    app = app_module
+    directory = app.CHAIN_BACKUP_DIR
+    directory.mkdir(parents=True, exist_ok=True)
+    for path in directory.iterdir():
+        if path.is_file():
+            path.unlink()
+    with app._backup_catalog_lock:
+        app._backup_catalog.update(entries=None, dir_mtime_ns=None)
+    yield directory
+    with app._backup_catalog_lock:
+        app._backup_catalog.update(entries=None, dir_mtime_ns=None)
+
+
+def _archive(directory, app, stamp, body=b"archive"):
+    path = directory / f"{app.CHAIN_BACKUP_PREFIX}-{stamp}{app.CHAIN_BACKUP_SUFFIX}"
+    path.write_bytes(body)
+    return path
+
+
+def test_scan_and_persist(app_module, backups):
+    app = app_module
+    first = _archive(backups, app, "20260101-000000")
+    entries = app._backup_catalog_entries()
+    assert list(entries) == [first.name]
+    assert entries[first.name]["size"] == len(b"archive")
+    # the catalog's own write does not make it stale
+    assert app._catalog_in_sync(app._backup_catalog)
+    assert (backups / app.BACKUP_CATALOG_NAME).exists()
+
+
+def test_external_change_is_picked_up(app_module, backups):
+    app = app_module
+    _archive(backups, app, "20260101-000000")
+    app._backup_catalog_entries()
+    second = _archive(backups, app, "20260102-000000")
+    assert not app._catalog_in_sync(app._backup_catalog)
+    assert second.name in app._backup_catalog_entries()
+
+
+def test_change_during_scan_stays_stale(app_module, backups):
+    app = app_module
+    _archive(backups, app, "20260101-000000")
+    mtime_ns = os.stat(backups).st_mtime_ns
+    # another archive lands after the scan read the directory mtime
+    late = _archive(backups, app, "20260102-000000")
+    os.utime(backups, ns=(mtime_ns + 1, mtime_ns + 1))
+    with app._backup_catalog_lock:
+        app._reconcile_backup_catalog(app._backup_catalog, mtime_ns)
+    assert not app._catalog_in_sync(app._backup_catalog)
+    assert late.name in app._backup_catalog_entries()
+
+
+def test_record_and_unlink_keep_sync(app_module, backups):
+    app = app_module
+    first = _archive(backups, app, "20260101-000000")
+    second = _archive(backups, app, "20260102-000000")
+    app._backup_catalog_entries()
+    app._catalog_record(first.name, height=123456, duration_sec=4.5)
+    assert app._backup_catalog_entries()[first.name]["height"] == 123456
+    app._unlink_backup(second)
+    assert app._catalog_in_sync(app._backup_catalog)
+    assert list(app._backup_catalog_entries()) == [first.name]
+
+    # a fresh process reads the recorded fields back from the catalog file
+    with app._backup_catalog_lock:
+        app._backup_catalog.update(entries=None, dir_mtime_ns=None)
+    assert app._backup_catalog_entries()[first.name]["height"] == 123456
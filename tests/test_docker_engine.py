@@ -0,0 +1,94 @@
+"""DockerEngineClient, the log follower and the events watcher against scripts/fake_docker_engine.py."""
+import os
+
+import pytest
+
+from conftest import wait_for
+from fake_docker_engine import CONTAINER, FakeEngine, serve
+
+
+@pytest.fixture(scope="module")
+def engine():
+    path = os.environ["BDAG_DOCKER_SOCKET"]
+    engine = FakeEngine()
+    server = serve(path, engine)
+    for i in range(20):
+        engine.log(CONTAINER, f"\x1b[32mINFO\x1b[0m backfill line {i}")
+    yield engine
+    engine.shutdown()
+    server.shutdown()
+    server.server_close()
+    os.unlink(path)
+
+
+@pytest.fixture
+def client(app_module, engine):
+    return app_module.DockerEngineClient(os.environ["BDAG_DOCKER_SOCKET"])
+
+
+def _probe(client, marker):
+    return client.request("GET", f"/containers/{CONTAINER}/json", {"probe": marker})
+
+
+def _connection(engine, marker):
+    return next((conn for conn, line in engine.requests if f"probe={marker}" in line), None)
+
+
+def test_keep_alive_reuse(engine, client):
+    assert _probe(client, "reuse-a")["State"]["Running"]
+    _probe(client, "reuse-b")
+    assert _connection(engine, "reuse-a") == _connection(engine, "reuse-b")
+
+
+def test_retry_after_dropped_keep_alive(engine, client):
+    engine.drop_idle = True
+    try:
+        _probe(client, "drop-a")
+    finally:
+        engine.drop_idle = False
+    # the pooled connection was closed by the engine; the client retries once on a fresh one
+    assert _probe(client, "drop-b")
+    assert _connection(engine, "drop-b") not in (None, _connection(engine, "drop-a"))
+
+
+def test_chunked_framed_logs(client):
+    lines = client.logs(CONTAINER, tail=5, timestamps=True).splitlines()
+    assert len(lines) == 5
+    assert lines[-1].endswith("backfill line 19")
+    assert lines[0].split(" ", 1)[0].endswith("Z")
+
+
+def test_api_error(app_module, client):
+    with pytest.raises(app_module.DockerAPIError) as exc:
+        client.inspect("missing")
+    assert exc.value.status == 404
+    assert "No such container" in str(exc.value)
+
+
+def test_follow_streams_across_stop_and_start(app_module, engine, client):
+    follower = app_module._LogFollower(client, CONTAINER, 100).start()
+    try:
+        assert follower.ready.wait(5)
+        base = len(engine.containers[CONTAINER]["lines"])
+        assert wait_for(lambda: follower.cursor() == base)
+        for i in range(3):
+            engine.log(CONTAINER, f"live line {i}")
+        assert wait_for(lambda: follower.cursor() == base + 3)
+
+        watcher = app_module._ContainerWatcher(client).start()
+        assert watcher.ready.wait(5)
+        assert wait_for(lambda: engine.subscribers > 0)
+        client.action(CONTAINER, "stop", stop_timeout=1)
+        assert wait_for(lambda: any(e["status"].startswith("Exited") for e in watcher.items()))
+        client.action(CONTAINER, "start")
+        assert wait_for(lambda: any(e["status"].startswith("Up") for e in watcher.items()))
+
+        # the follow stream ended on stop; the follower resumes with since= and skips replays
+        for i in range(2):
+            engine.log(CONTAINER, f"after restart {i}")
+        assert wait_for(lambda: follower.cursor() == base + 5, 15.0)
+        lines, _cursor, _reset = follower.read(limit=5)
+        assert [line.split(" ", 1)[1] for line in lines] == [
+            "live line 0", "live line 1", "live line 2", "after restart 0", "after restart 1"]
+    finally:
+        follower.stop()
@@ -0,0 +1,74 @@
+"""The sidecar's shared head segment: HeadSegment.publish and the dashboard's seqlock reader."""
+import os
+import time
+
+import pytest
+
+import bdag_sidecar
+
+
+def _payload(height, ts=None):
+    return {
+        "ts": int(time.time() * 1000) if ts is None else ts,
+        "height": height,
+        "peers": 8,
+        "height_remote": height + 2,
+        "activity": {
+            "mined": {"count": 3, "rate_per_s": 0.05, "window_sec": 60.0},
+            "totals": {"mined": 42},
+        },
+    }
+
+
+@pytest.fixture
+def segment_path(tmp_path):
+    return str(tmp_path / "bdag-head")
+
+
+@pytest.fixture
+def reader(app_module, segment_path):
+    reader = app_module._HeadSnapshot(segment_path, stale_sec=30)
+    reader.REOPEN_SEC = 0.0
+    return reader
+
+
+def test_publish_and_read(reader, segment_path):
+    assert reader.read() is None
+    segment = bdag_sidecar.HeadSegment(segment_path)
+    segment.publish(_payload(1000))
+    data = reader.read()
+    assert data["height"] == 1000 and data["peers"] == 8 and data["height_remote"] == 1002
+    assert data["activity"]["mined"]["count"] == 3
+    assert data["activity"]["totals"]["mined"] == 42
+    segment.publish(_payload(1001))
+    assert reader.read()["height"] == 1001
+
+
+def test_write_in_progress_keeps_last_record(app_module, reader, segment_path):
+    segment = bdag_sidecar.HeadSegment(segment_path)
+    segment.publish(_payload(1000))
+    assert reader.read()["height"] == 1000
+    # an odd sequence: the writer is between its two sequence bumps
+    app_module._HEAD_SEQ.pack_into(segment.mm, 8, segment.seq + 1)
+    assert reader.read()["height"] == 1000
+
+
+def test_stale_segment_reads_none(reader, segment_path):
+    segment = bdag_sidecar.HeadSegment(segment_path)
+    segment.publish(_payload(1000, ts=int((time.time() - 120) * 1000)))
+    assert reader.read() is None
+    segment.publish(_payload(1001))
+    assert reader.read()["height"] == 1001
+    # the sequence stopped moving (the sidecar is gone)
+    reader.moved -= 60
+    assert reader.read() is None
+
+
+def test_replaced_segment_is_remapped(reader, segment_path):
+    bdag_sidecar.HeadSegment(segment_path).publish(_payload(1000))
+    assert reader.read()["height"] == 1000
+    old_ino = reader.ino
+    os.unlink(segment_path)
+    bdag_sidecar.HeadSegment(segment_path).publish(_payload(2000))
+    assert reader.read()["height"] == 2000
+    assert reader.ino != old_ino
@@ -0,0 +1,61 @@
+"""HistoryStore segment files: reads, torn-record recovery and layout mismatches."""
+import math
+
+import pytest
+
+T0 = 1_790_006_400_000  # a segment boundary for segment_sec=86400
+
+
+@pytest.fixture
+def store_factory(app_module, tmp_path):
+    stores = []
+
+    def make(fields=("height", "peers")):
+        store = app_module.HistoryStore(tmp_path, fields=fields, fsync_sec=0)
+        stores.append(store)
+        return store
+
+    yield make
+    for store in stores:
+        store.close()
+
+
+def test_tail_and_since(store_factory):
+    store = store_factory()
+    for i in range(5):
+        store.append(T0 + 1000 * i, (100 + i, None if i == 2 else 8))
+    # the next day starts a second segment
+    store.append(T0 + 86_400_000, (200, 9))
+    assert len(store.segments()) == 2
+    rows = store.tail(3)
+    assert [row[0] for row in rows] == [T0 + 3000, T0 + 4000, T0 + 86_400_000]
+    assert math.isnan(store.tail(6)[2][2])
+    assert [row[1] for row in store.since(T0 + 3000)] == [104, 200]
+
+
+def test_torn_tail_is_truncated_on_reopen(store_factory):
+    store = store_factory()
+    for i in range(3):
+        store.append(T0 + 1000 * i, (100 + i, 8))
+    store.close()
+    _start, path = store.segments()[0]
+    # a crash mid-write leaves part of a record behind
+    with open(path, "ab") as fh:
+        fh.write(b"\x01\x02\x03")
+
+    reopened = store_factory()
+    reopened.append(T0 + 3000, (103, 8))
+    assert [row[1] for row in reopened.tail(10)] == [100, 101, 102, 103]
+    assert (path.stat().st_size - reopened.HEADER.size) % reopened.record.size == 0
+
+
+def test_layout_mismatch_is_set_aside(store_factory):
+    store = store_factory()
+    store.append(T0, (100, 8))
+    store.close()
+    _start, path = store.segments()[0]
+
+    wider = store_factory(fields=("height", "peers", "latency"))
+    wider.append(T0 + 1000, (101, 8, 0.25))
+    assert path.with_name(path.name + ".bad").exists()
+    assert wider.tail(10) == [(T0 + 1000, 101.0, 8.0, 0.25)]
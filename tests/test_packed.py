@@ -0,0 +1,133 @@
+"""``format=packed`` encoding round trips, decoded in Python and by the page's own unpackChart."""
+import base64
+import json
+import math
+import os
+import re
+import shutil
+import subprocess
+from array import array
+
+import pytest
+
+from conftest import ROOT
+
+HEIGHTS = [40_000_000, 40_000_003, None, 40_000_009, 40_000_009]
+RATES = [0.6, 1.25, None, 0.0]
+WIDE = [1e12 + 0.5, None, 2.25]
+
+
+def _floats(text, code):
+    arr = array(code)
+    arr.frombytes(base64.b64decode(text))
+    return [None if v != v else v for v in arr]
+
+
+def _decode(val):
+    if "dt" in val:
+        ts, out = val["t0"], []
+        for delta in _floats(val["dt"], "i"):
+            ts += delta
+            out.append(ts)
+        return out
+    if "f64" in val:
+        return _floats(val["f64"], "d")
+    if "f32" in val:
+        return _floats(val["f32"], "f")
+    acc, out = val["base"], []
+    for delta in _floats(val["d32"], "f"):
+        if delta is None:
+            out.append(None)
+        else:
+            acc += delta
+            out.append(acc)
+    return out
+
+
+def _close(got, want):
+    assert len(got) == len(want)
+    for g, w in zip(got, want):
+        if w is None:
+            assert g is None
+        else:
+            assert g == pytest.approx(w, rel=1e-6)
+
+
+def test_integer_series_as_exact_deltas(app_module):
+    packed = app_module._pack_values(HEIGHTS)
+    assert set(packed) == {"d32", "base"}
+    assert _decode(packed) == HEIGHTS
+
+
+def test_small_floats_as_f32(app_module):
+    packed = app_module._pack_values(RATES)
+    assert "f32" in packed
+    _close(_decode(packed), RATES)
+
+
+def test_wide_floats_keep_f64(app_module):
+    packed = app_module._pack_values(WIDE)
+    assert "f64" in packed
+    assert _decode(packed) == WIDE
+
+
+def test_labels(app_module):
+    labels = [1_790_000_000_000, 1_790_000_005_000, 1_790_000_010_040]
+    packed = app_module._pack_labels(labels)
+    assert packed["t0"] == labels[0]
+    assert _decode(packed) == labels
+    # gaps beyond int32 milliseconds stay a plain list
+    assert app_module._pack_labels([0, 2 ** 40]) == [0, 2 ** 40]
+
+
+def _payload():
+    labels = [1_790_000_000_000 + 5000 * i for i in range(len(HEIGHTS))]
+    return {
+        "labels": labels,
+        "local": HEIGHTS,
+        "rate": [0.6, 1.25, None, 0.0, 3.5],
+        "window": 240,
+        "history": {"labels": labels[:2], "series": [1.0, 2.0]},
+    }
+
+
+def test_pack_chart_round_trip(app_module):
+    payload = _payload()
+    packed = app_module._pack_chart(payload)
+    assert packed["window"] == 240
+    assert _decode(packed["labels"]) == payload["labels"]
+    assert _decode(packed["local"]) == HEIGHTS
+    _close(_decode(packed["rate"]), payload["rate"])
+    assert _decode(packed["history"]["series"]) == [1.0, 2.0]
+
+
+def _page_functions():
+    with open(os.path.join(ROOT, "templates", "index.html"), encoding="utf-8") as fh:
+        html = fh.read()
+    parts = []
+    for name in ("b64Buffer", "unpackColumn", "unpackChart"):
+        match = re.search(r"^function %s\(.*?^}\n" % name, html, re.S | re.M)
+        assert match, name
+        parts.append(match.group(0))
+    return "\n".join(parts)
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+def test_page_unpack_chart(app_module):
+    payload = _payload()
+    packed = app_module._pack_chart(payload)
+    script = (
+        "const atob = s => Buffer.from(s, 'base64').toString('binary');\n"
+        + _page_functions()
+        + "\nlet data = '';\nprocess.stdin.on('data', c => (data += c));\n"
+        "process.stdin.on('end', () => console.log(JSON.stringify(unpackChart(JSON.parse(data)))));\n"
+    )
+    out = subprocess.run(["node", "-e", script], input=json.dumps(packed), capture_output=True,
+                         text=True, timeout=30, check=True)
+    unpacked = json.loads(out.stdout)
+    assert unpacked["labels"] == payload["labels"]
+    assert unpacked["local"] == HEIGHTS
+    assert unpacked["rate"] == payload["rate"]
+    assert unpacked["history"] == payload["history"]
+    assert unpacked["window"] == 240
+    assert not any(isinstance(v, float) and math.isnan(v) for v in unpacked["rate"])
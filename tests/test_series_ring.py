@@ -0,0 +1,109 @@
+"""SeriesRing storage and the cursor / since delta reads served by the chart endpoints."""
+import pytest
+
+
+@pytest.fixture
+def ring(app_module):
+    return app_module.SeriesRing(4, ("height", "latency"), rates={"height_rate": "height"}, ints=("height",))
+
+
+def _fill(ring, count, start=0):
+    for i in range(start, start + count):
+        ring.append(1000 * (i + 1), 100 + i, 0.5 * i)
+
+
+def test_columns_and_missing_values(ring):
+    ring.append(1000, 100, 1.5)
+    ring.append(2000, None, 2.5)
+    ring.append(4000, 104, None)
+    assert ring.labels() == [1000, 2000, 4000]
+    assert ring.column("height") == [100, None, 104]
+    assert all(isinstance(v, int) for v in ring.column("height") if v is not None)
+    assert ring.column("latency") == [1.5, 2.5, None]
+    assert ring.at(-1, "height") == 104 and ring.at(1, "height") is None
+    # the rate counts a missing value as 0 and never goes negative
+    assert ring.column("height_rate") == [0.0, 0.0, 52.0]
+
+
+def test_rolls_over_keeping_newest(ring):
+    _fill(ring, 6)
+    assert len(ring) == 4
+    assert ring.labels() == [3000, 4000, 5000, 6000]
+    assert ring.column("height", 2) == [104, 105]
+    assert ring.index_since(4500) == 2
+
+
+def test_cursor_delta(ring):
+    _fill(ring, 2)
+    cursor = ring.cursor()
+    _fill(ring, 1, start=2)
+    start, reset = ring.start_for(cursor)
+    assert (start, reset) == (2, False)
+    assert ring.labels(start) == [3000]
+    # nothing new: empty delta, not a reset
+    assert ring.start_for(ring.cursor()) == (3, False)
+
+
+@pytest.mark.parametrize("cursor", [None, "", "garbage", "0-99", "7-1"])
+def test_cursor_unusable_forces_reset(ring, cursor):
+    _fill(ring, 3)
+    assert ring.start_for(cursor) == (0, True)
+
+
+def test_cursor_rolled_out_forces_reset(ring):
+    _fill(ring, 1)
+    cursor = ring.cursor()
+    _fill(ring, 5, start=1)
+    assert ring.start_for(cursor) == (0, True)
+
+
+def test_clear_changes_epoch(ring):
+    _fill(ring, 3)
+    cursor, epoch = ring.cursor(), ring.epoch
+    ring.clear()
+    _fill(ring, 4)
+    assert ring.epoch == epoch + 1
+    assert ring.start_for(cursor) == (0, True)
+    assert ring.start_for(None, 2000, epoch) == (0, True)
+
+
+def test_since_delta(ring):
+    assert ring.start_for(None, 1000) == (0, True)
+    _fill(ring, 6)
+    # older than the oldest retained point: the reader missed rolled-out points
+    assert ring.start_for(None, 2000) == (0, True)
+    assert ring.start_for(None, 3000) == (1, False)
+    assert ring.start_for(None, 4000, ring.epoch) == (2, False)
+    assert ring.start_for(None, 6000) == (4, False)
+
+
+def test_resize_and_load(ring):
+    _fill(ring, 4)
+    ring.resize(2)
+    assert ring.labels() == [3000, 4000]
+    assert ring.column("height") == [102, 103]
+    ring.resize(3)
+    ring.append(5000, 104, 0.0)
+    assert ring.labels() == [3000, 4000, 5000]
+    epoch = ring.epoch
+    ring.load([(10, 1, 0.0), (20, 2, 0.0)])
+    assert ring.labels() == [10, 20] and ring.epoch > epoch
+
+
+def test_chart_endpoint_delta(app_module):
+    app = app_module
+    client = app.app.test_client()
+    with app.lock:
+        app.live_series.clear()
+        app.live_series.append(1000, 10, None, 3, 20)
+        app.live_series.append(2000, 11, 12, 4, 21)
+    full = client.get("/api/chart/height").get_json()
+    assert full["reset"] is True and full["local"] == [10, 11] and full["remote"] == [None, 12]
+    with app.lock:
+        app.live_series.append(3000, 12, 13, 4, 22)
+    delta = client.get(f"/api/chart/height?cursor={full['cursor']}").get_json()
+    assert delta["reset"] is False and delta["labels"] == [3000] and delta["local"] == [12]
+    since = client.get(f"/api/chart/peers?since=2000&epoch={full['epoch']}").get_json()
+    assert since["reset"] is False and since["data"] == [4]
+    stale = client.get(f"/api/chart/peers?since=2000&epoch={full['epoch'] + 1}").get_json()
+    assert stale["reset"] is True and stale["data"] == [3, 4, 4]